@@ -0,0 +1,159 @@
+import json
+import os
+from review_parser import review_bodies_text
+from vibe_matcher import VibeMatcher
+
+# Bump this whenever the cleaning, vibe or summary logic changes so that
+# precomputed artifacts built by an older analyzer are ignored by the app.
+ANALYZER_VERSION = 4
+
+DEFAULT_ARTIFACT_PATH = 'ai_analysis_artifact.json'
+# One artifact per summary engine, so a TF-IDF batch run never replaces the spaCy summaries
+ARTIFACT_PATHS = {'spacy': DEFAULT_ARTIFACT_PATH, 'tfidf': 'ai_analysis_artifact_tfidf.json'}
+
+VIBE_DICTIONARY = {
+    "✨ Great Ambience": ["ambience", "atmosphere", "decor", "interior", "view", "vibe"],
+    "👍 Excellent Service": ["service", "staff", "owner", "friendly", "welcoming", "hospitable", "polite", "behavior"],
+    "👥 Good for Groups": ["friends", "family", "group", "gathering", "party", "celebration"],
+    "💑 Romantic Spot": ["date", "romantic", "couple", "cozy", "intimate"],
+    "💸 Budget-Friendly": ["cheap", "affordable", "value", "price", "reasonable", "economic"],
+    "🍗 Meat Lover's Choice": ["chicken", "mutton", "fish", "kebab", "non-veg", "tandoori"],
+    "🍚 Biryani Hub": ["biryani", "briyani", "hyderabadi"],
+    "☕ Cafe & Quick Bites": ["cafe", "coffee", "snacks", "bakery", "mocktail"]
+}
+
+# The full 23-category dictionary used by final.py
+EXTENDED_VIBE_DICTIONARY = {
+    "✨ Great Ambience": ["ambience", "atmosphere", "decor", "interior", "view", "vibe"],
+    "👍 Excellent Service": ["service", "staff", "owner", "friendly", "welcoming", "hospitable", "polite", "behavior"],
+    "👥 Good for Groups": ["friends", "family", "group", "gathering", "party", "celebration"],
+    "💑 Romantic Spot": ["date", "romantic", "couple", "cozy", "intimate"],
+    "💸 Budget-Friendly": ["cheap", "affordable", "value", "price", "reasonable", "economic"],
+    "🍗 Meat Lover's Choice": ["chicken", "mutton", "fish", "kebab", "non-veg", "tandoori"],
+    "🍚 Biryani Hub": ["biryani", "briyani", "hyderabadi"],
+    "☕ Cafe & Quick Bites": ["cafe", "coffee", "snacks", "bakery", "mocktail"],
+    "🌿 Veggie Paradise": ["vegetarian", "veg", "vegan", "paneer", "thali", "plant-based", "pure veg", "shakahaar", "veg thali"],
+    "🍹 Drinks & Mocktails": ["mocktail", "cocktail", "beverage", "drink", "refreshing"],
+    "🍰 Desserts & Sweets": ["dessert", "sweet", "ice cream", "pastry", "cake", "pudding", "gulab jamun", "rasgulla"],
+    "🌶️ Spicy & Flavorful": ["spicy", "flavorful", "tasty", "delicious", "mouthwatering", "zesty"],
+    "🍽️ Diverse Cuisine": ["cuisine", "variety", "menu", "options", "international", "fusion"],
+    "🌟 Hidden Gem": ["hidden gem", "secret", "underrated", "local favorite", "off the beaten path"],
+    "🍕 Pizza & Fast Food": ["pizza", "burger", "fast food", "snacks", "quick bites", "fries"],
+    "🍜 Noodles & Chinese": ["noodles", "chinese", "manchurian", "spring roll", "dimsum", "chowmein"],
+    "🍛 Indian Classics": ["indian", "curry", "dal", "roti", "naan", "chapati", "paratha"],
+    "🍣 Sushi & Japanese": ["sushi", "japanese", "ramen", "tempura", "sashimi"],
+
+    "🎉 Party & Celebration": ["party", "celebration", "event", "birthday", "anniversary", "get-together"],
+    "🌍 International Flavors": ["international", "global", "world cuisine", "fusion", "exotic"],
+    "🍳 Breakfast & Brunch": ["breakfast", "brunch", "eggs", "pancakes", "waffles", "toast"],
+    "🍔 Street Food Vibes": ["street food", "chaat", "pani puri", "bhel puri", "vada pav", "pav bhaji"],
+    "🍖 Barbecue & Grill": ["barbecue", "grill", "tandoor", "smoked", "charcoal", "roasted"]
+}
+
+VIBE_MATCHER = VibeMatcher(VIBE_DICTIONARY)
+
+NO_REVIEWS_MESSAGE = "No reviews available for AI analysis."
+NO_SUMMARY_MESSAGE = "Could not generate a highlight summary."
+
+
+# --- TEXT CLEANING, VIBES & SUMMARY (shared by the app and the batch analyzer) ---
+def clean_review_text(review_text):
+    """Reduces a scraped review blob to its review bodies (see review_parser.parse_review_blob)."""
+    return review_bodies_text(review_text)
+
+def detect_vibes(text, min_mentions=2):
+    """Returns every vibe whose keywords are mentioned at least `min_mentions` times."""
+    return VIBE_MATCHER.vibes(text, min_mentions)
+
+def detect_vibes_many(texts, min_mentions=2):
+    """Keyword vibes for a whole column of clean review texts in one batch (no spaCy needed)."""
+    return VIBE_MATCHER.vibes_many([t if isinstance(t, str) else "" for t in texts], min_mentions)
+
+def summarize_doc(doc):
+    """Extractive summary: the two sentences with the highest content-word density."""
+    sentence_scores = {}
+    for sentence in doc.sents:
+        if len(sentence.text.strip()) < 30 or "thank you" in sentence.text.lower(): continue
+        score = sum(1 for token in sentence if token.pos_ in ['NOUN', 'ADJ', 'VERB'] and not token.is_stop)
+        if len(sentence) > 1: sentence_scores[sentence.text.strip()] = score / len(sentence)
+
+    top_sentences = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:2]
+    summary = " ".join(top_sentences)
+    return summary if summary else NO_SUMMARY_MESSAGE
+
+
+# --- NLP PROFILES ---
+# The summarizer only reads sentence boundaries, POS tags (tagger + attribute_ruler) and is_stop (a lexical flag).
+#   full: the whole pipeline
+#   lean: drops NER and the lemmatizer, which the summarizer never reads -> identical summaries
+#   fast: also drops the dependency parser and segments sentences with 'senter' (or a rule-based sentencizer);
+#         sentence splits can differ slightly, so check it with nlp_benchmark.py before switching
+NLP_PROFILES = {
+    'full': [],
+    'lean': ['ner', 'lemmatizer'],
+    'fast': ['ner', 'lemmatizer', 'parser'],
+}
+DEFAULT_NLP_PROFILE = 'lean'
+
+def load_nlp(model_name="en_core_web_sm", profile=DEFAULT_NLP_PROFILE):
+    """Loads a spaCy pipeline with only the components the given profile needs."""
+    import spacy
+    if profile not in NLP_PROFILES:
+        raise ValueError(f"Unknown NLP profile '{profile}', expected one of {list(NLP_PROFILES)}")
+    nlp = spacy.load(model_name, exclude=NLP_PROFILES[profile])
+    if not (nlp.has_pipe('parser') or nlp.has_pipe('sentencizer')):
+        if 'senter' in nlp.disabled:
+            nlp.enable_pipe('senter')
+        elif not nlp.has_pipe('senter'):
+            nlp.add_pipe('sentencizer', first=True)
+    return nlp
+
+def analyze_review_text(review_text, nlp=None, summarizer=None):
+    """
+    Runs the full vibe + summary analysis on a single block of review text.
+    The summary comes from `summarizer` (e.g. tfidf_summarizer.TfidfSummarizer) if given, else from the spaCy `nlp` scorer.
+    """
+    if not isinstance(review_text, str):
+        return [], NO_REVIEWS_MESSAGE
+    return analyze_clean_text(clean_review_text(review_text), nlp, summarizer)
+
+def analyze_clean_text(text, nlp=None, summarizer=None):
+    """Same as analyze_review_text, for text already reduced to its review bodies (e.g. from the review store)."""
+    if not isinstance(text, str) or (nlp is None and summarizer is None) or not text.strip():
+        return [], NO_REVIEWS_MESSAGE
+    summary = summarizer.summarize(text) if summarizer is not None else summarize_doc(nlp(text))
+    return detect_vibes(text), summary
+
+
+# --- PRECOMPUTED ARTIFACT I/O ---
+def write_analysis_artifact(records, path=DEFAULT_ARTIFACT_PATH, model_name=None, engine='spacy'):
+    """Atomically writes batch analysis records (Name, Text_Hash, Vibes, Summary) of one engine to disk."""
+    payload = {
+        "analyzer_version": ANALYZER_VERSION,
+        "engine": engine,
+        "spacy_model": model_name,
+        "records": records,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_analysis_artifact(path=DEFAULT_ARTIFACT_PATH, engine='spacy'):
+    """Loads precomputed results of `engine` as {(name, text_hash): (vibes, summary)}.
+
+    Returns an empty dict when the artifact is missing, unreadable or was built
+    by a different analyzer version or engine, so callers can always fall back to live analysis.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # Artifacts written before the engine was recorded only name the model ("tfidf" for TF-IDF runs)
+    built_by = payload.get("engine") or ('tfidf' if payload.get("spacy_model") == 'tfidf' else 'spacy')
+    if payload.get("analyzer_version") != ANALYZER_VERSION or built_by != engine:
+        return {}
+    return {(rec["Name"], rec["Text_Hash"]): (rec["Vibes"], rec["Summary"]) for rec in payload.get("records", [])}
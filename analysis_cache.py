@@ -0,0 +1,168 @@
+import argparse
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from ai_engine import ANALYZER_VERSION, DEFAULT_NLP_PROFILE
+
+DEFAULT_CACHE_PATH = 'ai_analysis_cache.sqlite3'
+DEFAULT_MAX_ENTRIES = 5000
+# Recency touches and hit/miss counts are written in batches of this many reads, so reads rarely take the write lock
+FLUSH_EVERY = 64
+
+
+def analysis_cache_key(text_hash, engine='spacy', variant=None):
+    """
+    Cache key of one analysis: the review text's hash plus everything that changes the result for it.
+    `variant` is the spaCy NLP profile (default: DEFAULT_NLP_PROFILE) or, for TF-IDF, the summarizer's
+    corpus_version, since its IDF weights come from every restaurant's reviews.
+    """
+    if variant is None:
+        if engine == 'tfidf':
+            raise ValueError("TF-IDF cache keys need the summarizer's corpus_version")
+        variant = DEFAULT_NLP_PROFILE
+    return f"v{ANALYZER_VERSION}:{engine}:{variant}:{text_hash}"
+
+
+class AnalysisCache:
+    """
+    Disk-backed LRU cache of (vibes, summary) results in SQLite, so analyses survive restarts and are shared
+    by every app process on the host. Holds at most `max_entries` results, evicting the least recently used.
+    Hit/miss counters are stored alongside, so they cover all processes too. Reads only queue their
+    recency update and counter increment; those are written FLUSH_EVERY reads at a time, before every
+    write, and when the process exits.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, vibes TEXT, summary TEXT, last_used REAL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis (last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+        self._touched = {}
+        self._counts = {'hits': 0, 'misses': 0}
+        atexit.register(self.flush)
+
+    def get(self, key, count=True):
+        """The cached (vibes, summary) for `key`, or None. Counts a hit or a miss unless `count` is False."""
+        with self._lock:
+            row = self._conn.execute("SELECT vibes, summary FROM analysis WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._touched[key] = time.time()
+            if count:
+                self._counts['hits' if row is not None else 'misses'] += 1
+            if len(self._touched) + sum(self._counts.values()) >= FLUSH_EVERY:
+                self._write_pending()
+        return None if row is None else (json.loads(row[0]), row[1])
+
+    def _write_pending(self):
+        """Writes the queued recency updates and counters (caller holds the lock)."""
+        if not self._touched and not any(self._counts.values()):
+            return
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._apply_pending()
+
+    def _apply_pending(self):
+        self._conn.executemany("UPDATE analysis SET last_used = MAX(last_used, ?) WHERE key = ?",
+                               [(used, key) for key, used in self._touched.items()])
+        self._conn.executemany("UPDATE counters SET value = value + ? WHERE name = ?", [(n, name) for name, n in self._counts.items() if n])
+        self._touched = {}
+        self._counts = {'hits': 0, 'misses': 0}
+
+    def flush(self):
+        with self._lock:
+            self._write_pending()
+
+    def put(self, key, vibes, summary):
+        self.put_many([(key, vibes, summary)])
+
+    def put_many(self, entries):
+        """Stores (key, vibes, summary) entries in one transaction, then evicts down to max_entries."""
+        now = time.time()
+        rows = [(key, json.dumps(list(vibes), ensure_ascii=False), summary, now) for key, vibes, summary in entries]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Queued recency updates go first, so eviction sees which entries were read
+            self._apply_pending()
+            self._conn.executemany("INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?)", rows)
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM analysis").fetchone()
+            if count > self.max_entries:
+                self._conn.execute("DELETE FROM analysis WHERE key IN (SELECT key FROM analysis ORDER BY last_used LIMIT ?)",
+                                   (count - self.max_entries,))
+
+    def contains(self, keys):
+        """The subset of `keys` already cached (no counters, no LRU touch)."""
+        with self._lock:
+            return {key for key in keys if self._conn.execute("SELECT 1 FROM analysis WHERE key = ?", (key,)).fetchone()}
+
+    def stats(self):
+        with self._lock:
+            self._write_pending()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM analysis").fetchone()
+        lookups = counters['hits'] + counters['misses']
+        return {"entries": entries, "max_entries": self.max_entries, "hits": counters['hits'],
+                "misses": counters['misses'], "hit_rate": counters['hits'] / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._touched = {}
+            self._counts = {'hits': 0, 'misses': 0}
+            self._conn.execute("DELETE FROM analysis")
+            self._conn.execute("UPDATE counters SET value = 0")
+
+
+# --- WARM-UP: fill the cache from the current dataset ---
+def warm_up(cache, input_path='downloadrev.csv', engine='spacy', model_name="en_core_web_sm", workers=None, profile=DEFAULT_NLP_PROFILE):
+    """
+    Analyzes every restaurant in `input_path` that isn't cached yet, in one batch run. Returns how many were added.
+    TF-IDF is fitted on the whole dataset, exactly like the app's summarizer, and only summarizes the missing ones.
+    """
+    from batch_analyzer import load_texts_from_csv, run_batch_analysis, run_tfidf_batch_analysis
+
+    items = load_texts_from_csv(input_path)
+    summarizer = None
+    if engine == 'tfidf':
+        from tfidf_summarizer import TfidfSummarizer
+        summarizer = TfidfSummarizer.from_csv(input_path)
+    variant = summarizer.corpus_version if summarizer is not None else profile
+    cached = cache.contains([analysis_cache_key(text_hash, engine, variant) for _, text_hash, _ in items])
+    missing = [item for item in items if analysis_cache_key(item[1], engine, variant) not in cached]
+    print(f"{len(items) - len(missing)} of {len(items)} restaurants already cached.")
+    if not missing:
+        return 0
+    if engine == 'tfidf':
+        records = run_tfidf_batch_analysis(missing, summarizer)
+    else:
+        records = run_batch_analysis(missing, model_name, workers, profile=profile)
+    cache.put_many([(analysis_cache_key(r['Text_Hash'], engine, variant), r['Vibes'], r['Summary']) for r in records])
+    return len(records)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Inspect, clear or warm up the persistent AI analysis cache.")
+    parser.add_argument('command', choices=['stats', 'warm-up', 'clear'])
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument('--input', default='downloadrev.csv', help="Dataset to warm the cache from.")
+    parser.add_argument('--engine', default='spacy', choices=['spacy', 'tfidf'])
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--profile', default=DEFAULT_NLP_PROFILE, help="spaCy profile the app runs (see ai_engine.NLP_PROFILES).")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    cache = AnalysisCache(args.cache, args.max_entries)
+    if args.command == 'warm-up':
+        start = time.perf_counter()
+        added = warm_up(cache, args.input, args.engine, args.model, args.workers, args.profile)
+        print(f"Added {added} analyses in {time.perf_counter() - start:.1f}s")
+    elif args.command == 'clear':
+        cache.clear()
+        print("Cache cleared.")
+    stats = cache.stats()
+    print(f"{stats['entries']}/{stats['max_entries']} entries, {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
@@ -1,10 +1,24 @@
+import time
+_import_start = time.perf_counter()
 import pandas as pd
 import numpy as np
 import streamlit as st
-import os
-import re
-import spacy
-import subprocess
+from recency import add_recency_scores
+from search_index import RestaurantSearchIndex
+from review_search import load_or_build_index
+from pagination import paginate
+from ranking import RankingIndex, top_suggestions
+from spatial import SpatialIndex, nearby_restaurants
+from food_tour import PRECISE_CONFIDENCE, WALKING_SPEED_KMH, RoutePlanner, tour_legs
+from gazetteer import LocalityGazetteer
+from awards import compute_vibe_awards
+from master_cache import load_master_frame
+from record_linkage import link_columns
+from ai_engine import VIBE_DICTIONARY, ARTIFACT_PATHS, analyze_clean_text, detect_vibes_many, load_analysis_artifact
+from review_parser import load_current_store, review_bodies_by_hash, review_text_hash
+from startup import LazySpacyModel, StartupTimer
+from analysis_cache import AnalysisCache, analysis_cache_key
+IMPORT_SECONDS = time.perf_counter() - _import_start
 
 # ==================================================================================================
 # PAGE CONFIGURATION & STYLING (Your "WOW" Design)
@@ -105,65 +119,102 @@ st.markdown("""
 # ==================================================================================================
 
 @st.cache_resource
-def load_spacy_model():
-    """Loads the spaCy model and downloads if it's not present."""
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        with st.spinner("AI Language model not found. Downloading for the first time... (this may take a minute)"):
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-        return spacy.load("en_core_web_sm")
-
-nlp = load_spacy_model()
-
-VIBE_DICTIONARY = {
-    "✨ Great Ambience": ["ambience", "atmosphere", "decor", "interior", "view", "vibe"],
-    "👍 Excellent Service": ["service", "staff", "owner", "friendly", "welcoming", "hospitable", "polite", "behavior"],
-    "👥 Good for Groups": ["friends", "family", "group", "gathering", "party", "celebration"],
-    "💑 Romantic Spot": ["date", "romantic", "couple", "cozy", "intimate"],
-    "💸 Budget-Friendly": ["cheap", "affordable", "value", "price", "reasonable", "economic"],
-    "🍗 Meat Lover's Choice": ["chicken", "mutton", "fish", "kebab", "non-veg", "tandoori"],
-    "🍚 Biryani Hub": ["biryani", "briyani", "hyderabadi"],
-    "☕ Cafe & Quick Bites": ["cafe", "coffee", "snacks", "bakery", "mocktail"]
-}
+def get_nlp_model():
+    """The spaCy model, shared by all sessions. Nothing is imported or loaded until warm_up() or get()."""
+    return LazySpacyModel("en_core_web_sm")
+
+@st.cache_resource
+def get_startup_timer():
+    return StartupTimer()
+
+# --- SUMMARY ENGINES ---
+SUMMARY_ENGINES = {"🧠 spaCy (POS density)": 'spacy', "⚡ TF-IDF (no model download)": 'tfidf'}
+
+def get_summary_engine():
+    """The engine picked in the sidebar ('spacy' or 'tfidf')."""
+    return SUMMARY_ENGINES[st.session_state.get('summary_engine', next(iter(SUMMARY_ENGINES)))]
+
+@st.cache_resource
+def get_tfidf_summarizer():
+    """TF-IDF summarizer fitted on every restaurant's reviews. Needs no language model."""
+    from tfidf_summarizer import TfidfSummarizer  # scikit-learn is only imported if this engine is used
+    return TfidfSummarizer.from_csv('downloadrev.csv', get_review_bodies())
+
+@st.cache_resource
+def get_review_store():
+    """The parsed reviews (hash, order, age, body) from the Parquet review store, so no raw dump is re-parsed."""
+    return load_current_store('downloadrev.csv', columns=['Text_Hash', 'Review_Index', 'Age_Text', 'Body'])
+
+@st.cache_resource
+def get_review_bodies():
+    """Clean review text per raw dump hash (see review_parser.review_bodies_by_hash)."""
+    return review_bodies_by_hash(get_review_store())
 
 # --- ON-DEMAND AI ANALYSIS FUNCTION ---
-@st.cache_data # Caches the result for each unique restaurant's review text
-def run_ai_analysis_on_demand(review_text):
-    """The AI Engine. Runs only when needed on a single block of text."""
-    if not isinstance(review_text, str) or nlp is None or not review_text.strip(): 
-        return [], "No reviews available for AI analysis."
-
-    text = re.sub(r'Local Guide·.+?photos|photos|review(s)?|\d+ (months|weeks|days|hours) ago|New|See translation \(English\)', '', review_text, flags=re.IGNORECASE)
-    text = re.sub(r'[₹₹][0-9,]+–[0-9,]+', '', text)
-    text = re.sub(r'\n', ' ', text).strip()
-    
-    text_lower = text.lower()
-    vibes_found = [vibe for vibe, keywords in VIBE_DICTIONARY.items() if sum(text_lower.count(kw) for kw in keywords) >= 2]
-            
-    doc = nlp(text)
-    sentence_scores = {}
-    for sentence in doc.sents:
-        if len(sentence.text.strip()) < 30 or "thank you" in sentence.text.lower(): continue
-        score = sum(1 for token in sentence if token.pos_ in ['NOUN', 'ADJ', 'VERB'] and not token.is_stop)
-        if len(sentence) > 1: sentence_scores[sentence.text.strip()] = score / len(sentence)
-    
-    top_sentences = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:2]
-    summary = " ".join(top_sentences)
-    
-    return vibes_found, summary if summary else "Could not generate a highlight summary."
+@st.cache_resource
+def get_analysis_cache():
+    """Disk-backed LRU cache of analysis results, shared across restarts and app processes."""
+    return AnalysisCache()
+
+def analysis_variant(engine):
+    """What besides the text decides an analysis: the spaCy profile, or the TF-IDF corpus (see analysis_cache_key)."""
+    return get_tfidf_summarizer().corpus_version if engine == 'tfidf' else get_nlp_model().profile
+
+def run_ai_analysis_on_demand(review_body, text_hash, engine='spacy'):
+    """The AI Engine. Runs only when needed on one restaurant's clean review text, and only once per text across restarts."""
+    cache = get_analysis_cache()
+    key = analysis_cache_key(text_hash, engine, analysis_variant(engine))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    if engine == 'tfidf':
+        result = analyze_clean_text(review_body, summarizer=get_tfidf_summarizer())
+    else:
+        nlp = get_nlp_model().get()
+        if nlp is None:
+            return analyze_clean_text(review_body, nlp)  # Don't cache results of a failed model load
+        result = analyze_clean_text(review_body, nlp)
+    cache.put(key, *result)
+    return result
 
-# --- LEAN DATA LOADING FUNCTION ---
 @st.cache_data
-def load_base_master_data():
+def load_precomputed_analysis(engine='spacy'):
+    """Loads vibes and summaries precomputed by batch_analyzer.py with `engine`, if that engine's artifact exists."""
+    return load_analysis_artifact(ARTIFACT_PATHS[engine], engine)
+
+def get_precomputed_analysis(data_row, engine='spacy'):
+    """The precomputed (vibes, summary) for this row, or None if its review text has changed since the batch run."""
+    return load_precomputed_analysis(engine).get((data_row['Name'], data_row['Review_Hash']))
+
+def get_stored_analysis(data_row):
+    """A precomputed or previously cached spaCy analysis for this row, without running the model."""
+    precomputed = get_precomputed_analysis(data_row)
+    if precomputed is not None:
+        return precomputed
+    return get_analysis_cache().get(analysis_cache_key(data_row['Review_Hash'], 'spacy', analysis_variant('spacy')), count=False)
+
+def get_ai_analysis(data_row, engine='spacy'):
+    """Serves the precomputed analysis when it matches the current review text, else runs it live."""
+    precomputed = get_precomputed_analysis(data_row, engine)
+    if precomputed is not None:
+        return precomputed
+    return run_ai_analysis_on_demand(data_row['Review_Body'], data_row['Review_Hash'], engine)
+
+# --- LEAN DATA LOADING FUNCTION ---
+MASTER_SOURCES = ['download.csv', 'downloadrev.csv', 'silchar_restaurants_geocoded.csv']
+MASTER_CACHE_PATH = 'master_cache_app.arrow'
+MASTER_CACHE_VERSION = 7  # Bump whenever build_base_master_data() changes its output
+
+def build_base_master_data():
     """Loads and merges data WITHOUT running the heavy AI pipeline on startup."""
-    try:
-        df_main = pd.read_csv('download.csv')
-        df_reviews = pd.read_csv('downloadrev.csv')
-    except FileNotFoundError: return None
+    df_main = pd.read_csv('download.csv')
+    df_reviews = pd.read_csv('downloadrev.csv')
     
-    df_master = pd.merge(df_main, df_reviews[['Name', 'Reviews_Text']], on='Name', how='left')
+    # Fuzzy record linkage, so a review dump that spells a name differently still finds its restaurant
+    df_master = link_columns(df_main, df_reviews, ['Reviews_Text'])
     df_master['Reviews_Text'] = df_master['Reviews_Text'].fillna("")
+    df_geo = pd.read_csv('silchar_restaurants_geocoded.csv').drop_duplicates(['Name', 'Address'])
+    df_master = pd.merge(df_master, df_geo[['Name', 'Address', 'latitude', 'longitude', 'geocode_confidence']], on=['Name', 'Address'], how='left')
     
     df_master['Rating'] = pd.to_numeric(df_master['Rating'], errors='coerce')
     df_master['Reviews'] = pd.to_numeric(df_master['Reviews'], errors='coerce')
@@ -171,11 +222,62 @@ def load_base_master_data():
     df_master['Reviews'] = df_master['Reviews'].astype(int)
     
     df_master['Gem_Score'] = df_master['Rating'] * np.log1p(df_master['Reviews'])
-    df_master['Hype_Score'] = df_master['Reviews'] / df_master['Reviews_Text'].str.count('year ago').clip(lower=1)
     df_master['Has_AI_Analysis'] = df_master['Reviews_Text'].str.strip() != ""
+    df_master['Review_Hash'] = df_master['Reviews_Text'].map(review_text_hash)
+    df_master = add_recency_scores(df_master, get_review_store())
+    # Analyses read the parsed review bodies from the review store, so the raw dumps are never re-parsed
+    bodies = get_review_bodies()
+    df_master['Review_Body'] = df_master['Review_Hash'].map(lambda text_hash: bodies.get(text_hash, ""))
+    df_master = df_master.drop(columns=['Reviews_Text'])
+    # Keyword vibes are cheap enough to compute up front, so they can drive the vibe filters
+    df_master['Vibes'] = [tuple(vibes) for vibes in detect_vibes_many(df_master['Review_Body'])]
     
     return df_master
 
+@st.cache_data
+def load_base_master_data():
+    """Serves the master data from the columnar cache file, rebuilding it only when a source CSV changed."""
+    try:
+        df_master = load_master_frame(build_base_master_data, MASTER_SOURCES, MASTER_CACHE_PATH, MASTER_CACHE_VERSION)
+    except FileNotFoundError: return None
+    df_master['Vibes'] = df_master['Vibes'].map(tuple)
+    return df_master
+
+@st.cache_resource
+def get_search_index(df_search):
+    """Builds the Name/Address/locality search index once per data load."""
+    return RestaurantSearchIndex.from_frame(df_search)
+
+@st.cache_resource
+def get_review_search_index():
+    """Loads the on-disk BM25 review index, rebuilding it only when downloadrev.csv changed."""
+    return load_or_build_index('downloadrev.csv')
+
+@st.cache_data
+def get_vibe_awards(df_awards, min_reviews):
+    """Winners for every vibe category, computed once per data load and qualifying threshold."""
+    return compute_vibe_awards(df_awards, list(VIBE_DICTIONARY), min_reviews=min_reviews)
+
+@st.cache_resource
+def get_spatial_index(df_geo):
+    """Builds the KD-tree over restaurant coordinates once per data load."""
+    return SpatialIndex(df_geo)
+
+@st.cache_resource
+def get_route_planner(df_geo):
+    """Builds the food tour planner (with its route cache) once per data load."""
+    return RoutePlanner(df_geo)
+
+@st.cache_resource
+def get_gazetteer():
+    """Locality centroids offered as starting points on the Nearby page."""
+    return LocalityGazetteer.load()
+
+@st.cache_resource
+def get_ranking_index(df_rank):
+    """Builds the Gem Score / vibe ranking index once per data load."""
+    return RankingIndex(df_rank, vibes_col='Vibes', vibe_names=list(VIBE_DICTIONARY))
+
 # ==================================================================================================
 # UI COMPONENTS
 # ==================================================================================================
@@ -199,15 +301,26 @@ def display_restaurant_card(data_row, rank=None):
                 st.markdown(f'<div class="address-box"><p><i class="bi bi-geo-alt-fill"></i> &nbsp;{data_row["Address"]}</p></div>', unsafe_allow_html=True)
         with tab2:
             if data_row['Has_AI_Analysis']:
-                # Run the AI engine only when this tab is viewed
-                with st.spinner("Running AI Analysis..."):
-                    vibes, summary = run_ai_analysis_on_demand(data_row['Reviews_Text'])
-                
-                st.markdown(f'<div class="summary-box"><p><i class="bi bi-robot"></i> &nbsp;{summary}</p></div>', unsafe_allow_html=True)
-                if vibes:
-                    st.markdown("**Detected Vibes:**")
-                    vibe_html = "".join([f"<span class='vibe-tag'>{vibe}</span>" for vibe in vibes])
-                    st.markdown(vibe_html, unsafe_allow_html=True)
+                # Tabs render eagerly, so the live spaCy engine only runs once the user switches it on for this card.
+                # TF-IDF needs no model and takes milliseconds, so it runs straight away.
+                engine = get_summary_engine()
+                analysis = get_stored_analysis(data_row) if engine == 'spacy' else get_ai_analysis(data_row, engine)
+                if analysis is None and st.toggle("🤖 Run AI Analysis", key=f"ai_toggle_{data_row.name}"):
+                    nlp_model = get_nlp_model()
+                    with st.spinner("Running AI Analysis..." if nlp_model.is_loaded else "Loading the AI language model (first run only)..."):
+                        if nlp_model.get() is None:
+                            st.error(f"The AI language model could not be loaded: {nlp_model.error}")
+                        else:
+                            analysis = get_ai_analysis(data_row)
+                if analysis is None:
+                    st.caption("Switch on to read and summarize this restaurant's reviews.")
+                else:
+                    vibes, summary = analysis
+                    st.markdown(f'<div class="summary-box"><p><i class="bi bi-robot"></i> &nbsp;{summary}</p></div>', unsafe_allow_html=True)
+                    if vibes:
+                        st.markdown("**Detected Vibes:**")
+                        vibe_html = "".join([f"<span class='vibe-tag'>{vibe}</span>" for vibe in vibes])
+                        st.markdown(vibe_html, unsafe_allow_html=True)
             else:
                 st.info("No detailed review text was collected for this restaurant.")
 
@@ -223,46 +336,138 @@ def show_home_dashboard(df):
     col1.metric("Total Restaurants Analyzed", f"{len(df)}")
     col2.metric("With AI Review Data", f"{df['Has_AI_Analysis'].sum()} 🔥")
     col3.metric("Average Rating", f"{df['Rating'].mean():.2f} ⭐")
-    st.subheader("🏆 Top 10 Restaurants (by Gem Score)")
+    rank_options = {"💎 Gem Score": 'Gem_Score', "⏳ Recent Gem Score": 'Recent_Gem_Score', "🚀 Trending Now": 'Trending_Score'}
+    rank_label = st.radio("Rank restaurants by", list(rank_options), horizontal=True)
+    rank_col, rank_title = rank_options[rank_label], rank_label.split(' ', 1)[1]
+    st.subheader(f"🏆 Top 10 Restaurants (by {rank_title})")
     st.dataframe(
-        df[['Name', 'Rating', 'Reviews', 'Gem_Score']].sort_values('Gem_Score', ascending=False).head(10),
+        df[['Name', 'Rating', 'Reviews', rank_col]].sort_values(rank_col, ascending=False).head(10),
         use_container_width=True,
-        column_config={"Gem_Score": st.column_config.ProgressColumn("Gem Score",format="%.2f",min_value=float(df['Gem_Score'].min()),max_value=float(df['Gem_Score'].max()))}
+        column_config={rank_col: st.column_config.ProgressColumn(rank_title,format="%.2f",min_value=float(df[rank_col].min()),max_value=float(df[rank_col].max()))}
     )
 
+def show_top_suggestions(df):
+    st.subheader("💎 Top Suggestions")
+    col1, col2, col3 = st.columns(3)
+    rating_filter = col1.slider('Minimum Rating', 1.0, 5.0, 4.0, 0.1)
+    reviews_filter = col2.slider('Minimum Number of Reviews', 0, 1000, 20, 5)
+    stops_filter = col3.number_input('Number of Suggestions to Show', 1, 20, 5)
+    vibe_filter = st.multiselect("Must have all of these vibes", list(VIBE_DICTIONARY))
+
+    ranking = get_ranking_index(df[['Rating', 'Reviews', 'Gem_Score', 'Has_AI_Analysis', 'Vibes']])
+    suggestions = top_suggestions(df, ranking, stops_filter, rating_filter, reviews_filter, vibe_filter)
+    if suggestions.empty:
+        st.warning("No restaurants match your criteria. Try loosening the filters!")
+    elif st.toggle("🗺️ Turn these suggestions into a walking food tour"):
+        show_food_tour(df, suggestions)
+    for rank, (index, row) in enumerate(suggestions.iterrows(), 1):
+        display_restaurant_card(row, rank=rank)
+
+def show_food_tour(df, suggestions):
+    """Visiting order and walking distance for the suggested stops (nearest neighbour + 2-opt)."""
+    round_trip = st.checkbox("Finish where I started")
+    precise_only = st.checkbox("Only stops with an exact location",
+                               help="Most restaurants are only placed at their locality, PIN code or city centre.")
+    stops = suggestions[suggestions['geocode_confidence'].isin(PRECISE_CONFIDENCE)] if precise_only else suggestions
+    planner = get_route_planner(df[['latitude', 'longitude']])
+    route, total_km = planner.plan(df.index.get_indexer(stops.index), round_trip)
+    if len(route) < 2:
+        st.warning(f"Not enough of these restaurants have {'an exact' if precise_only else 'a'} location to plan a tour.")
+        return
+    legs = tour_legs(df, route)
+    skipped = len(suggestions) - len(route)
+    approximate = int(legs['Approximate'].sum())
+    estimate = "roughly " if approximate else "about "
+    st.success(f"**{len(route)} stops, {'~' if approximate else ''}{total_km:.1f} km** ({estimate}{total_km / WALKING_SPEED_KMH * 60:.0f} minutes on foot)"
+               + (f" · {skipped} without {'an exact' if precise_only else 'a'} location skipped" if skipped else ""))
+    if approximate:
+        st.caption(f"⚠️ {approximate} of these stops are only placed at their locality, PIN code or city centre, "
+                   "so the distances and walking times are estimates.")
+    legs['Location'] = np.where(legs['Approximate'], "approx. " + legs['geocode_confidence'].fillna("city") + " centre", "exact")
+    col1, col2 = st.columns(2)
+    col1.dataframe(legs[['Name', 'Rating', 'Leg_km', 'Walk_min', 'Location']].reset_index(drop=True), use_container_width=True,
+                   column_config={'Leg_km': st.column_config.NumberColumn("Walk (km)", format="%.2f"),
+                                  'Walk_min': st.column_config.NumberColumn("Walk (min)", format="%.0f")})
+    col2.map(legs[['latitude', 'longitude']])
+
 def show_foodie_awards(df):
     st.subheader("🏆 The 2025 Silchar Foodie Awards")
-    st.info("Award winners are determined by running AI analysis on restaurants with review data.")
-    
-    # Run analysis just for the restaurants with reviews to determine winners
-    ai_df = df[df['Has_AI_Analysis']].copy()
-    if not ai_df.empty:
-        award_data = ai_df['Reviews_Text'].apply(run_ai_analysis_on_demand)
-        ai_df['Vibes'] = [res[0] for res in award_data]
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### 👍 Best Service")
-            service_df = ai_df[ai_df['Vibes'].apply(lambda v: "👍 Excellent Service" in v)]
-            if not service_df.empty: st.success(f"**Winner:** {service_df.sort_values('Rating', ascending=False).iloc[0]['Name']}")
-            else: st.warning("Not enough data.")
-        with col2:
-            st.markdown("#### ✨ Best Ambience")
-            ambience_df = ai_df[ai_df['Vibes'].apply(lambda v: "✨ Great Ambience" in v)]
-            if not ambience_df.empty: st.success(f"**Winner:** {ambience_df.sort_values('Rating', ascending=False).iloc[0]['Name']}")
-            else: st.warning("Not enough data.")
+    st.info("Each vibe's award goes to the highest-rated restaurant whose reviews repeatedly mention it (ties go to the higher Gem Score).")
+    min_reviews = st.slider("Minimum number of reviews to qualify", 0, 500, 20, 10)
+
+    awards = get_vibe_awards(df[['Name', 'Rating', 'Reviews', 'Gem_Score', 'Vibes']], min_reviews)
+    cols = st.columns(2)
+    for i, vibe in enumerate(VIBE_DICTIONARY):
+        placed = awards[awards['Vibe'] == vibe]
+        with cols[i % 2]:
+            st.markdown(f"#### {vibe}")
+            if placed.empty:
+                st.warning("Not enough data.")
+                continue
+            winner = placed.iloc[0]
+            st.success(f"**Winner:** {winner['Name']} (⭐ {winner['Rating']}, {int(winner['Reviews']):,} reviews)")
+            runner_up = f"Runner-up: {placed.iloc[1]['Name']} · " if len(placed) > 1 else ""
+            st.caption(f"{runner_up}{winner['Contenders']} contenders")
 
 def show_restaurant_explorer(df):
     st.subheader("🧾 Full Restaurant Directory")
     search_query = st.text_input("Search by Name or Address Keyword")
     results = df
     if search_query:
-        mask = df['Name'].str.contains(search_query, case=False) | df['Address'].str.contains(search_query, case=False, na=False)
-        results = df[mask]
-    st.info(f"Showing {len(results)} of {len(df)} total restaurants.")
-    for index, row in results.iterrows():
+        hits = get_search_index(df[['Name', 'Address']]).search(search_query)
+        results = df.iloc[[pos for pos, _ in hits]]
+    st.info(f"Found {len(results)} of {len(df)} total restaurants.")
+    for index, row in paginate(results, key="explorer").iterrows():
         display_restaurant_card(row)
 
+def show_nearby(df):
+    st.subheader("📍 Nearby Restaurants")
+    gazetteer = get_gazetteer()
+    places = dict(zip(gazetteer.locality_names, gazetteer.locality_points))
+    col1, col2 = st.columns(2)
+    place = col1.selectbox("Where are you?", list(places) + ["📌 Custom coordinates"])
+    if place in places:
+        lat, lon = places[place]
+    else:
+        lat = col1.number_input("Latitude", -90.0, 90.0, float(gazetteer.city[0]), format="%.5f")
+        lon = col1.number_input("Longitude", -180.0, 180.0, float(gazetteer.city[1]), format="%.5f")
+    mode = col2.radio("Show", ("Best Gem Score within a radius", "The closest restaurants"))
+    rating_filter = col2.slider('Minimum Rating', 1.0, 5.0, 4.0, 0.1, key="nearby_rating")
+    index = get_spatial_index(df[['latitude', 'longitude', 'Rating', 'Gem_Score']])
+    if mode == "Best Gem Score within a radius":
+        radius = st.slider("Radius (km)", 0.5, 10.0, 2.0, 0.5)
+        results = nearby_restaurants(df, *index.within(lat, lon, radius, rating_filter))
+    else:
+        k = st.slider("How many", 1, 20, 5)
+        results = nearby_restaurants(df, *index.nearest(lat, lon, k, rating_filter))
+
+    st.info(f"Found {len(results)} restaurants ({index.size} of {len(df)} have a location).")
+    if results.empty:
+        st.warning("No restaurants match your criteria. Try a bigger radius or a lower rating!")
+        return
+    st.map(results[['latitude', 'longitude']])
+    for index_label, row in paginate(results, key="nearby").iterrows():
+        approximate = "" if row['geocode_confidence'] in PRECISE_CONFIDENCE else f" (approximate, {row['geocode_confidence']} centre)"
+        st.caption(f"📍 {row['Distance_km']:.1f} km away{approximate}")
+        display_restaurant_card(row)
+
+def show_review_search(df):
+    st.subheader("🔎 Search Inside Reviews")
+    search_query = st.text_input("What are people praising? (e.g. momos, rooftop view, friendly staff)")
+    if not search_query:
+        st.info("Type a dish, vibe or phrase to find the restaurants whose reviews mention it most.")
+        return
+    results = get_review_search_index().search(search_query, limit=10)
+    st.info(f"Found {len(results)} restaurants whose reviews match '{search_query}'.")
+    for rank, result in enumerate(results, 1):
+        snippets = "".join(f"<p>“{snippet.replace(chr(10), ' ')}”</p>" for snippet in result['Snippets'])
+        matches = df[df['Name'] == result['Name']]
+        if not matches.empty:
+            display_restaurant_card(matches.iloc[0], rank=rank)
+        else:
+            st.subheader(f"#{rank}: {result['Name']}")
+        st.markdown(f'<div class="summary-box"><p><b>{result["Matching_Reviews"]} matching reviews</b></p>{snippets}</div>', unsafe_allow_html=True)
+
 def show_head_to_head_comparer(df):
     st.subheader("🆚 Head-to-Head Comparison")
     restaurant_list = df['Name'].sort_values().tolist()
@@ -284,16 +489,33 @@ def show_about_page():
 # MAIN APP EXECUTION
 # ==================================================================================================
 st.markdown('<div class="header"><h1>Silchar Foodie</h1></div>', unsafe_allow_html=True)
-df = load_base_master_data()
+
+# The page shell is up: start loading spaCy in the background while the data loads and the page renders
+startup_timer = get_startup_timer()
+startup_timer.record("Imports", IMPORT_SECONDS)
+if get_summary_engine() == 'spacy':
+    get_nlp_model().warm_up()
+with startup_timer.phase("Data load"):
+    df = load_base_master_data()
 
 if df is None:
     st.error("Data files not found! Ensure 'download.csv' and 'downloadrev.csv' are present.")
 else:
     st.sidebar.title("Navigation")
-    app_page = st.sidebar.radio("Go to", ('🏠 Home', '🏆 The Foodie Awards', '🗺️ Restaurant Explorer', '🆚 Head-to-Head Compare', 'ℹ️ About'))
+    app_page = st.sidebar.radio("Go to", ('🏠 Home', '💎 Top Suggestions', '🏆 The Foodie Awards', '🗺️ Restaurant Explorer', '📍 Nearby', '🔎 Review Search', '🆚 Head-to-Head Compare', 'ℹ️ About'))
+    st.sidebar.radio("AI summary engine", list(SUMMARY_ENGINES), key='summary_engine')
     
     if app_page == '🏠 Home': show_home_dashboard(df)
+    elif app_page == '💎 Top Suggestions': show_top_suggestions(df)
     elif app_page == '🏆 The Foodie Awards': show_foodie_awards(df)
     elif app_page == '🗺️ Restaurant Explorer': show_restaurant_explorer(df)
+    elif app_page == '📍 Nearby': show_nearby(df)
+    elif app_page == '🔎 Review Search': show_review_search(df)
     elif app_page == '🆚 Head-to-Head Compare': show_head_to_head_comparer(df)
-    elif app_page == 'ℹ️ About': show_about_page()
\ No newline at end of file
+    elif app_page == 'ℹ️ About': show_about_page()
+
+    with st.sidebar.expander("⏱️ Startup timing"):
+        for phase, timing in startup_timer.report(get_nlp_model()):
+            st.caption(f"**{phase}:** {timing}")
+        cache_stats = get_analysis_cache().stats()
+        st.caption(f"**AI analysis cache:** {cache_stats['entries']} entries, {cache_stats['hit_rate']:.0%} hit rate")
\ No newline at end of file
@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import os
+from search_index import RestaurantSearchIndex
+from pagination import paginate
+from ranking import RankingIndex, top_suggestions
+from food_tour import WALKING_SPEED_KMH, RoutePlanner, tour_legs
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -25,9 +29,32 @@ def load_data():
     # This score balances high ratings with the number of reviews
     # The log ensures that a 5-star from 50 reviews is more of a "gem" than a 4.6 from 2000 reviews
     df['Gem_Score'] = df['Rating'] * np.log1p(df['Reviews'])
+
+    # Coordinates for the food tour planner (see geocode_data.py)
+    geo_path = 'silchar_restaurants_geocoded.csv'
+    if os.path.exists(geo_path):
+        df_geo = pd.read_csv(geo_path).drop_duplicates(['Name', 'Address'])
+        df = df.merge(df_geo[['Name', 'Address', 'latitude', 'longitude']], on=['Name', 'Address'], how='left')
+    else:
+        df['latitude'], df['longitude'] = np.nan, np.nan
     
     return df
 
+@st.cache_resource
+def get_search_index(df_search):
+    """Builds the Name/Address/locality search index once per data load."""
+    return RestaurantSearchIndex.from_frame(df_search)
+
+@st.cache_resource
+def get_route_planner(df_geo):
+    """Builds the food tour planner (with its route cache) once per data load."""
+    return RoutePlanner(df_geo)
+
+@st.cache_resource
+def get_ranking_index(df_rank):
+    """Builds the Gem Score ranking index once per data load."""
+    return RankingIndex(df_rank)
+
 df = load_data()
 
 # --- STYLING (Optional, but makes it look better) ---
@@ -70,16 +97,16 @@ else:
         stops_filter = st.sidebar.number_input('Number of Suggestions to Show', 1, 20, 5)
         
         # --- Filtering Logic ---
-        filtered_df = df[(df['Rating'] >= rating_filter) & (df['Reviews'] >= reviews_filter)]
-        # Sort by the Gem Score to find the top suggestions
-        top_suggestions = filtered_df.sort_values(by='Gem_Score', ascending=False).head(stops_filter)
+        # The ranking index keeps restaurants pre-sorted by Gem Score, so this is a scan, not a sort
+        ranking = get_ranking_index(df[['Rating', 'Reviews', 'Gem_Score']])
+        suggestions = top_suggestions(df, ranking, stops_filter, rating_filter, reviews_filter)
 
-        st.header(f"Our Top {len(top_suggestions)} Suggestions For You")
+        st.header(f"Our Top {len(suggestions)} Suggestions For You")
 
-        if top_suggestions.empty:
+        if suggestions.empty:
             st.warning("No restaurants match your criteria. Try loosening the filters!")
         else:
-            for i, row in enumerate(top_suggestions.iterrows()):
+            for i, row in enumerate(suggestions.iterrows()):
                 index, data = row
                 st.subheader(f"#{i+1}: {data['Name']}")
                 
@@ -92,6 +119,23 @@ else:
                     st.info(f"**Address:** {data['Address']}")
                 st.divider()
 
+            # --- FOOD TOUR: visit the suggestions in the shortest walking order ---
+            if st.checkbox("🗺️ Plan a food tour through these suggestions"):
+                round_trip = st.toggle("Finish where I started")
+                planner = get_route_planner(df[['latitude', 'longitude']])
+                route, total_km = planner.plan(df.index.get_indexer(suggestions.index), round_trip)
+                if len(route) < 2:
+                    st.warning("Not enough of these restaurants have a location to plan a tour.")
+                else:
+                    legs = tour_legs(df, route)
+                    skipped = len(suggestions) - len(route)
+                    st.success(f"**{len(route)} stops, {total_km:.1f} km** (about {total_km / WALKING_SPEED_KMH * 60:.0f} minutes on foot)"
+                               + (f" · {skipped} without a location skipped" if skipped else ""))
+                    st.dataframe(legs[['Name', 'Rating', 'Leg_km', 'Walk_min']].reset_index(drop=True), use_container_width=True,
+                                 column_config={'Leg_km': st.column_config.NumberColumn("Walk (km)", format="%.2f"),
+                                                'Walk_min': st.column_config.NumberColumn("Walk (min)", format="%.0f")})
+                    st.map(legs[['latitude', 'longitude']])
+
     elif app_mode == '-  All Restaurants (Directory)':
         # --- DIRECTORY MODE ---
         st.sidebar.header("Search the Directory 🧾")
@@ -99,15 +143,14 @@ else:
 
         # --- Filtering Logic ---
         if search_query:
-            mask = df['Name'].str.contains(search_query, case=False) | \
-                   df['Address'].str.contains(search_query, case=False, na=False)
-            search_results = df[mask]
+            hits = get_search_index(df[['Name', 'Address']]).search(search_query)
+            search_results = df.iloc[[pos for pos, _ in hits]]
         else:
             search_results = df.sort_values(by='Name') # Show all, sorted alphabetically
 
         st.header(f"Found {len(search_results)} Restaurants")
         
-        for index, row in search_results.iterrows():
+        for index, row in paginate(search_results, key="directory").iterrows():
             with st.container():
                 st.subheader(row['Name'])
                 if pd.notna(row['Address']):
@@ -0,0 +1,27 @@
+import pandas as pd
+
+AWARD_COLUMNS = ['Name', 'Rating', 'Reviews', 'Gem_Score']
+
+
+def vibe_long_table(df, vibes_col='Vibes'):
+    """One row per (restaurant, vibe) pair, with the columns awards are decided on."""
+    long = df[AWARD_COLUMNS].assign(Vibe=df[vibes_col].map(list)).explode('Vibe')
+    return long.dropna(subset=['Vibe'])
+
+def compute_vibe_awards(df, vibe_names, vibes_col='Vibes', min_reviews=0, runners_up=1):
+    """
+    Winners for every vibe category in a single pass: the highest-rated restaurant tagged with the vibe,
+    ties broken by Gem Score. Restaurants with fewer than `min_reviews` reviews can't place.
+    Returns one row per placed restaurant (Vibe, Place, Contenders + AWARD_COLUMNS), in `vibe_names` order.
+    Categories nobody qualified for have no rows.
+    """
+    long = vibe_long_table(df, vibes_col)
+    long = long[(long['Reviews'] >= min_reviews) & long['Vibe'].isin(vibe_names)]
+
+    ranked = long.sort_values(['Rating', 'Gem_Score'], ascending=False, kind='stable')
+    placed = ranked.groupby('Vibe', sort=False).head(runners_up + 1).copy()
+    placed['Place'] = placed.groupby('Vibe').cumcount() + 1
+    placed['Contenders'] = placed['Vibe'].map(long['Vibe'].value_counts())
+
+    placed['Vibe'] = pd.Categorical(placed['Vibe'], categories=list(vibe_names))
+    return placed.sort_values(['Vibe', 'Place']).reset_index(drop=True)
@@ -0,0 +1,82 @@
+import argparse
+import os
+import time
+import pandas as pd
+from ai_engine import (
+    ARTIFACT_PATHS, DEFAULT_NLP_PROFILE, NLP_PROFILES, clean_review_text,
+    detect_vibes, load_nlp, summarize_doc, write_analysis_artifact
+)
+from review_parser import join_review_bodies, load_review_store, review_text_hash
+
+def load_texts_from_csv(input_path):
+    """(name, text_hash, clean_text) for every restaurant with reviews in a raw Name/Reviews_Text CSV."""
+    df_reviews = pd.read_csv(input_path)
+    df_reviews = df_reviews.dropna(subset=['Name'])
+    df_reviews['Reviews_Text'] = df_reviews['Reviews_Text'].fillna("")
+    df_reviews = df_reviews[df_reviews['Reviews_Text'].str.strip() != ""]
+    return [(name, review_text_hash(text), clean_review_text(text)) for name, text in zip(df_reviews['Name'], df_reviews['Reviews_Text'])]
+
+def load_texts_from_store(store_path):
+    """Same as load_texts_from_csv, but reads the already-parsed per-review store."""
+    reviews = load_review_store(store_path, columns=['Restaurant', 'Text_Hash', 'Review_Index', 'Body'])
+    reviews = reviews.sort_values(['Restaurant', 'Text_Hash', 'Review_Index'])
+    grouped = reviews.groupby(['Restaurant', 'Text_Hash'], sort=False)['Body']
+    return [(name, text_hash, join_review_bodies(bodies)) for (name, text_hash), bodies in grouped]
+
+def run_batch_analysis(items, model_name="en_core_web_sm", workers=None, batch_size=8, profile=DEFAULT_NLP_PROFILE):
+    """
+    Runs the vibe + summary analysis for every (name, text_hash, clean_text) item in one go.
+    spaCy parsing is fanned out across `workers` processes with nlp.pipe.
+    """
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    print(f"Loading spaCy model '{model_name}' ({profile} profile)...")
+    nlp = load_nlp(model_name, profile)
+
+    print(f"Analyzing {len(items)} restaurants with {workers} worker process(es)...")
+    records = []
+    docs = nlp.pipe((text for _, _, text in items), n_process=workers, batch_size=batch_size)
+    for (name, text_hash, text), doc in zip(items, docs):
+        records.append({
+            "Name": name,
+            "Text_Hash": text_hash,
+            "Vibes": detect_vibes(text),
+            "Summary": summarize_doc(doc),
+        })
+        print(f"✔️ Analyzed: {name}")
+    return records
+
+def run_tfidf_batch_analysis(items, summarizer=None):
+    """
+    Same records as run_batch_analysis, but summarized by TF-IDF in one sparse pass (no spaCy model).
+    The IDF is fitted on the items themselves unless a `summarizer` fitted on a larger corpus is given.
+    """
+    from tfidf_summarizer import TfidfSummarizer
+
+    texts = [text for _, _, text in items]
+    print(f"Summarizing {len(items)} restaurants with TF-IDF...")
+    summaries = (summarizer or TfidfSummarizer(texts)).summarize_many(texts)
+    return [{"Name": name, "Text_Hash": text_hash, "Vibes": detect_vibes(text), "Summary": summary}
+            for (name, text_hash, text), summary in zip(items, summaries)]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Precompute AI vibes and summaries for every restaurant.")
+    parser.add_argument('--input', default='downloadrev.csv', help="CSV with Name and Reviews_Text columns.")
+    parser.add_argument('--reviews-store', default=None, help="Read clean reviews from a review_parser.py Parquet store instead of --input.")
+    parser.add_argument('--output', default=None, help="Where to write the analysis artifact (default: the engine's path in ai_engine.ARTIFACT_PATHS).")
+    parser.add_argument('--engine', default='spacy', choices=['spacy', 'tfidf'], help="Summary engine: spaCy POS density or TF-IDF (no model needed).")
+    parser.add_argument('--model', default='en_core_web_sm', help="spaCy model to load.")
+    parser.add_argument('--profile', default=DEFAULT_NLP_PROFILE, choices=list(NLP_PROFILES), help="spaCy components to run (see ai_engine.NLP_PROFILES).")
+    parser.add_argument('--workers', type=int, default=None, help="Number of spaCy worker processes (default: CPUs - 1).")
+    parser.add_argument('--batch-size', type=int, default=8, help="Documents per nlp.pipe batch.")
+    args = parser.parse_args()
+
+    output = args.output or ARTIFACT_PATHS[args.engine]
+    start = time.perf_counter()
+    items = load_texts_from_store(args.reviews_store) if args.reviews_store else load_texts_from_csv(args.input)
+    if args.engine == 'tfidf':
+        records = run_tfidf_batch_analysis(items)
+        write_analysis_artifact(records, output, model_name="tfidf", engine='tfidf')
+    else:
+        records = run_batch_analysis(items, args.model, args.workers, args.batch_size, args.profile)
+        write_analysis_artifact(records, output, model_name=f"{args.model} ({args.profile})")
+    print(f"\nBatch analysis complete! {len(records)} restaurants saved to '{output}' in {time.perf_counter() - start:.1f}s")
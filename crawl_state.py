@@ -0,0 +1,112 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+
+DEFAULT_STATE_PATH = 'crawl_state.sqlite3'
+
+
+def record_key(name, address=""):
+    """Identity of a scraped restaurant: case- and whitespace-insensitive name + address."""
+    def normalize(value):
+        return " ".join(str(value).split()).casefold() if isinstance(value, str) else ""
+    return f"{normalize(name)}|{normalize(address)}"
+
+
+class CrawlState:
+    """
+    Checkpoints for one named crawl in SQLite: which pages are finished, and every scraped record as an
+    idempotent upsert keyed by name + address. A crashed or interrupted crawl resumes where it stopped, and
+    re-scraping a restaurant updates its row instead of duplicating it.
+    """
+
+    def __init__(self, crawl, path=DEFAULT_STATE_PATH):
+        self.crawl = crawl
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS pages (crawl TEXT, page_key TEXT, records INTEGER, completed_at REAL, PRIMARY KEY (crawl, page_key))")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS records (crawl TEXT, record_key TEXT, data TEXT, updated_at REAL, PRIMARY KEY (crawl, record_key))")
+
+    # --- PAGES ---
+    def is_page_done(self, page_key):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM pages WHERE crawl = ? AND page_key = ?", (self.crawl, str(page_key))).fetchone()
+        return row is not None
+
+    def completed_pages(self):
+        with self._lock:
+            return {key for (key,) in self._conn.execute("SELECT page_key FROM pages WHERE crawl = ?", (self.crawl,))}
+
+    def first_unfinished_page(self):
+        """Lowest page number (from 1) not finished yet, so a page that failed is retried even if later pages succeeded."""
+        done = {int(key) for key in self.completed_pages() if key.isdigit()}
+        page = 1
+        while page in done:
+            page += 1
+        return page
+
+    def complete_page(self, page_key, records=(), address_field='Address'):
+        """Upserts a page's records and marks the page done in one transaction, so a crash never half-records a page."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._upsert_rows(records, address_field)
+            self._conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)", (self.crawl, str(page_key), len(records), time.time()))
+
+    # --- RECORDS ---
+    def _upsert_rows(self, records, address_field):
+        now = time.time()
+        rows = [(self.crawl, record_key(r.get('Name'), r.get(address_field, "")), json.dumps(r, ensure_ascii=False, default=str), now)
+                for r in records]
+        # ON CONFLICT ... DO UPDATE keeps the original rowid, so records stay in first-seen order
+        self._conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?) ON CONFLICT (crawl, record_key) "
+                               "DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at", rows)
+
+    def upsert(self, record, address_field='Address'):
+        self.upsert_many([record], address_field)
+
+    def upsert_many(self, records, address_field='Address'):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._upsert_rows(records, address_field)
+
+    def has_record(self, name, address=""):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM records WHERE crawl = ? AND record_key = ?", (self.crawl, record_key(name, address))).fetchone()
+        return row is not None
+
+    def records(self):
+        """Every record of this crawl, in the order it was first scraped."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM records WHERE crawl = ? ORDER BY rowid", (self.crawl,)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def to_dataframe(self, columns=None):
+        df = pd.DataFrame(self.records())
+        return df.reindex(columns=columns) if columns else df
+
+    def export_csv(self, csv_path, columns=None):
+        """Rewrites `csv_path` from the state (atomically), so the CSV never holds duplicates."""
+        tmp_path = f"{csv_path}.tmp"
+        self.to_dataframe(columns).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, csv_path)
+
+    def append_csv(self, csv_path, record, columns):
+        """Appends one record to `csv_path` (writing the header if the file is new) instead of rewriting the whole file."""
+        pd.DataFrame([record]).reindex(columns=columns).to_csv(csv_path, mode='a', header=not os.path.exists(csv_path), index=False)
+
+    def import_csv(self, csv_path, address_field='Address'):
+        """Upserts the rows of an existing output CSV, e.g. one written before crawl state existed."""
+        if not os.path.exists(csv_path):
+            return 0
+        df = pd.read_csv(csv_path).dropna(subset=['Name'])
+        self.upsert_many(df.where(df.notna(), None).to_dict('records'), address_field)
+        return len(df)
+
+    def reset(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE crawl = ?", (self.crawl,))
+            self._conn.execute("DELETE FROM records WHERE crawl = ?", (self.crawl,))
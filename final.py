@@ -1,9 +1,16 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-import os
-import re
-import spacy
+from ai_engine import ARTIFACT_PATHS, EXTENDED_VIBE_DICTIONARY, analyze_clean_text, load_analysis_artifact
+from vibe_matcher import VibeMatcher
+from search_index import RestaurantSearchIndex
+from pagination import paginate
+from ranking import RankingIndex, top_suggestions
+from master_cache import load_master_frame
+from record_linkage import link_columns
+from review_parser import load_review_bodies, review_text_hash
+from startup import LazySpacyModel
+from analysis_cache import AnalysisCache, analysis_cache_key
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -14,81 +21,53 @@ st.set_page_config(
 
 # --- NLP ENGINE & DATA LOADING (The most robust version) ---
 @st.cache_resource
-def load_spacy_model():
-    """Loads the spaCy model once and caches it."""
-    try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        st.error("SpaCy language model not found. To enable AI features, please run this in your terminal: python -m spacy download en_core_web_sm")
-        return None
-nlp = load_spacy_model()
-
-VIBE_DICTIONARY = {
-    "✨ Great Ambience": ["ambience", "atmosphere", "decor", "interior", "view", "vibe"],
-    "👍 Excellent Service": ["service", "staff", "owner", "friendly", "welcoming", "hospitable", "polite", "behavior"],
-    "👥 Good for Groups": ["friends", "family", "group", "gathering", "party", "celebration"],
-    "💑 Romantic Spot": ["date", "romantic", "couple", "cozy", "intimate"],
-    "💸 Budget-Friendly": ["cheap", "affordable", "value", "price", "reasonable", "economic"],
-    "🍗 Meat Lover's Choice": ["chicken", "mutton", "fish", "kebab", "non-veg", "tandoori"],
-    "🍚 Biryani Hub": ["biryani", "briyani", "hyderabadi"],
-    "☕ Cafe & Quick Bites": ["cafe", "coffee", "snacks", "bakery", "mocktail"],
-    "🌿 Veggie Paradise": ["vegetarian", "veg", "vegan", "paneer", "thali", "plant-based", "pure veg", "shakahaar", "veg thali"],
-    "🍹 Drinks & Mocktails": ["mocktail", "cocktail", "beverage", "drink", "refreshing"],
-    "🍰 Desserts & Sweets": ["dessert", "sweet", "ice cream", "pastry", "cake", "pudding", "gulab jamun", "rasgulla"],
-    "🌶️ Spicy & Flavorful": ["spicy", "flavorful", "tasty", "delicious", "mouthwatering", "zesty"],
-    "🍽️ Diverse Cuisine": ["cuisine", "variety", "menu", "options", "international", "fusion"],
-    "🌟 Hidden Gem": ["hidden gem", "secret", "underrated", "local favorite", "off the beaten path"],
-    "🍕 Pizza & Fast Food": ["pizza", "burger", "fast food", "snacks", "quick bites", "fries"],
-    "🍜 Noodles & Chinese": ["noodles", "chinese", "manchurian", "spring roll", "dimsum", "chowmein"],
-    "🍛 Indian Classics": ["indian", "curry", "dal", "roti", "naan", "chapati", "paratha"],
-    "🍣 Sushi & Japanese": ["sushi", "japanese", "ramen", "tempura", "sashimi"],
-
-    "🎉 Party & Celebration": ["party", "celebration", "event", "birthday", "anniversary", "get-together"],
-    "🌍 International Flavors": ["international", "global", "world cuisine", "fusion", "exotic"],
-    "🍳 Breakfast & Brunch": ["breakfast", "brunch", "eggs", "pancakes", "waffles", "toast"],
-    "🍔 Street Food Vibes": ["street food", "chaat", "pani puri", "bhel puri", "vada pav", "pav bhaji"],
-    "🍖 Barbecue & Grill": ["barbecue", "grill", "tandoor", "smoked", "charcoal", "roasted"]
-    
-}
+def get_nlp_model():
+    """The spaCy model, loaded on first use instead of at app start (see startup.LazySpacyModel). Never downloaded here."""
+    return LazySpacyModel("en_core_web_sm", download_missing=False)
 
-@st.cache_data
-def analyze_restaurant(text):
-    """Analyzes a single block of review text."""
-    if not isinstance(text, str) or nlp is None or not text.strip(): 
-        return [], "No review text to analyze."
-    
-    # Vibe Analysis with Confidence Threshold
-    vibes_found = []
-    text_lower = text.lower()
-    for vibe, keywords in VIBE_DICTIONARY.items():
-        mention_count = sum(text_lower.count(keyword) for keyword in keywords)
-        if mention_count >= 3:
-            vibes_found.append(vibe)
-            
-    # AI Extractive Summarization
-    doc = nlp(text)
-    sentence_scores = {}
-    for sentence in doc.sents:
-        if len(sentence.text.strip()) < 30 or "thank you" in sentence.text.lower():
-            continue
-        score = sum(1 for token in sentence if token.pos_ in ['NOUN', 'ADJ', 'VERB'] and not token.is_stop)
-        if len(sentence) > 1:
-            sentence_scores[sentence.text.strip()] = score / len(sentence)
-    
-    top_sentences = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:2]
-    summary = " ".join(top_sentences)
-    
-    return vibes_found, summary if summary else "Could not generate a highlight summary."
+@st.cache_resource
+def get_analysis_cache():
+    """The disk-backed analysis cache shared with app.py."""
+    return AnalysisCache()
 
 @st.cache_data
-def load_and_process_data():
-    """Loads, merges, and processes all data sources."""
-    try:
-        df_main = pd.read_csv('download.csv')
-        df_reviews = pd.read_csv('downloadrev.csv')
-    except FileNotFoundError: return None
+def load_precomputed_analysis():
+    """Summaries precomputed by batch_analyzer.py, if its spaCy artifact exists."""
+    return load_analysis_artifact(ARTIFACT_PATHS['spacy'], 'spacy')
+
+VIBE_DICTIONARY = EXTENDED_VIBE_DICTIONARY
+vibe_matcher = VibeMatcher(VIBE_DICTIONARY)
+
+def get_ai_summary(data_row, run=False):
+    """
+    The restaurant's summary from the precomputed artifact or the analysis cache, without loading spaCy.
+    With `run`, a missing summary is computed live (and cached); None if it isn't available.
+    """
+    precomputed = load_precomputed_analysis().get((data_row['Name'], data_row['Review_Hash']))
+    if precomputed is not None:
+        return precomputed[1]
+    cache = get_analysis_cache()
+    key = analysis_cache_key(data_row['Review_Hash'], 'spacy', get_nlp_model().profile)
+    cached = cache.get(key, count=run)
+    if cached is not None or not run:
+        return None if cached is None else cached[1]
+    nlp = get_nlp_model().get()
+    if nlp is None:
+        return None
+    vibes, summary = analyze_clean_text(data_row['Review_Body'], nlp)
+    cache.put(key, vibes, summary)
+    return summary
+
+MASTER_CACHE_PATH = 'master_cache_final.arrow'
+MASTER_CACHE_VERSION = 4  # Bump whenever build_master_data() changes its output
+
+def build_master_data():
+    """Loads and merges the source CSVs (the slow path behind the columnar cache)."""
+    df_main = pd.read_csv('download.csv')
+    df_reviews = pd.read_csv('downloadrev.csv')
     
-    df_master = pd.merge(df_main, df_reviews[['Name', 'Reviews_Text']], on='Name', how='left')
+    # Fuzzy record linkage, so a review dump that spells a name differently still finds its restaurant
+    df_master = link_columns(df_main, df_reviews, ['Reviews_Text'])
     
     # Fix for FutureWarning and ensures column exists
     df_master['Reviews_Text'] = df_master['Reviews_Text'].fillna("")
@@ -96,15 +75,35 @@ def load_and_process_data():
     df_master.dropna(subset=['Rating', 'Reviews'], inplace=True)
     df_master['Reviews'] = df_master['Reviews'].astype(int)
     df_master['Gem_Score'] = df_master['Rating'] * np.log1p(df_master['Reviews'])
-    
-    # --- BUG FIX: Create all new columns on the main dataframe ---
-    analysis_results = df_master['Reviews_Text'].apply(lambda text: analyze_restaurant(text))
-    df_master['Vibes'] = [res[0] for res in analysis_results]
-    df_master['AI_Summary'] = [res[1] for res in analysis_results]
+
+    # Only the cheap keyword vibes are computed up front (they drive the vibe filter); summaries are served lazily
+    bodies = load_review_bodies('downloadrev.csv')
     df_master['Has_AI_Analysis'] = df_master['Reviews_Text'].str.strip() != ""
-    
+    df_master['Review_Hash'] = df_master['Reviews_Text'].map(review_text_hash)
+    df_master['Review_Body'] = df_master['Review_Hash'].map(lambda text_hash: bodies.get(text_hash, ""))
+    df_master = df_master.drop(columns=['Reviews_Text'])
+    df_master['Vibes'] = [tuple(vibes) for vibes in vibe_matcher.vibes_many(df_master['Review_Body'].tolist(), min_mentions=3)]
     return df_master
 
+@st.cache_data
+def load_and_process_data():
+    """Loads, merges, and processes all data sources."""
+    try:
+        df_master = load_master_frame(build_master_data, ['download.csv', 'downloadrev.csv'], MASTER_CACHE_PATH, MASTER_CACHE_VERSION)
+    except FileNotFoundError: return None
+    df_master['Vibes'] = df_master['Vibes'].map(tuple)
+    return df_master
+
+@st.cache_resource
+def get_search_index(df_search):
+    """Builds the Name/Address/locality search index once per data load."""
+    return RestaurantSearchIndex.from_frame(df_search)
+
+@st.cache_resource
+def get_ranking_index(df_rank):
+    """Builds the Gem Score / vibe ranking index once per data load."""
+    return RankingIndex(df_rank, vibes_col='Vibes', vibe_names=list(VIBE_DICTIONARY))
+
 # Reusable display function
 def display_restaurant_details(data_row):
     tab1, tab2 = st.tabs(["✨ Overview", "🤖 AI Analysis"])
@@ -116,9 +115,17 @@ def display_restaurant_details(data_row):
         if pd.notna(data_row['Address']): st.info(f"**Address:** {data_row['Address']}")
     with tab2:
         if data_row['Has_AI_Analysis']:
-            st.markdown("**🤖 AI-Generated Summary:**")
-            st.success(f"🗣️ *{data_row['AI_Summary']}*")
-            st.markdown("---")
+            # Tabs render eagerly, so spaCy only runs once the user asks for this restaurant's summary
+            summary = get_ai_summary(data_row)
+            if summary is None and st.toggle("🤖 Run AI Summary", key=f"ai_toggle_{data_row.name}"):
+                with st.spinner("Reading the reviews..."):
+                    summary = get_ai_summary(data_row, run=True)
+                if summary is None:
+                    st.error("SpaCy language model not found. To enable AI features, please run this in your terminal: python -m spacy download en_core_web_sm")
+            if summary is not None:
+                st.markdown("**🤖 AI-Generated Summary:**")
+                st.success(f"🗣️ *{summary}*")
+                st.markdown("---")
             if data_row['Vibes']:
                 st.markdown("**Detected Vibes (Based on multiple mentions):**")
                 keywords_html = "".join([f"<span style='background-color: #333; color: #eee; border-radius: 5px; padding: 5px 8px; margin: 3px; display: inline-block;'>{vibe}</span>" for vibe in data_row['Vibes']])
@@ -128,6 +135,8 @@ def display_restaurant_details(data_row):
 
 # --- MAIN APP LAYOUT ---
 st.title('🔥 Silchar Foodie: The Definitive Edition')
+# Start loading spaCy in the background; nothing waits for it until a summary is requested
+get_nlp_model().warm_up()
 df = load_and_process_data()
 
 if df is None:
@@ -142,13 +151,10 @@ else:
         rating_filter = st.sidebar.slider('Minimum Rating', 1.0, 5.0, 3.5, 0.1)
         reviews_filter = st.sidebar.slider('Minimum Number of Reviews', 0, 1000, 10, 5)
         stops_filter = st.sidebar.number_input('Number of Suggestions to Show', 1, 20, 5)
+        vibe_filter = st.sidebar.multiselect("Must have all of these vibes", list(VIBE_DICTIONARY))
         
-        filtered_df = df[(df['Rating'] >= rating_filter) & (df['Reviews'] >= reviews_filter)]
-        
-        if prioritize_ai:
-            final_suggestions = filtered_df.sort_values(by=['Has_AI_Analysis', 'Gem_Score'], ascending=[False, False]).head(stops_filter)
-        else:
-            final_suggestions = filtered_df.sort_values(by='Gem_Score', ascending=False).head(stops_filter)
+        ranking = get_ranking_index(df[['Rating', 'Reviews', 'Gem_Score', 'Has_AI_Analysis']].assign(Vibes=df['Vibes'].map(tuple)))
+        final_suggestions = top_suggestions(df, ranking, stops_filter, rating_filter, reviews_filter, vibe_filter, prioritize_ai)
 
         st.header(f"Our Top {len(final_suggestions)} AI-Analyzed Suggestions")
         st.divider()
@@ -165,14 +171,14 @@ else:
         st.sidebar.header("Search the Directory 🧾")
         search_query = st.sidebar.text_input("Search by Name or Address Keyword")
         if search_query:
-            mask = df['Name'].str.contains(search_query, case=False) | df['Address'].str.contains(search_query, case=False, na=False)
-            results = df[mask]
+            hits = get_search_index(df[['Name', 'Address']]).search(search_query)
+            results = df.iloc[[pos for pos, _ in hits]]
         else:
             results = df.sort_values('Name')
             
         st.header(f"Found {len(results)} Restaurants")
         st.divider()
-        for index, row in results.iterrows():
+        for index, row in paginate(results, key="directory").iterrows():
             title = row['Name']
             if row['Has_AI_Analysis']: title += " 🔥"
             with st.expander(f"{title} (⭐ {row['Rating']})"):
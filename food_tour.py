@@ -0,0 +1,138 @@
+import argparse
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from spatial import haversine_km
+
+WALKING_SPEED_KMH = 4.5
+# Geocode confidences that place a restaurant itself; the others are locality, PIN code or city centroids
+PRECISE_CONFIDENCE = ('exact', 'online')
+ROUTE_CACHE_SIZE = 128
+
+
+def distance_matrix_km(lat, lon):
+    """All pairwise great-circle distances between the points, in one broadcast haversine."""
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+def nearest_neighbour_tour(dist, start=0):
+    """Greedy tour: always walk to the closest stop not visited yet."""
+    visited = np.zeros(len(dist), dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for _ in range(len(dist) - 1):
+        nearest = int(np.argmin(np.where(visited, np.inf, dist[tour[-1]])))
+        tour.append(nearest)
+        visited[nearest] = True
+    return np.array(tour)
+
+def two_opt(dist, tour):
+    """
+    Improves a closed tour by reversing segments while that shortens it. For each edge (a, b) the gain of
+    swapping it with every later edge (c, d) is computed in one vectorized step.
+    """
+    tour = tour.copy()
+    n = len(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            c = tour[i + 2:]
+            d = tour[(np.arange(i + 2, n) + 1) % n]
+            gain = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            j = int(np.argmin(gain))
+            if gain[j] < -1e-9:
+                j += i + 2
+                tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1].copy()
+                improved = True
+    return tour
+
+def solve_route(dist, round_trip=False):
+    """
+    (visiting order, total km) through every point of a distance matrix: nearest neighbour, then 2-opt.
+    Without round_trip the route is an open path with free ends, solved as a tour through an extra
+    zero-distance stop that is then cut out.
+    """
+    n = len(dist)
+    if n <= 2:
+        legs = dist[0, 1] * (2 if round_trip else 1) if n == 2 else 0.0
+        return np.arange(n), float(legs)
+    if not round_trip:
+        dist = np.pad(dist, ((0, 1), (0, 1)))
+    tour = two_opt(dist, nearest_neighbour_tour(dist))
+    if not round_trip:
+        cut = int(np.flatnonzero(tour == n)[0])
+        tour = np.concatenate([tour[cut + 1:], tour[:cut]])
+    legs = dist[tour[:-1], tour[1:]].sum() + (dist[tour[-1], tour[0]] if round_trip else 0.0)
+    return tour, float(legs)
+
+
+class RoutePlanner:
+    """
+    Food-tour planner over a restaurant DataFrame, built once per data load. Distance matrices and routes
+    are memoized per set of stops, so moving a slider back to an earlier selection costs nothing.
+    """
+
+    def __init__(self, df, lat_col='latitude', lon_col='longitude'):
+        self.lat = df[lat_col].to_numpy(dtype=float)
+        self.lon = df[lon_col].to_numpy(dtype=float)
+        self._cached_matrix = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._matrix)
+        self._cached_route = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._route)
+
+    def _matrix(self, positions):
+        index = list(positions)
+        return distance_matrix_km(self.lat[index], self.lon[index])
+
+    def _route(self, positions, round_trip):
+        order, total_km = solve_route(self._cached_matrix(positions), round_trip)
+        return tuple(positions[i] for i in order), total_km
+
+    def plan(self, positions, round_trip=False):
+        """
+        (row positions in visiting order, total km) for the given rows. Rows without coordinates are skipped;
+        the stop set is sorted before caching, so the same stops in any order share one entry.
+        """
+        located = tuple(sorted(int(p) for p in positions if not (np.isnan(self.lat[p]) or np.isnan(self.lon[p]))))
+        if not located:
+            return (), 0.0
+        return self._cached_route(located, bool(round_trip))
+
+    def cache_info(self):
+        return self._cached_route.cache_info()
+
+
+def tour_legs(df, route, lat_col='latitude', lon_col='longitude', confidence_col='geocode_confidence'):
+    """
+    The rows of `df` in route order, with the km and walking minutes of the leg leading to each stop.
+    Approximate is True for stops placed only at a centroid (see PRECISE_CONFIDENCE): legs touching them are estimates.
+    """
+    stops = df.iloc[list(route)]
+    lat, lon = stops[lat_col].to_numpy(dtype=float), stops[lon_col].to_numpy(dtype=float)
+    legs = np.concatenate([[0.0], haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:])])
+    approximate = ~stops[confidence_col].isin(PRECISE_CONFIDENCE) if confidence_col in stops else np.zeros(len(stops), dtype=bool)
+    return stops.assign(Leg_km=legs, Walk_min=legs / WALKING_SPEED_KMH * 60, Approximate=approximate)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plan a food tour through the top Gem Score restaurants and time the solver.")
+    parser.add_argument('--input', default='silchar_restaurants_geocoded.csv')
+    parser.add_argument('--stops', type=int, default=25)
+    parser.add_argument('--round-trip', action='store_true')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input).dropna(subset=['latitude', 'longitude', 'Rating', 'Reviews'])
+    df = df.assign(Gem_Score=df['Rating'] * np.log1p(df['Reviews'])).sort_values('Gem_Score', ascending=False).reset_index(drop=True)
+    stops = df.head(args.stops)
+    dist = distance_matrix_km(stops['latitude'], stops['longitude'])
+
+    start = time.perf_counter()
+    naive_km = dist[np.arange(len(stops) - 1), np.arange(1, len(stops))].sum()
+    greedy = nearest_neighbour_tour(dist)
+    greedy_km = dist[greedy[:-1], greedy[1:]].sum()
+    route, total_km = RoutePlanner(stops).plan(range(len(stops)), args.round_trip)
+    elapsed = time.perf_counter() - start
+
+    for leg, row in enumerate(tour_legs(stops, route).itertuples(), 1):
+        print(f"{leg:>2}. {row.Name} (+{row.Leg_km:.2f} km){' [approximate location]' if row.Approximate else ''}")
+    print(f"\n{len(route)} stops: {total_km:.2f} km (Gem Score order {naive_km:.2f} km, nearest neighbour {greedy_km:.2f} km), solved in {elapsed * 1000:.0f} ms")
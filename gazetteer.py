@@ -0,0 +1,197 @@
+import argparse
+import re
+import time
+from collections import defaultdict
+import pandas as pd
+from search_index import address_localities, tokenize
+
+DEFAULT_GAZETTEER_PATH = 'silchar_gazetteer.csv'
+# Reference point for recovering short plus codes ('RRJ2+752') printed in Google Maps addresses
+SILCHAR_CENTER = (24.83, 92.79)
+OLC_ALPHABET = "23456789CFGHJMPQRVWX"
+PLUS_CODE_PATTERN = re.compile(r"(?<![0-9A-Z])([23456789CFGHJMPQRVWX]{4,8}\+[23456789CFGHJMPQRVWX]{2,3})(?![0-9A-Z])")
+PINCODE_PATTERN = re.compile(r"\b(78\d{4})\b")
+# From most to least precise: a decoded plus code, a locality centroid, a PIN code centroid, the city centroid
+CONFIDENCE_LEVELS = ['exact', 'locality', 'pincode', 'city']
+MIN_SIMILARITY = 0.6
+# A locality centroid needs at least this many plus-coded addresses behind it; a single point is just one restaurant
+MIN_LOCALITY_SUPPORT = 2
+# Address parts naming a road or a landmark ('Premtala Rd', 'opp. Surana Motor') rather than a neighbourhood
+FRAGMENT_PATTERN = re.compile(
+    r"\b(?:rd|road|ln|lane|ave|avenue|st|street|marg|path|bypass|chowk|point|near|opp|opposite|beside|behind|"
+    r"bank|motor|motors|complex|building|bldg|tower|mall|market|hospital|school|college|floor)\b", re.IGNORECASE)
+
+
+# --- PLUS CODES (Open Location Code) ---
+def _decode_full_code(code):
+    digits = code.replace('+', '')
+    lat, lon, lat_res, lon_res = -90.0, -180.0, 400.0, 400.0
+    for i in range(0, min(len(digits), 10), 2):
+        lat_res, lon_res = lat_res / 20, lon_res / 20
+        lat += OLC_ALPHABET.index(digits[i]) * lat_res
+        lon += OLC_ALPHABET.index(digits[i + 1]) * lon_res
+    for digit in digits[10:]:
+        lat_res, lon_res = lat_res / 5, lon_res / 4
+        row, col = divmod(OLC_ALPHABET.index(digit), 4)
+        lat += row * lat_res
+        lon += col * lon_res
+    return lat + lat_res / 2, lon + lon_res / 2
+
+def _encode_prefix(point, length):
+    lat, lon, res = point[0] + 90, point[1] + 180, 20.0
+    prefix = ""
+    for _ in range(length // 2):
+        lat_digit, lon_digit = int(lat // res), int(lon // res)
+        prefix += OLC_ALPHABET[lat_digit] + OLC_ALPHABET[lon_digit]
+        lat, lon, res = lat - lat_digit * res, lon - lon_digit * res, res / 20
+    return prefix
+
+def decode_plus_code(code, reference=SILCHAR_CENTER):
+    """(lat, lon) centre of a plus code. Short codes are completed with the digits of the nearest match to `reference`."""
+    missing = 8 - code.index('+')
+    if missing == 0:
+        return _decode_full_code(code)
+    resolution = 20 ** (2 - missing / 2)
+    lat, lon = _decode_full_code(_encode_prefix(reference, missing) + code)
+    # The reference may sit near a cell edge: take the neighbouring cell if that lands closer
+    if lat - reference[0] > resolution / 2:
+        lat -= resolution
+    elif reference[0] - lat > resolution / 2:
+        lat += resolution
+    if lon - reference[1] > resolution / 2:
+        lon -= resolution
+    elif reference[1] - lon > resolution / 2:
+        lon += resolution
+    return lat, lon
+
+
+# --- GAZETTEER ---
+def locality_key(name):
+    return " ".join(tokenize(name))
+
+def locality_ngrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_gazetteer(df, address_col='Address'):
+    """
+    Centroids of every locality, PIN code and the city, averaged over the addresses that carry a plus code
+    (exact points). Road and landmark fragments and localities seen fewer than MIN_LOCALITY_SUPPORT times
+    are left out. Returns a name, kind, latitude, longitude, support DataFrame.
+    """
+    addresses = df[address_col].dropna()
+    codes = addresses.str.extract(PLUS_CODE_PATTERN)[0].dropna()
+    points = pd.DataFrame([decode_plus_code(code) for code in codes], columns=['latitude', 'longitude'], index=codes.index)
+    points['pincode'] = addresses[codes.index].str.extract(PINCODE_PATTERN)[0]
+    points['locality'] = [address_localities(address) for address in addresses[codes.index]]
+
+    localities = points.explode('locality').dropna(subset=['locality'])
+    localities = localities[~localities['locality'].str.contains(r"\+|\d", regex=True)
+                            & ~localities['locality'].str.contains(FRAGMENT_PATTERN)]
+    localities = localities[localities.groupby('locality')['locality'].transform('size') >= MIN_LOCALITY_SUPPORT]
+    frames = [
+        localities.assign(name=localities['locality'], kind='locality'),
+        points.dropna(subset=['pincode']).assign(name=lambda p: p['pincode'], kind='pincode'),
+        points.assign(name='Silchar', kind='city'),
+    ]
+    gazetteer = (pd.concat(frames).groupby(['kind', 'name'], sort=False)
+                 .agg(latitude=('latitude', 'mean'), longitude=('longitude', 'mean'), support=('latitude', 'size'))
+                 .reset_index())
+    return gazetteer[['name', 'kind', 'latitude', 'longitude', 'support']].round({'latitude': 5, 'longitude': 5})
+
+
+class LocalityGazetteer:
+    """
+    Offline geocoder over a gazetteer of locality, PIN code and city centroids. Locality names are matched
+    exactly or fuzzily through a character-trigram index, so no lookup scans the whole gazetteer.
+    """
+
+    def __init__(self, places):
+        localities = places[places['kind'] == 'locality']
+        self.locality_names = localities['name'].tolist()
+        self.locality_points = list(zip(localities['latitude'], localities['longitude']))
+        self._keys = [locality_key(name) for name in self.locality_names]
+        self._key_ids = {key: i for i, key in enumerate(self._keys)}
+        self._key_ngrams = [locality_ngrams(key) for key in self._keys]
+        self._ngram_index = defaultdict(list)
+        for i, grams in enumerate(self._key_ngrams):
+            for gram in grams:
+                self._ngram_index[gram].append(i)
+        pincodes = places[places['kind'] == 'pincode']
+        self.pincodes = {str(pin): (lat, lon) for pin, lat, lon in zip(pincodes['name'], pincodes['latitude'], pincodes['longitude'])}
+        city = places[places['kind'] == 'city']
+        self.city = (city['latitude'].iloc[0], city['longitude'].iloc[0]) if len(city) else None
+
+    @classmethod
+    def load(cls, path=DEFAULT_GAZETTEER_PATH):
+        return cls(pd.read_csv(path, dtype={'name': str}))
+
+    def match_locality(self, name):
+        """(gazetteer index, similarity) of the best match for a locality name, or None below MIN_SIMILARITY."""
+        key = locality_key(name)
+        if key in self._key_ids:
+            return self._key_ids[key], 1.0
+        grams = locality_ngrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for i in self._ngram_index.get(gram, ()):
+                shared[i] += 1
+        best = None
+        for i, count in shared.items():
+            similarity = count / len(grams | self._key_ngrams[i])
+            if similarity >= MIN_SIMILARITY and (best is None or similarity > best[1]):
+                best = (i, similarity)
+        return best
+
+    def locate(self, address):
+        """(lat, lon, confidence, matched gazetteer entry) for one address, or None if it holds no usable place."""
+        if not isinstance(address, str) or ',' not in address:
+            return None
+        code = PLUS_CODE_PATTERN.search(address)
+        if code:
+            return (*decode_plus_code(code.group(1)), 'exact', code.group(1))
+        # Most specific locality first: the part before the city, then the ones after it
+        matches = [match for match in map(self.match_locality, address_localities(address)) if match]
+        if matches:
+            i, _ = max(matches, key=lambda match: match[1])
+            return (*self.locality_points[i], 'locality', self.locality_names[i])
+        pincode = PINCODE_PATTERN.search(address)
+        if pincode and pincode.group(1) in self.pincodes:
+            return (*self.pincodes[pincode.group(1)], 'pincode', pincode.group(1))
+        if self.city is not None and (pincode or 'Silchar' in address):
+            return (*self.city, 'city', 'Silchar')
+        return None
+
+    def geocode_frame(self, df, address_col='Address'):
+        """
+        Adds latitude, longitude, geocode_confidence and gazetteer_match columns in one pass:
+        each distinct address is located once and the results are mapped back onto every row.
+        """
+        unique = df[address_col].dropna().unique()
+        located = pd.DataFrame([self.locate(address) or (None, None, None, None) for address in unique],
+                               columns=['latitude', 'longitude', 'geocode_confidence', 'gazetteer_match'], index=unique)
+        df = df.copy()
+        for column in located.columns:
+            df[column] = df[address_col].map(located[column])
+        return df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the offline locality gazetteer, or geocode a restaurant list with it.")
+    parser.add_argument('command', choices=['build', 'geocode'])
+    parser.add_argument('--input', default='download.csv')
+    parser.add_argument('--gazetteer', default=DEFAULT_GAZETTEER_PATH)
+    parser.add_argument('--output', default='silchar_restaurants_geocoded.csv')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    if args.command == 'build':
+        gazetteer = build_gazetteer(df)
+        gazetteer.to_csv(args.gazetteer, index=False)
+        print(f"Wrote {len(gazetteer)} places to {args.gazetteer}: {gazetteer['kind'].value_counts().to_dict()}")
+    else:
+        start = time.perf_counter()
+        df = LocalityGazetteer.load(args.gazetteer).geocode_frame(df)
+        print(f"Located {df['latitude'].notna().sum()} of {len(df)} restaurants in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(df['geocode_confidence'].value_counts().reindex(CONFIDENCE_LEVELS, fill_value=0).to_string())
+        df.to_csv(args.output, index=False)
+        print(f"Saved to {args.output}")
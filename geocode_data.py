@@ -1,55 +1,254 @@
-import pandas as pd
-from geopy.geocoders import Nominatim
+import argparse
+import json
+import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
 from tqdm import tqdm # A progress bar library
+from gazetteer import CONFIDENCE_LEVELS, LocalityGazetteer
+
+DEFAULT_INPUT = 'download.csv'
+DEFAULT_OUTPUT = 'silchar_restaurants_geocoded.csv'
+DEFAULT_CACHE_PATH = 'geocode_cache.sqlite3'
+# Nominatim's usage policy allows 1 request/sec; keep the old 1.1s spacing as the sustained rate
+NOMINATIM_RATE = 1 / 1.1
+STRATEGIES = ['name+address', 'address', 'locality+pincode', 'name']
+# What an online hit of each strategy pins down: the place itself, or only the centre of its locality or city
+STRATEGY_CONFIDENCE = {'name+address': 'online', 'address': 'online', 'locality+pincode': 'locality', 'name': 'city'}
+LOCALITY_PATTERN = re.compile(r"([^,]+),\s*Assam\s*(\d{6})")
+
+
+def normalize_query(query):
+    return " ".join(query.split()).casefold()
+
+def parse_locality(address):
+    """(locality, pincode) from an address ending in '..., <Locality>, Assam <PIN>', else (None, None)."""
+    match = LOCALITY_PATTERN.search(address) if isinstance(address, str) else None
+    return (match.group(1).strip(), match.group(2)) if match else (None, None)
+
+def candidate_queries(name, address):
+    """{strategy: query} from most to least specific. Scraped non-addresses ('Veg-only', ...) only yield a name query."""
+    has_address = isinstance(address, str) and ',' in address
+    if not has_address:
+        return {'name': f"{name}, Silchar, Assam, India"}
+    queries = {'name+address': f"{name}, {address}, India", 'address': f"{address}, India"}
+    locality, pincode = parse_locality(address)
+    if locality:
+        queries['locality+pincode'] = f"{locality}, Silchar, Assam {pincode}, India"
+    return queries
+
+
+# --- RATE LIMITING ---
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent at `rate` per second (bursts up to `capacity`)."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+# --- PERSISTENT CACHE ---
+class GeocodeCache:
+    """
+    query -> coordinates in SQLite, per geocoder. Queries that found nothing are stored too (as NULL), so a
+    rerun only sends queries it has never tried; pass retry_misses to resolve() to try those again.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS geocodes (geocoder TEXT, query TEXT, latitude REAL, longitude REAL, "
+                           "updated_at REAL, PRIMARY KEY (geocoder, query))")
+
+    def get_many(self, geocoder, queries):
+        """{query: (lat, lon) or None} for the cached queries; uncached ones are left out."""
+        with self._lock:
+            rows = [self._conn.execute("SELECT query, latitude, longitude FROM geocodes WHERE geocoder = ? AND query = ?",
+                                       (geocoder, query)).fetchone() for query in queries]
+        return {query: (lat, lon) if lat is not None else None for query, lat, lon in filter(None, rows)}
+
+    def put_many(self, geocoder, results):
+        now = time.time()
+        rows = [(geocoder, query, *(point if point else (None, None)), now) for query, point in results.items()]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?, ?)", rows)
+
+
+# --- GEOCODERS: anything with a `name` and geocode(query) -> (lat, lon) or None ---
+class NominatimGeocoder:
+    """
+    Nominatim through geopy. `domain`/`scheme` point it at another Nominatim-compatible server, e.g. the local
+    stand-in; `name` keys its cache entries (defaults to the server).
+    """
 
-print("Starting the geocoding process. This will take a few minutes...")
-
-# Initialize the Nominatim geocoder
-# The user_agent can be any name you choose for your app.
-geolocator = Nominatim(user_agent="silchar_food_tour_app")
-
-# Load your master dataset
-df = pd.read_csv('silchar_restaurants_ALL_DATA.csv')
-
-# Prepare lists to store the new data
-latitudes = []
-longitudes = []
-
-# Use tqdm to create a nice progress bar in your terminal
-for index, row in tqdm(df.iterrows(), total=df.shape[0], desc="Geocoding Restaurants"):
-    # Create a detailed query for better accuracy
-    query = f"{row['Name']}, Silchar, Assam, India"
-    
-    try:
-        # Geocode the address
-        location = geolocator.geocode(query, timeout=10)
-        
-        if location:
-            latitudes.append(location.latitude)
-            longitudes.append(location.longitude)
-            # print(f"SUCCESS: Found coordinates for {row['Name']}")
+    def __init__(self, user_agent="silchar_food_tour_app", domain=None, scheme='https', timeout=10, name=None):
+        from geopy.geocoders import Nominatim
+
+        kwargs = {'domain': domain, 'scheme': scheme} if domain else {}
+        self.name = name or (f"nominatim@{domain}" if domain else "nominatim")
+        self._geolocator = Nominatim(user_agent=user_agent, timeout=timeout, **kwargs)
+
+    def geocode(self, query):
+        location = self._geolocator.geocode(query)
+        return (location.latitude, location.longitude) if location else None
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Answers Nominatim-style /search?q=...&format=json from the server's `places` table (normalized query -> point)."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+        point = self.server.places.get(normalize_query(query))
+        results = [{"lat": str(point[0]), "lon": str(point[1]), "display_name": query}] if point else []
+        body = json.dumps(results).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def load_stand_in_places(csv_path):
+    """A stand-in table from a CSV with query, latitude, longitude columns."""
+    df = pd.read_csv(csv_path).dropna(subset=['latitude', 'longitude'])
+    return {normalize_query(q): (lat, lon) for q, lat, lon in zip(df['query'], df['latitude'], df['longitude'])}
+
+def serve_stand_in(places, port=0):
+    """Starts a local stand-in geocoder on a background thread; returns (server, domain). Call server.shutdown() when done."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StandInRequestHandler)
+    server.places = places
+    threading.Thread(target=server.serve_forever, name="geocoder-stand-in", daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+# --- PIPELINE ---
+def resolve(queries, geocoder, cache, bucket=None, workers=4, retry_misses=False):
+    """
+    Coordinates for a set of queries: cached ones come from the cache, the rest are sent concurrently
+    (no faster than `bucket` allows) and cached. Returns ({query: (lat, lon) or None}, stats).
+    """
+    cached = cache.get_many(geocoder.name, queries)
+    if retry_misses:
+        cached = {query: point for query, point in cached.items() if point is not None}
+    pending = [query for query in queries if query not in cached]
+    fetched, errors = {}, 0
+
+    def lookup(query):
+        if bucket is not None:
+            bucket.acquire()
+        return geocoder.geocode(query)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(lookup, query): query for query in pending}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Geocoding queries"):
+                query = futures[future]
+                try:
+                    fetched[query] = future.result()
+                except Exception as e:
+                    # Network errors are not cached, so the query is retried on the next run
+                    print(f"ERROR: Geocoding '{query}' failed. Error: {e}")
+                    errors += 1
+        cache.put_many(geocoder.name, fetched)
+    stats = {"queries": len(queries), "cached": len(cached), "fetched": len(fetched), "errors": errors}
+    return {**cached, **fetched}, stats
+
+def geocode_frame(df, geocoder, cache, rate=NOMINATIM_RATE, workers=4, retry_misses=False):
+    """
+    Adds latitude, longitude and geocode_strategy columns. Each strategy in STRATEGIES is tried for the rows
+    still unresolved, and identical queries (chains, shared buildings) are looked up only once.
+    """
+    bucket = TokenBucket(rate) if rate else None
+    candidates = [candidate_queries(name, address) for name, address in zip(df['Name'], df['Address'])]
+    points, used = [None] * len(df), [None] * len(df)
+    for strategy in STRATEGIES:
+        rows = [i for i, queries in enumerate(candidates) if points[i] is None and strategy in queries]
+        queries = {candidates[i][strategy] for i in rows}
+        if not queries:
+            continue
+        results, stats = resolve(queries, geocoder, cache, bucket, workers, retry_misses)
+        for i in rows:
+            if results.get(candidates[i][strategy]):
+                points[i], used[i] = results[candidates[i][strategy]], strategy
+        print(f"{strategy}: {len(rows)} rows, {stats['queries']} unique queries ({stats['cached']} cached, "
+              f"{stats['fetched']} looked up, {stats['errors']} errors), {sum(u == strategy for u in used)} resolved")
+    df = df.copy()
+    df['latitude'] = [point[0] if point else None for point in points]
+    df['longitude'] = [point[1] if point else None for point in points]
+    df['geocode_strategy'] = used
+    return df
+
+def refine_online(df, geocoder, cache, rate=NOMINATIM_RATE, workers=4, retry_misses=False):
+    """
+    Looks up online the rows the offline gazetteer (see gazetteer.py) could not place exactly. An online point
+    gets the confidence of the query that found it (STRATEGY_CONFIDENCE), and only replaces the offline point
+    when it is more precise; rows it cannot find keep their centroid.
+    """
+    rank = {level: i for i, level in enumerate(['online'] + CONFIDENCE_LEVELS)}
+    refine = df['geocode_confidence'] != 'exact'
+    online = geocode_frame(df[refine], geocoder, cache, rate, workers, retry_misses)
+    online['geocode_confidence'] = online['geocode_strategy'].map(STRATEGY_CONFIDENCE)
+    current = df.loc[online.index, 'geocode_confidence'].map(rank).fillna(len(rank))
+    better = online.index[online['latitude'].notna() & (online['geocode_confidence'].map(rank) < current)]
+    df = df.copy()
+    columns = ['latitude', 'longitude', 'geocode_strategy', 'geocode_confidence']
+    df.loc[better, columns] = online.loc[better, columns]
+    return df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Geocode the restaurant list with a persistent cache and rate limiting.")
+    parser.add_argument('--input', default=DEFAULT_INPUT)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--rate', type=float, default=NOMINATIM_RATE, help="Maximum requests per second (0 = unlimited).")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--retry-misses', action='store_true', help="Look up again the queries that found nothing last time.")
+    parser.add_argument('--nominatim-url', default=None, help="Host[:port] of another Nominatim-compatible server.")
+    parser.add_argument('--stand-in', default=None, help="Geocode against a local stand-in server built from this query,latitude,longitude CSV.")
+    parser.add_argument('--offline-only', action='store_true', help="Only place restaurants with the offline locality gazetteer.")
+    args = parser.parse_args()
+
+    print("Starting the geocoding process...")
+    start = time.perf_counter()
+    # Every restaurant first gets an instant offline point; the online lookups only refine the inexact ones
+    df = LocalityGazetteer.load().geocode_frame(pd.read_csv(args.input))
+    print(f"Gazetteer: {df['geocode_confidence'].value_counts().to_dict()}")
+    if not args.offline_only:
+        cache = GeocodeCache(args.cache)
+        server = None
+        if args.stand_in:
+            server, domain = serve_stand_in(load_stand_in_places(args.stand_in))
+            geocoder = NominatimGeocoder(domain=domain, scheme='http', name='stand-in')
         else:
-            latitudes.append(None)
-            longitudes.append(None)
-            # print(f"WARNING: Could not find coordinates for {row['Name']}")
-            
-    except Exception as e:
-        # Handle potential errors like network issues
-        print(f"ERROR: An error occurred for {row['Name']}. Error: {e}")
-        latitudes.append(None)
-        longitudes.append(None)
-    
-    # --- IMPORTANT: Rate limit to respect Nominatim's usage policy (1 request/sec) ---
-    time.sleep(1.1)
-
-# Add the new columns to the DataFrame
-df['latitude'] = latitudes
-df['longitude'] = longitudes
-
-# Save the new, enriched DataFrame to a new file
-output_filename = 'silchar_restaurants_geocoded.csv'
-df.to_csv(output_filename, index=False)
-
-print(f"\nGeocoding complete! Enriched data saved to '{output_filename}'")
-print(f"Check the file to see how many locations were successfully found.")
\ No newline at end of file
+            geocoder = NominatimGeocoder(domain=args.nominatim_url)
+        df = refine_online(df, geocoder, cache, args.rate or None, args.workers, args.retry_misses)
+        if server is not None:
+            server.shutdown()
+
+    df.to_csv(args.output, index=False)
+    print(f"\nGeocoding complete in {time.perf_counter() - start:.1f}s! {df['latitude'].notna().sum()} of {len(df)} restaurants located.")
+    print(f"Enriched data saved to '{args.output}'")
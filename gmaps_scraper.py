@@ -1,4 +1,7 @@
-import time
+import argparse
+import json
+import os
+from urllib.parse import quote_plus
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -6,83 +9,293 @@ from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from crawl_state import CrawlState
+from step_timer import StepTimer
 
-def scrape_everything_definitively():
+SEARCH_QUERY = "restaurants in Silchar Assam"
+SEARCH_URL = f"https://www.google.com/search?q={quote_plus(SEARCH_QUERY)}"
+RESULTS_PER_PAGE = 20
+
+def local_results_url(query, page, base_url="https://www.google.com/search"):
+    """URL of one page of the 'More places' (local results) list, so any page can be opened directly."""
+    return f"{base_url}?tbm=lcl&q={quote_plus(query)}&start={(page - 1) * RESULTS_PER_PAGE}"
+
+# --- BROWSER PROFILES ---
+BROWSER_PROFILE_DIR = 'chrome_profile'
+# Requests the scrapers never need: images, map tiles, web fonts, media and analytics/ad trackers
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    "*/maps/vt*", "*/vt/data=*", "*encrypted-tbn*",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*facebook.net*",
+]
+
+def create_driver(driver_path=None, light=False, profile_dir=None):
     """
-    The definitive scraper. It handles CAPTCHA, clicks "More places",
-    and loops through all pages using the confirmed ID "pnnext".
+    A Chrome driver. Pass `driver_path` to reuse an already installed chromedriver.
+    The default is the original maximized, visible browser. `light` starts a headless browser that blocks
+    BLOCKED_URL_PATTERNS and keeps its cookies and cache in `profile_dir` (BROWSER_PROFILE_DIR by default),
+    so consecutive runs reuse one profile. Every driver logs network events for transferred_bytes().
     """
-    print("Setting up Selenium WebDriver...")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service)
-    driver.maximize_window()
+    options = webdriver.ChromeOptions()
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    if light:
+        profile_dir = profile_dir or BROWSER_PROFILE_DIR
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        for flag in ("--mute-audio", "--disable-extensions", "--disable-background-networking", "--no-first-run"):
+            options.add_argument(flag)
+    if profile_dir:
+        # Command-line flags only: blocking must not be written into the profile, which visible windows share
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    service = Service(driver_path or ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=options)
+    if light:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    else:
+        driver.maximize_window()
+    return driver
 
-    url = f"https://www.google.com/search?q=restaurants+in+Silchar+Assam"
+def transferred_bytes(driver):
+    """Bytes received over the network since the last call, from Chrome's performance log (None if unavailable)."""
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return None
+    total = 0
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            total += message['params']['encodedDataLength']
+    return total
+
+def is_captcha_page(driver):
+    return '/sorry/' in driver.current_url or bool(driver.find_elements(By.CSS_SELECTOR, "iframe[src*='recaptcha']"))
+
+def pass_captcha(driver, url, prompt, driver_path=None, light=False, profile_dir=None):
+    """
+    Opens `url` and gets a human past any CAPTCHA; returns the driver to continue with.
+    A visible browser always waits for Enter, as before. A headless one only stops when a CAPTCHA is shown:
+    it is swapped for a visible window on the same profile, and once solved, for a fresh headless browser
+    that inherits the cookies through the profile directory.
+    """
     driver.get(url)
+    if not light:
+        input(prompt)
+        return driver
+    if not is_captcha_page(driver):
+        return driver
+    profile_dir = profile_dir or BROWSER_PROFILE_DIR
+    driver.quit()
+    visible = create_driver(driver_path, profile_dir=profile_dir)
+    try:
+        visible.get(url)
+        input(f"CAPTCHA detected. {prompt}")
+    finally:
+        visible.quit()
+    driver = create_driver(driver_path, light=True, profile_dir=profile_dir)
+    driver.get(url)
+    return driver
 
-    print("\nACTION REQUIRED: Please solve the CAPTCHA.")
-    input("After you see the initial list, press Enter to continue...")
+# --- EVENT-DRIVEN WAITS: return as soon as the page is ready instead of sleeping a fixed time ---
+def wait_for_results(wait):
+    """Waits until result cards are rendered and returns them."""
+    return wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'uMdZh')))
 
-    wait = WebDriverWait(driver, 10)
+def open_more_places(driver, wait, timer=None):
+    """Clicks 'More places' and waits for the full list. Returns False if there is no such button."""
+    timer = timer or StepTimer()
+    try:
+        with timer.step('click'):
+            button = wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, 'More places')))
+            button.click()
+    except TimeoutException:
+        return False
+    with timer.step('wait'):
+        # The click navigates to the local results page: the old button goes stale, then the cards render
+        wait.until(EC.staleness_of(button))
+        wait_for_results(wait)
+    return True
+
+def go_to_next_page(driver, wait, timer=None, force_click=False):
+    """
+    Clicks 'Next' (id 'pnnext') and waits until the current cards are replaced by the next page's.
+    Returns False when there is no next page. `force_click` clicks through JavaScript, for overlaid buttons.
+    """
+    timer = timer or StepTimer()
+    current = driver.find_elements(By.CLASS_NAME, 'uMdZh')
+    try:
+        with timer.step('click'):
+            if force_click:
+                next_button = wait.until(EC.presence_of_element_located((By.ID, 'pnnext')))
+                driver.execute_script("arguments[0].click();", next_button)
+            else:
+                next_button = wait.until(EC.element_to_be_clickable((By.ID, 'pnnext')))
+                driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
+                next_button.click()
+    except TimeoutException:
+        return False
+    with timer.step('wait'):
+        if current:
+            wait.until(EC.staleness_of(current[0]))
+        wait_for_results(wait)
+    return True
+
+def scroll_until_stable(driver, element, settle=0.5, max_rounds=3):
+    """
+    Scrolls `element` to the bottom until its scrollHeight stops growing (lazy content finished loading),
+    waiting at most `settle` seconds per round for new content instead of always sleeping.
+    """
+    settle_wait = WebDriverWait(driver, settle, poll_frequency=0.05)
+    for _ in range(max_rounds):
+        height = driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight; return arguments[0].scrollHeight", element)
+        try:
+            settle_wait.until(lambda d: d.execute_script("return arguments[0].scrollHeight", element) > height)
+        except TimeoutException:
+            return
+
+def build_result_record(name, rating=None, reviews=None, details=None):
+    """A result record from a card's raw texts; fields that are missing become "Not found"."""
+    address = "Not found"
+    if details is not None:
+        lines = details.split('\n')
+        address = lines[-1] if len(lines) > 2 else lines[0]
+    return { "Name": name, "Rating": rating if rating is not None else "Not found",
+             "Reviews": reviews if reviews is not None else "Not found", "Address": address }
+
+def parse_result_container(container):
+    """Name, Rating, Reviews and Address of one search result card, or None if it has no name."""
     try:
-        print("Looking for the 'More places' button...")
-        more_places_button = wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, 'More places')))
-        more_places_button.click()
-        print("Button clicked! Waiting for the full list...")
-        time.sleep(5)
+        name = container.find_element(By.CLASS_NAME, 'OSrXXb').text
     except Exception:
-        print("Could not find or click 'More places'.")
+        return None
 
-    restaurant_data = []
-    scraped_names = set()
-    page_number = 1
+    rating, reviews, details = None, None, None
+    try: rating = container.find_element(By.CLASS_NAME, 'yi40Hd').text
+    except Exception: pass
+    try: reviews = container.find_element(By.CLASS_NAME, 'RDApEe').text
+    except Exception: pass
+    try: details = container.find_element(By.CLASS_NAME, 'rllt__details').text
+    except Exception: pass
+    return build_result_record(name, rating, reviews, details)
+
+# --- BULK EXTRACTION: every card's fields in one execute_script round trip instead of 4+ per card ---
+RESULTS_EXTRACTION_JS = """
+function text(root, cls) {
+    var el = root.getElementsByClassName(cls)[0];
+    return el ? el.innerText : null;
+}
+return Array.prototype.map.call(document.getElementsByClassName('uMdZh'), function (card) {
+    return {name: text(card, 'OSrXXb'), rating: text(card, 'yi40Hd'), reviews: text(card, 'RDApEe'), details: text(card, 'rllt__details')};
+});
+"""
+
+def extract_results_bulk(driver):
+    """
+    Every result card on the page via one JavaScript call, or None when the markup no longer matches
+    (script error, or cards without any names), so the caller can fall back to per-element lookups.
+    """
+    try:
+        cards = driver.execute_script(RESULTS_EXTRACTION_JS)
+    except Exception:
+        return None
+    if not isinstance(cards, list) or (cards and not any(card.get('name') for card in cards)):
+        return None
+    return [build_result_record(card['name'], card.get('rating'), card.get('reviews'), card.get('details'))
+            for card in cards if card.get('name')]
+
+def extract_results(driver, bulk=True):
+    """Parsed records of every result card on the page, in bulk when possible, else one element at a time."""
+    records = extract_results_bulk(driver) if bulk else None
+    if records is None:
+        records = [parse_result_container(c) for c in driver.find_elements(By.CLASS_NAME, 'uMdZh')]
+    return [record for record in records if record is not None]
+
+def clean_results(restaurant_df):
+    """Turns the scraped '(123)' review counts and rating strings into numbers."""
+    restaurant_df['Reviews'] = restaurant_df['Reviews'].str.replace(r'[\(\)]', '', regex=True)
+    restaurant_df['Reviews'] = pd.to_numeric(restaurant_df['Reviews'], errors='coerce').fillna(0).astype(int)
+    restaurant_df['Rating'] = pd.to_numeric(restaurant_df['Rating'], errors='coerce')
+    return restaurant_df
+
+def scrape_everything_definitively(state=None, timer=None, bulk=True, light=False):
+    """
+    The definitive scraper. It handles CAPTCHA, clicks "More places",
+    and loops through all pages using the confirmed ID "pnnext".
+    Every finished page is checkpointed in `state`, so a rerun continues from the first unfinished page.
+    Step latencies (navigate, click, wait, extract) are recorded in `timer` and printed at the end.
+    With `bulk`, each page's cards are read in one JavaScript call (see extract_results).
+    `light` runs the headless, asset-blocking browser profile (see create_driver).
+    """
+    state = state or CrawlState('gmaps_results')
+    timer = timer or StepTimer()
+    done_pages = state.completed_pages()
+    page_number = state.first_unfinished_page()
+
+    print("Setting up Selenium WebDriver...")
+    driver_path = ChromeDriverManager().install()
+    driver = create_driver(driver_path, light)
+
+    url = SEARCH_URL
+    with timer.step('navigate'):
+        driver = pass_captcha(driver, url, "\nACTION REQUIRED: Please solve the CAPTCHA. After you see the initial list, press Enter to continue...",
+                              driver_path, light)
+    transferred_bytes(driver)
+
+    wait = WebDriverWait(driver, 10)
+    if page_number > 1:
+        print(f"Resuming: {len(done_pages)} page(s) already scraped. Jumping straight to page {page_number}, the first unfinished one...")
+        with timer.step('navigate'):
+            driver.get(local_results_url(SEARCH_QUERY, page_number))
+    else:
+        try:
+            print("Looking for the 'More places' button...")
+            if open_more_places(driver, wait, timer):
+                print("Button clicked! The full list is loaded.")
+            else:
+                print("Could not find or click 'More places'.")
+        except Exception:
+            print("Could not find or click 'More places'.")
 
     while True:
         print(f"\n--- Scraping Page {page_number} ---")
         
-        try:
-            wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'uMdZh')))
-            restaurant_containers = driver.find_elements(By.CLASS_NAME, 'uMdZh')
-            print(f"Found {len(restaurant_containers)} results on this page.")
-
-            for container in restaurant_containers:
-                name = "Not found"
-                try:
-                    name = container.find_element(By.CLASS_NAME, 'OSrXXb').text
-                    if name in scraped_names:
-                        continue
-                    scraped_names.add(name)
-                except Exception: continue
-
-                # ... (Parsing logic is the same) ...
-                rating, reviews, address = "Not found", "Not found", "Not found"
-                try: rating = container.find_element(By.CLASS_NAME, 'yi40Hd').text
-                except Exception: pass
-                try: reviews = container.find_element(By.CLASS_NAME, 'RDApEe').text
-                except Exception: pass
-                try:
-                    details = container.find_element(By.CLASS_NAME, 'rllt__details').text.split('\n')
-                    address = details[-1] if len(details) > 2 else details[0]
-                except Exception: pass
-                
-                print(f"✔️ Parsed: {name}")
-                restaurant_data.append({ "Name": name, "Rating": rating, "Reviews": reviews, "Address": address })
-        except Exception as e:
-            print(f"An error occurred while scraping page {page_number}: {e}")
+        if state.is_page_done(page_number):
+            # Pages after a retried one may already be finished: walk past them without re-reading them
+            print(f"Page {page_number} was already scraped. Skipping.")
+        else:
+            try:
+                with timer.step('wait'):
+                    restaurant_containers = wait_for_results(wait)
+                print(f"Found {len(restaurant_containers)} results on this page.")
+
+                with timer.step('extract'):
+                    page_records = extract_results(driver, bulk)
+                for record in page_records:
+                    print(f"✔️ Parsed: {record['Name']}")
+                page_bytes = transferred_bytes(driver)
+                if page_bytes is not None:
+                    timer.record_bytes(page_bytes)
+                    print(f"Transferred {page_bytes / 1024:.0f} KB for this page.")
+                # Upserts keyed by name + address: re-scraped restaurants are updated, never duplicated
+                state.complete_page(page_number, page_records)
+            except Exception as e:
+                print(f"An error occurred while scraping page {page_number}: {e}")
 
         # --- FIND AND CLICK 'NEXT' USING THE CONFIRMED ID ---
         try:
             print("Looking for the 'Next' page button using its unique ID: 'pnnext'...")
-            next_button = wait.until(EC.element_to_be_clickable((By.ID, 'pnnext')))
-            
-            # This little javascript trick can help ensure the button is clickable
-            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            time.sleep(1)
-            
-            next_button.click()
+            # Returns once the old cards are gone and the next page's are rendered
+            if not go_to_next_page(driver, wait, timer):
+                print("No more 'Next' button found. We've scraped all pages!")
+                break
             page_number += 1
-            print("SUCCESS: Navigating to the next page...")
-            time.sleep(3) # Wait for next page to load
+            print("SUCCESS: Navigated to the next page.")
         except Exception:
             print("No more 'Next' button found. We've scraped all pages!")
             break
@@ -90,20 +303,28 @@ def scrape_everything_definitively():
     print("\n" + "="*50)
     print("Closing browser...")
     driver.quit()
+    timer.report()
 
-    if not restaurant_data: return None
-    return pd.DataFrame(restaurant_data)
+    restaurant_df = state.to_dataframe(["Name", "Rating", "Reviews", "Address"])
+    return restaurant_df if not restaurant_df.empty else None
 
 if __name__ == '__main__':
-    restaurant_df = scrape_everything_definitively()
+    parser = argparse.ArgumentParser(description="Scrape every page of Google's restaurant results for Silchar.")
+    parser.add_argument('--fresh', action='store_true', help="Forget the saved crawl progress and start from page 1.")
+    parser.add_argument('--per-element', action='store_true', help="Read each card field with its own WebDriver call instead of one JavaScript call per page.")
+    parser.add_argument('--light', action='store_true', help="Headless browser that blocks images, fonts, media and trackers; a window only opens for a CAPTCHA.")
+    args = parser.parse_args()
+
+    state = CrawlState('gmaps_results')
+    if args.fresh:
+        state.reset()
+    restaurant_df = scrape_everything_definitively(state, bulk=not args.per_element, light=args.light)
     if restaurant_df is not None:
         print("\n\n--- DEFINITIVE SCRAPING COMPLETE ---")
         print(f"Successfully scraped a total of {len(restaurant_df)} unique restaurants across all pages.")
         
         # Data cleaning
-        restaurant_df['Reviews'] = restaurant_df['Reviews'].str.replace(r'[\(\)]', '', regex=True)
-        restaurant_df['Reviews'] = pd.to_numeric(restaurant_df['Reviews'], errors='coerce').fillna(0).astype(int)
-        restaurant_df['Rating'] = pd.to_numeric(restaurant_df['Rating'], errors='coerce')
+        restaurant_df = clean_results(restaurant_df)
         
         print("\n--- Final Cleaned Data (First 5 Rows) ---")
         print(restaurant_df.head())
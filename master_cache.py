@@ -0,0 +1,59 @@
+import json
+import os
+
+CACHE_FORMAT_VERSION = 1
+METADATA_KEY = b'silchar_master_cache'
+
+
+def source_stamps(paths):
+    """(mtime_ns, size) of every source file, keyed by path. Raises FileNotFoundError if one is missing."""
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[path] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+def cache_key(sources, version):
+    """Identifies one build of the master frame: source file stamps plus the builder's version."""
+    return json.dumps({'format': CACHE_FORMAT_VERSION, 'version': version, 'sources': source_stamps(sources)},
+                      sort_keys=True).encode('utf-8')
+
+
+# --- ARROW IPC FILE (uncompressed, so reading it is a memory map) ---
+def read_master_cache(cache_path, key):
+    """The cached frame if `cache_path` exists and was built from the same sources, else None."""
+    import pyarrow as pa
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(cache_path))
+        if (reader.schema.metadata or {}).get(METADATA_KEY) != key:
+            return None
+        return reader.read_all().to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+def write_master_cache(df, cache_path, key):
+    """Writes `df` (index included) with the source key stored in the schema metadata, atomically."""
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: key})
+    tmp_path = f"{cache_path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, cache_path)
+
+def load_master_frame(build_fn, sources, cache_path, version=1):
+    """
+    Returns the master frame from the on-disk cache, calling `build_fn()` (and refreshing the cache)
+    only when a source file's mtime/size or the builder `version` changed.
+    Bump `version` whenever `build_fn` starts producing different columns.
+    """
+    key = cache_key(sources, version)
+    df = read_master_cache(cache_path, key)
+    if df is not None:
+        return df
+    df = build_fn()
+    try:
+        write_master_cache(df, cache_path, key)
+    except OSError:
+        pass  # Read-only deployments just rebuild in each process
+    return df
@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import sys
+import time
+import pandas as pd
+from ai_engine import NLP_PROFILES, clean_review_text, load_nlp, summarize_doc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def load_benchmark_texts(input_path, scale=1):
+    """Clean review text of every restaurant in `input_path`, repeated `scale` times."""
+    df_reviews = pd.read_csv(input_path)
+    texts = [clean_review_text(text) for text in df_reviews['Reviews_Text'].fillna("") if text.strip()]
+    return texts * scale
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where the OS doesn't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def profile_run(model_name, profile, texts, batch_size):
+    """Loads one profile and summarizes every text. Runs in its own process so peak RSS is per profile."""
+    start = time.perf_counter()
+    nlp = load_nlp(model_name, profile)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summaries = [summarize_doc(doc) for doc in nlp.pipe(texts, batch_size=batch_size)]
+    elapsed = time.perf_counter() - start
+    return {
+        "profile": profile,
+        "components": list(nlp.pipe_names),
+        "load_seconds": load_seconds,
+        "docs_per_second": len(texts) / elapsed if elapsed else float('inf'),
+        "peak_rss_mb": peak_rss_mb(),
+        "summaries": summaries,
+    }
+
+def run_profiles(model_name, profiles, texts, batch_size):
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for profile in profiles:
+        with context.Pool(1) as pool:
+            results[profile] = pool.apply(profile_run, (model_name, profile, texts, batch_size))
+    return results
+
+def summary_mismatches(results, baseline='full'):
+    """For every profile, the indexes of texts whose summary differs from the baseline profile's."""
+    reference = results[baseline]['summaries']
+    return {profile: [i for i, (a, b) in enumerate(zip(reference, result['summaries'])) if a != b]
+            for profile, result in results.items() if profile != baseline}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the spaCy NLP profiles and check their summaries match the full pipeline.")
+    parser.add_argument('--input', default='downloadrev.csv')
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--profiles', nargs='+', default=list(NLP_PROFILES), choices=list(NLP_PROFILES))
+    parser.add_argument('--scale', type=int, default=1, help="Repeat the corpus N times for steadier timings.")
+    parser.add_argument('--batch-size', type=int, default=8)
+    args = parser.parse_args()
+
+    profiles = ['full'] + [p for p in args.profiles if p != 'full']
+    texts = load_benchmark_texts(args.input, args.scale)
+    print(f"Benchmarking {len(texts)} documents with '{args.model}'...\n")
+    results = run_profiles(args.model, profiles, texts, args.batch_size)
+
+    print(f"{'Profile':<8} {'Load (s)':>9} {'Docs/sec':>10} {'Peak RSS (MB)':>14}  Components")
+    for profile, result in results.items():
+        rss = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else "n/a"
+        print(f"{profile:<8} {result['load_seconds']:>9.2f} {result['docs_per_second']:>10.1f} {rss:>14}  {', '.join(result['components'])}")
+
+    # --- REGRESSION CHECK: every profile must pick the same summary sentences as the full pipeline ---
+    print()
+    failed = False
+    for profile, mismatches in summary_mismatches(results).items():
+        if mismatches:
+            failed = True
+            print(f"❌ {profile}: {len(mismatches)}/{len(texts)} summaries differ from 'full' (e.g. document {mismatches[0]})")
+        else:
+            print(f"✔️ {profile}: all {len(texts)} summaries match 'full'")
+    sys.exit(1 if failed else 0)
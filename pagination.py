@@ -0,0 +1,27 @@
+import math
+import streamlit as st
+
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+
+def paginate(results, key, default_page_size=10):
+    """
+    Renders page-size and page-number controls and returns only the rows of the current page,
+    so callers build widgets for the visible restaurants only.
+    """
+    size_key, page_key = f"{key}_page_size", f"{key}_page"
+    col1, col2 = st.columns(2)
+    page_size = col1.selectbox("Results per page", PAGE_SIZE_OPTIONS,
+                               index=PAGE_SIZE_OPTIONS.index(default_page_size), key=size_key)
+    n_pages = max(1, math.ceil(len(results) / page_size))
+
+    # A new search or page size can leave the stored page out of range
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1
+    page = col2.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    page_rows = results.iloc[start:start + page_size]
+    if len(results):
+        st.caption(f"Showing {start + 1}–{start + len(page_rows)} of {len(results)}")
+    return page_rows
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from ai_engine import ANALYZER_VERSION, ARTIFACT_PATHS, NO_REVIEWS_MESSAGE, clean_review_text, detect_vibes, write_analysis_artifact
+from gazetteer import DEFAULT_GAZETTEER_PATH, LocalityGazetteer
+from record_linkage import DEFAULT_REGISTRY_PATH, build_master, load_registry, load_sources, save_registry
+from review_parser import review_text_hash
+
+DEFAULT_STATE_PATH = 'pipeline_state.sqlite3'
+DEFAULT_OUTPUT = 'silchar_restaurants_published.csv'
+# Bump a stage's version whenever its logic changes, so every restaurant is rebuilt by it once
+STAGE_VERSIONS = {'ingest': 1, 'clean': 1, 'geocode': 1, 'analyze': ANALYZER_VERSION, 'publish': 1}
+PUBLISHED_COLUMNS = ['restaurant_id', 'Name', 'Rating', 'Reviews', 'Gem_Score', 'Info', 'Address', 'Price', 'Phone',
+                     'Services', 'latitude', 'longitude', 'geocode_confidence', 'Vibes', 'Has_Reviews']
+
+
+def content_hash(*parts):
+    """Stable hash of JSON-serializable values (dict key order does not matter)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class PipelineState:
+    """
+    Per-stage, per-restaurant outputs in SQLite, each stored with the hash of the inputs it was built from.
+    A stage rebuilds a restaurant only when that hash changes, and reuses the stored output otherwise.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS outputs (stage TEXT, restaurant_id TEXT, input_hash TEXT, data TEXT, "
+                           "updated_at REAL, PRIMARY KEY (stage, restaurant_id))")
+
+    def load(self, stage):
+        """{restaurant_id: (input_hash, output)} of everything the stage built before."""
+        with self._lock:
+            rows = self._conn.execute("SELECT restaurant_id, input_hash, data FROM outputs WHERE stage = ?", (stage,)).fetchall()
+        return {restaurant_id: (input_hash, json.loads(data)) for restaurant_id, input_hash, data in rows}
+
+    def save(self, stage, built, removed=()):
+        """Upserts {restaurant_id: (input_hash, output)} and drops the removed restaurants in one transaction."""
+        now = time.time()
+        rows = [(stage, restaurant_id, input_hash, json.dumps(output, ensure_ascii=False, default=str), now)
+                for restaurant_id, (input_hash, output) in built.items()]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("DELETE FROM outputs WHERE stage = ? AND restaurant_id = ?", [(stage, rid) for rid in removed])
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM outputs")
+
+
+def run_stage(state, stage, inputs, build_many, salt=None):
+    """
+    Runs one stage incrementally. `inputs` is {restaurant_id: input dict}; `build_many` turns the changed
+    ones into {restaurant_id: output}. Returns ({restaurant_id: output} for every restaurant, stats).
+    `salt` is anything besides the per-restaurant inputs that changes the result (a model, a gazetteer file).
+    """
+    start = time.perf_counter()
+    previous = state.load(stage)
+    hashes = {rid: content_hash(STAGE_VERSIONS[stage], salt, data) for rid, data in inputs.items()}
+    changed = {rid: inputs[rid] for rid, input_hash in hashes.items() if previous.get(rid, (None,))[0] != input_hash}
+    built = build_many(changed) if changed else {}
+    removed = set(previous) - set(inputs)
+    state.save(stage, {rid: (hashes[rid], output) for rid, output in built.items()}, removed)
+    outputs = {rid: built[rid] if rid in built else previous[rid][1] for rid in inputs}
+    stats = {"stage": stage, "total": len(inputs), "skipped": len(inputs) - len(built), "rebuilt": len(built),
+             "removed": len(removed), "seconds": time.perf_counter() - start}
+    return outputs, stats
+
+
+# --- STAGES: each takes {restaurant_id: input} of the changed restaurants and returns {restaurant_id: output} ---
+def _missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+def ingest_records(registry_path=DEFAULT_REGISTRY_PATH):
+    """
+    Every scraped source CSV linked into one record per restaurant (see record_linkage.py), keyed by the
+    stable restaurant ID. Returns ({restaurant_id: raw fields}, linkage stats).
+    """
+    registry = load_registry(registry_path)
+    master, stats = build_master(load_sources(), registry)
+    save_registry(registry, registry_path)
+    master = master.drop(columns=['Sources']).astype(object).where(master.notna(), None)
+    return {row.pop('restaurant_id'): row for row in master.to_dict('records')}, stats
+
+def clean_many(records):
+    """Typed scraped fields plus the Gem Score; rows without a usable rating or review count are dropped (output None)."""
+    cleaned = {}
+    for rid, record in records.items():
+        rating = pd.to_numeric(record['Rating'], errors='coerce')
+        reviews = pd.to_numeric(str(record['Reviews'] or "").replace(',', ''), errors='coerce')
+        if _missing(record['Name']) or np.isnan(rating) or np.isnan(reviews):
+            cleaned[rid] = None
+            continue
+        row = {field: " ".join(str(record[field]).split()) if not _missing(record[field]) else None
+               for field in ['Name', 'Info', 'Address', 'Price', 'Phone', 'Services']}
+        cleaned[rid] = {**row, 'Rating': float(rating), 'Reviews': int(reviews), 'Gem_Score': float(rating * np.log1p(reviews))}
+    return cleaned
+
+def geocode_many(addresses, gazetteer):
+    """Offline gazetteer points (see gazetteer.py) for the changed addresses."""
+    located = {}
+    for rid, data in addresses.items():
+        point = gazetteer.locate(data['Address']) or (None, None, None, None)
+        located[rid] = dict(zip(['latitude', 'longitude', 'geocode_confidence', 'gazetteer_match'], point))
+    return located
+
+def analyze_many(reviews, engine='tfidf', corpus=(), model_name="en_core_web_sm"):
+    """
+    Vibes and summaries for the changed review texts, through the same engines as batch_analyzer.py. TF-IDF
+    fits its IDF on the whole `corpus` but only summarizes the changed texts, so unchanged restaurants keep
+    the summary from the run that built them.
+    """
+    items = [(rid, review_text_hash(data['Reviews_Text']), clean_review_text(data['Reviews_Text']))
+             for rid, data in reviews.items() if data['Reviews_Text']]
+    analyzed = {rid: {'Text_Hash': None, 'Vibes': [], 'Summary': NO_REVIEWS_MESSAGE} for rid in reviews}
+    if not items:
+        return analyzed
+    if engine == 'tfidf':
+        from tfidf_summarizer import TfidfSummarizer  # scikit-learn, only when this engine runs
+        summaries = TfidfSummarizer([clean_review_text(text) for text in corpus]).summarize_many([text for _, _, text in items])
+        records = [{"Name": rid, "Text_Hash": text_hash, "Vibes": detect_vibes(text), "Summary": summary}
+                   for (rid, text_hash, text), summary in zip(items, summaries)]
+    else:
+        from batch_analyzer import run_batch_analysis
+        records = run_batch_analysis(items, model_name)
+    for record in records:
+        analyzed[record['Name']] = {key: record[key] for key in ['Text_Hash', 'Vibes', 'Summary']}
+    return analyzed
+
+def publish_rows(rows):
+    """The published row of each restaurant: clean fields, location and vibes side by side."""
+    published = {}
+    for rid, row in rows.items():
+        clean, point, analysis = row['clean'], row['geocode'], row['analyze']
+        published[rid] = None if clean is None else {
+            'restaurant_id': rid, **clean, **{key: point[key] for key in ['latitude', 'longitude', 'geocode_confidence']},
+            'Vibes': "|".join(analysis['Vibes']), 'Has_Reviews': analysis['Text_Hash'] is not None,
+        }
+    return published
+
+
+# --- RUNNER ---
+def run_pipeline(state, output=DEFAULT_OUTPUT, artifact_path=None, engine='tfidf',
+                 gazetteer_path=DEFAULT_GAZETTEER_PATH, registry_path=DEFAULT_REGISTRY_PATH):
+    """
+    ingest -> (clean | geocode | analyze, in parallel: each only needs the ingested record) -> publish.
+    Each stage rebuilds only the restaurants whose inputs to that stage changed; publish rewrites the
+    output files only when a published row or the analysis changed. The analysis goes to the engine's own
+    artifact (ai_engine.ARTIFACT_PATHS) unless `artifact_path` is given. Returns the per-stage stats.
+    """
+    artifact_path = artifact_path or ARTIFACT_PATHS[engine]
+    start = time.perf_counter()
+    records, _ = ingest_records(registry_path)
+    linked = time.perf_counter() - start
+    # Ingesting is the linkage itself; the stage just records which restaurants' raw fields changed
+    records, ingest_stats = run_stage(state, 'ingest', records, lambda changed: changed)
+    ingest_stats['seconds'] += linked
+
+    gazetteer = LocalityGazetteer.load(gazetteer_path)
+    corpus = [record['Reviews_Text'] for record in records.values() if record['Reviews_Text']]
+    scraped = {rid: {key: value for key, value in record.items() if key != 'Reviews_Text'} for rid, record in records.items()}
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        clean = pool.submit(run_stage, state, 'clean', scraped, clean_many)
+        geocode = pool.submit(run_stage, state, 'geocode', {rid: {'Address': r['Address']} for rid, r in records.items()},
+                              lambda changed: geocode_many(changed, gazetteer), salt=file_hash(gazetteer_path))
+        analyze = pool.submit(run_stage, state, 'analyze', {rid: {'Reviews_Text': r['Reviews_Text']} for rid, r in records.items()},
+                              lambda changed: analyze_many(changed, engine, corpus), salt=engine)
+        (cleaned, clean_stats), (points, geocode_stats), (analyses, analyze_stats) = clean.result(), geocode.result(), analyze.result()
+
+    rows = {rid: {'clean': cleaned[rid], 'geocode': points[rid], 'analyze': analyses[rid]} for rid in records}
+    published, publish_stats = run_stage(state, 'publish', rows, publish_rows)
+    start = time.perf_counter()
+    rewrite = publish_stats['rebuilt'] or publish_stats['removed'] or analyze_stats['rebuilt'] or analyze_stats['removed']
+    if rewrite or not (os.path.exists(output) and os.path.exists(artifact_path)):
+        df = pd.DataFrame([row for row in published.values() if row is not None], columns=PUBLISHED_COLUMNS)
+        df.sort_values('Gem_Score', ascending=False).to_csv(output, index=False)
+        # The app serves precomputed summaries by (Name, Text_Hash), see app.get_precomputed_analysis
+        write_analysis_artifact([{"Name": records[rid]['Name'], **analysis} for rid, analysis in analyses.items() if analysis['Text_Hash']],
+                                artifact_path, model_name="tfidf" if engine == 'tfidf' else "en_core_web_sm", engine=engine)
+    publish_stats['seconds'] += time.perf_counter() - start
+    return [ingest_stats, clean_stats, geocode_stats, analyze_stats, publish_stats]
+
+def print_report(stats, wall):
+    print(f"\n--- Pipeline run (wall time {wall:.2f}s) ---")
+    print(f"{'Stage':<10} {'Total':>6} {'Skipped':>8} {'Rebuilt':>8} {'Removed':>8} {'Time (s)':>9}")
+    for s in stats:
+        print(f"{s['stage']:<10} {s['total']:>6} {s['skipped']:>8} {s['rebuilt']:>8} {s['removed']:>8} {s['seconds']:>9.2f}")
+    print("(clean, geocode and analyze run in parallel, so their times overlap)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Incremental data pipeline: ingest, clean, geocode, analyze, publish.")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--artifact', default=None, help="Analysis artifact to write (default: the engine's path in ai_engine.ARTIFACT_PATHS).")
+    parser.add_argument('--engine', default='tfidf', choices=['spacy', 'tfidf'], help="Summary engine of the analyze stage (see batch_analyzer.py).")
+    parser.add_argument('--full', action='store_true', help="Forget every stored output and rebuild everything.")
+    args = parser.parse_args()
+
+    state = PipelineState(args.state)
+    if args.full:
+        state.clear()
+    start = time.perf_counter()
+    stats = run_pipeline(state, args.output, args.artifact, args.engine)
+    print_report(stats, time.perf_counter() - start)
+    print(f"Published to {args.output} and {args.artifact or ARTIFACT_PATHS[args.engine]}")
@@ -0,0 +1,86 @@
+from functools import lru_cache
+import numpy as np
+
+SCAN_BLOCK = 1024
+QUERY_CACHE_SIZE = 256
+
+
+class RankingIndex:
+    """
+    Top Suggestions query engine, built once per data load.
+    Rows are pre-sorted by Gem Score and every restaurant's vibes are packed into a uint64 bitmask,
+    so "top K with rating >= r, reviews >= n and vibes A and B" is a blockwise scan that stops as soon
+    as K matches are found instead of a filter + full sort on every slider move.
+    """
+
+    def __init__(self, df, vibes_col=None, vibe_names=None, score_col='Gem_Score'):
+        self.order = np.argsort(-df[score_col].to_numpy(dtype=float), kind='stable')
+        self.size = len(self.order)
+        self.rating = df['Rating'].to_numpy(dtype=float)[self.order]
+        self.reviews = df['Reviews'].to_numpy(dtype=float)[self.order]
+        if 'Has_AI_Analysis' in df.columns:
+            self.has_ai = df['Has_AI_Analysis'].to_numpy(dtype=bool)[self.order]
+        else:
+            self.has_ai = np.zeros(self.size, dtype=bool)
+
+        vibe_lists = df[vibes_col].tolist() if vibes_col else [()] * self.size
+        if vibe_names is None:
+            vibe_names = list(dict.fromkeys(vibe for vibes in vibe_lists for vibe in vibes))
+        if len(vibe_names) > 64:
+            raise ValueError("RankingIndex supports at most 64 vibe categories")
+        self.vibe_names = list(vibe_names)
+        self._vibe_bit = {vibe: np.uint64(1) << np.uint64(i) for i, vibe in enumerate(self.vibe_names)}
+
+        vibe_bits = np.zeros(self.size, dtype=np.uint64)
+        for row, vibes in enumerate(vibe_lists):
+            for vibe in vibes:
+                vibe_bits[row] |= self._vibe_bit.get(vibe, np.uint64(0))
+        self.vibe_bits = vibe_bits[self.order]
+
+        self._cached_top_k = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._top_k)
+
+    def required_bits(self, vibes):
+        """Bitmask for a set of vibe names; unknown vibes can never be satisfied."""
+        bits = np.uint64(0)
+        for vibe in vibes:
+            if vibe not in self._vibe_bit:
+                return None
+            bits |= self._vibe_bit[vibe]
+        return bits
+
+    def _top_k(self, k, min_rating, min_reviews, vibes, prioritize_ai):
+        required = self.required_bits(vibes)
+        if required is None or k <= 0:
+            return ()
+
+        tiers = [self.has_ai, ~self.has_ai] if prioritize_ai else [None]
+        found = []
+        for tier in tiers:
+            for start in range(0, self.size, SCAN_BLOCK):
+                block = slice(start, start + SCAN_BLOCK)
+                ok = (self.rating[block] >= min_rating) & (self.reviews[block] >= min_reviews)
+                if required:
+                    ok &= (self.vibe_bits[block] & required) == required
+                if tier is not None:
+                    ok &= tier[block]
+                hits = np.flatnonzero(ok)[:k - len(found)] + start
+                found.extend(self.order[hits].tolist())
+                if len(found) >= k:
+                    return tuple(found)
+        return tuple(found)
+
+    def top_k(self, k, min_rating=0.0, min_reviews=0, vibes=(), prioritize_ai=False):
+        """
+        Row positions (into the DataFrame the index was built from) of the best K restaurants by
+        Gem Score that pass the filters. Results are memoized per filter tuple.
+        With prioritize_ai, restaurants with review data come first, like the old two-key sort.
+        """
+        return self._cached_top_k(int(k), float(min_rating), float(min_reviews), tuple(sorted(vibes)), bool(prioritize_ai))
+
+    def cache_info(self):
+        return self._cached_top_k.cache_info()
+
+
+def top_suggestions(df, index, k, min_rating=0.0, min_reviews=0, vibes=(), prioritize_ai=False):
+    """The rows of `df` for RankingIndex.top_k(), in rank order."""
+    return df.iloc[list(index.top_k(k, min_rating, min_reviews, vibes, prioritize_ai))]
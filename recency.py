@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Approximate length of each Google "N units ago" unit, in days
+AGE_UNIT_DAYS = {"minute": 1 / 1440, "hour": 1 / 24, "day": 1.0, "week": 7.0, "month": 30.44, "year": 365.25}
+
+# Review-age histogram bins: <1 month, 1-3 months, 3-6 months, 6-12 months, 1-2 years, 2+ years
+AGE_BIN_EDGES_DAYS = np.array([30, 90, 180, 365, 730])
+AGE_BIN_LABELS = ["<1m", "1-3m", "3-6m", "6-12m", "1-2y", "2y+"]
+# Age each bin stands for when decaying it (the open-ended 2y+ bin counts as three years)
+AGE_BIN_DAYS = np.array([15, 60, 135, 272.5, 547.5, 1095])
+
+TRENDING_WINDOW_DAYS = 90  # Must be one of AGE_BIN_EDGES_DAYS
+TRENDING_BINS = int(np.searchsorted(AGE_BIN_EDGES_DAYS, TRENDING_WINDOW_DAYS)) + 1
+DECAY_HALF_LIFE_DAYS = 365
+
+# Age_Text as extracted by review_parser ("2 months ago", "a year ago")
+AGE_TEXT_PATTERN = r'^(a|an|\d+) (minute|hour|day|week|month|year)s? ago$'
+
+
+def age_text_days(age_texts):
+    """Approximate age in days of every Age_Text in one vectorized pass (NaN where there is none)."""
+    parts = pd.Series(age_texts, dtype=object).str.extract(AGE_TEXT_PATTERN)
+    quantity = pd.to_numeric(parts[0].replace({"a": "1", "an": "1"}))
+    return (quantity * parts[1].map(AGE_UNIT_DAYS)).to_numpy(dtype=float)
+
+def review_age_histogram(row_positions, age_days, n_rows):
+    """Review counts per (row, age bin) in one bincount pass, shape (n_rows, len(AGE_BIN_LABELS))."""
+    n_bins = len(AGE_BIN_LABELS)
+    bin_idx = np.digitize(age_days, AGE_BIN_EDGES_DAYS)
+    flat = np.bincount(np.asarray(row_positions, dtype=np.int64) * n_bins + bin_idx, minlength=n_rows * n_bins)
+    return flat.reshape(n_rows, n_bins)
+
+def restaurant_age_histogram(text_hashes, reviews):
+    """
+    Review-age histogram of every restaurant, given each restaurant's review_text_hash and the per-review store
+    (Text_Hash, Age_Text). Restaurants without dated reviews get an empty row.
+    """
+    age_days = age_text_days(reviews['Age_Text'])
+    dated = ~np.isnan(age_days)
+    codes, hashes = pd.factorize(reviews['Text_Hash'][dated])
+    # One spare empty row at the end, for restaurants the store knows nothing about (get_indexer gives -1)
+    per_hash = review_age_histogram(codes, age_days[dated], len(hashes) + 1)
+    return per_hash[pd.Index(hashes).get_indexer(text_hashes)]
+
+def add_recency_scores(df, reviews, hash_col='Review_Hash', half_life_days=DECAY_HALF_LIFE_DAYS):
+    """
+    Adds recency-aware scores derived from each restaurant's review-age histogram (see restaurant_age_histogram):
+      Sampled_Reviews   - number of dated reviews we actually scraped
+      Recency_Weight    - mean exp-decay weight of those reviews (1.0 = all brand new)
+      Recent_Gem_Score  - Gem Score with the review count discounted by Recency_Weight
+      Trending_Score    - share of reviews from the last TRENDING_WINDOW_DAYS, scaled by popularity
+    Restaurants without dated reviews get the median Recency_Weight so they are neither rewarded nor punished.
+    """
+    histogram = restaurant_age_histogram(df[hash_col], reviews)
+    n_rows = len(df)
+
+    sampled = histogram.sum(axis=1)
+    decay_sum = histogram @ np.exp(-np.log(2) * AGE_BIN_DAYS / half_life_days)
+    recent = histogram[:, :TRENDING_BINS].sum(axis=1)
+
+    has_ages = sampled > 0
+    recency_weight = np.divide(decay_sum, sampled, out=np.zeros(n_rows), where=has_ages)
+    if has_ages.any():
+        recency_weight[~has_ages] = np.median(recency_weight[has_ages])
+    else:
+        recency_weight[:] = 1.0
+    recent_share = np.divide(recent, sampled, out=np.zeros(n_rows), where=has_ages)
+
+    reviews_count = df['Reviews'].to_numpy(dtype=float)
+    df['Sampled_Reviews'] = sampled
+    df['Recency_Weight'] = recency_weight
+    df['Recent_Gem_Score'] = df['Rating'].to_numpy(dtype=float) * np.log1p(reviews_count * recency_weight)
+    df['Trending_Score'] = recent_share * np.log1p(reviews_count)
+    return df
@@ -0,0 +1,283 @@
+import argparse
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from crawl_state import record_key
+from gazetteer import FRAGMENT_PATTERN, PINCODE_PATTERN, PLUS_CODE_PATTERN
+from search_index import address_localities
+
+# Restaurant CSVs, most trusted first: a field is taken from the first source that has it
+SOURCES = ['download.csv', 'silchar_restaurants_FINAL_RICH_DETAILS.csv', 'silchar_restaurants_ALL_DATA.csv',
+           'downloadrev.csv', 'gg_last.csv']
+MASTER_COLUMNS = ['Name', 'Rating', 'Reviews', 'Info', 'Address', 'Price', 'Phone', 'Services', 'Reviews_Text']
+DEFAULT_MASTER_PATH = 'restaurants_master.csv'
+DEFAULT_REGISTRY_PATH = 'restaurant_id_registry.csv'
+
+# Words that say what kind of place it is, not which one
+GENERIC_NAME_TOKENS = {'the', 'and', 'a', 'restaurant', 'restaurants', 'silchar', 'pvt', 'ltd', 'family'}
+MISSING_VALUES = {"", "Not found"}
+MAX_BLOCK_SIZE = 100
+MATCH_THRESHOLD = 0.75
+# Same-name rows at one address score >= 0.9 on the scraped data; other branches of a chain score 0.3-0.45
+MIN_ADDRESS_SIMILARITY = 0.6
+NAME_WEIGHT, ADDRESS_WEIGHT = 0.75, 0.25
+# Something only an address has: a Silchar PIN code, the city or state, or (via gazetteer) a plus code or a road/landmark word
+ADDRESS_MARKER_PATTERN = re.compile(r"\b7880\d\d\b|\b(?:silchar|assam)\b", re.IGNORECASE)
+# Same name once generic words are dropped: a strong match, but an identical spelling wins a tie
+NORMALIZED_NAME_SIMILARITY = 0.95
+
+
+def normalize_name(name):
+    """Accent-free, lowercase name without punctuation or generic words: "The Godfather Restaurant!" -> "godfather"."""
+    if not isinstance(name, str):
+        return ""
+    text = unicodedata.normalize('NFKD', name).casefold().replace('&', ' and ')
+    tokens = re.findall(r"\w+", text)
+    kept = [token for token in tokens if token not in GENERIC_NAME_TOKENS]
+    return " ".join(kept or tokens)
+
+def is_real_address(address):
+    """
+    Scraped Address columns sometimes hold badges ('Veg-only', "Great food, cozy ambiance, and friendly service.")
+    instead of an address, so the text must be comma-separated and carry an address marker.
+    """
+    if not isinstance(address, str) or address in MISSING_VALUES or ',' not in address:
+        return False
+    return bool(ADDRESS_MARKER_PATTERN.search(address) or PLUS_CODE_PATTERN.search(address) or FRAGMENT_PATTERN.search(address))
+
+def ngrams(text, n=3):
+    padded = f" {text} "
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+def jaccard(a, b):
+    if not (a and b):
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class RecordLinker:
+    """
+    Finds which rows of a combined restaurant table are the same place. Rows are only compared when they
+    share a blocking key (a name-token prefix, or PIN code / locality plus the name's first letter), so the
+    work grows with the block sizes instead of n^2. Candidate pairs are scored on name and address
+    similarity, and matches are merged into clusters with union-find, best pairs first.
+    """
+
+    def __init__(self, names, addresses):
+        self.size = len(names)
+        self.raw_names = [" ".join(name.split()).casefold() if isinstance(name, str) else "" for name in names]
+        self.names = [normalize_name(name) for name in names]
+        self.has_address = [is_real_address(address) for address in addresses]
+        self.name_grams = [ngrams(name) for name in self.names]
+        self.address_grams = [ngrams(" ".join(re.findall(r"\w+", address.casefold()))) if real else frozenset()
+                              for address, real in zip(addresses, self.has_address)]
+        self.pincodes = [(PINCODE_PATTERN.search(address) or [None])[0] if real else None
+                         for address, real in zip(addresses, self.has_address)]
+        self.blocks = defaultdict(list)
+        for i, address in enumerate(addresses):
+            for key in self.blocking_keys(i, address):
+                self.blocks[key].append(i)
+
+    def blocking_keys(self, i, address):
+        name = self.names[i]
+        keys = {f"token:{token[:4]}" for token in name.split() if len(token) >= 3}
+        if name:
+            if self.pincodes[i]:
+                keys.add(f"pin:{self.pincodes[i]}:{name[0]}")
+            if self.has_address[i]:
+                keys.update(f"locality:{locality.casefold()}:{name[0]}" for locality in address_localities(address))
+        return keys or {f"name:{name}"}
+
+    def candidate_pairs(self):
+        """Every pair of rows that share at least one block. Blocks over MAX_BLOCK_SIZE are skipped as too generic."""
+        pairs = set()
+        for members in self.blocks.values():
+            if 1 < len(members) <= MAX_BLOCK_SIZE:
+                pairs.update((a, b) for k, a in enumerate(members) for b in members[k + 1:])
+        return pairs
+
+    def address_conflict(self, i, j):
+        """True when both rows have real addresses that clearly differ (another branch, another PIN code)."""
+        if not (self.has_address[i] and self.has_address[j]):
+            return False
+        if self.pincodes[i] and self.pincodes[j] and self.pincodes[i] != self.pincodes[j]:
+            return True
+        return jaccard(self.address_grams[i], self.address_grams[j]) < MIN_ADDRESS_SIMILARITY
+
+    def score(self, i, j):
+        """Match score in [0, 1]: name similarity, blended with address similarity when both rows have one."""
+        if self.raw_names[i] == self.raw_names[j]:
+            name_similarity = 1.0
+        elif self.names[i] == self.names[j]:
+            name_similarity = NORMALIZED_NAME_SIMILARITY
+        else:
+            name_similarity = jaccard(self.name_grams[i], self.name_grams[j])
+        if not (self.has_address[i] and self.has_address[j]):
+            return name_similarity
+        if self.address_conflict(i, j):
+            return 0.0
+        return NAME_WEIGHT * name_similarity + ADDRESS_WEIGHT * jaccard(self.address_grams[i], self.address_grams[j])
+
+    def clusters(self, threshold=MATCH_THRESHOLD):
+        """
+        (cluster label per row, number of candidate pairs scored, number of matching pairs). Two clusters are
+        never joined if that would put conflicting addresses together, so a row without an address (a review
+        dump) cannot chain two branches of a chain into one restaurant.
+        """
+        parent = list(range(self.size))
+        addressed = {i: [i] for i in range(self.size) if self.has_address[i]}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        pairs = self.candidate_pairs()
+        scored = sorted(((score, i, j) for i, j in pairs if (score := self.score(i, j)) >= threshold), reverse=True)
+        for _, i, j in scored:
+            a, b = find(i), find(j)
+            if a == b or any(self.address_conflict(x, y) for x in addressed.get(a, ()) for y in addressed.get(b, ())):
+                continue
+            parent[a] = b
+            if a in addressed:
+                addressed.setdefault(b, []).extend(addressed.pop(a))
+        return np.array([find(i) for i in range(self.size)]), len(pairs), len(scored)
+
+
+# --- STABLE IDS ---
+def load_registry(path=DEFAULT_REGISTRY_PATH):
+    """record key -> restaurant ID from earlier runs."""
+    if not os.path.exists(path):
+        return {}
+    registry = pd.read_csv(path)
+    return dict(zip(registry['record_key'], registry['restaurant_id']))
+
+def save_registry(registry, path=DEFAULT_REGISTRY_PATH):
+    tmp_path = f"{path}.tmp"
+    pd.DataFrame(sorted(registry.items()), columns=['record_key', 'restaurant_id']).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def assign_ids(keys, labels, registry):
+    """
+    A restaurant ID per row. A cluster keeps the ID any of its rows had before (the smallest, if two
+    known restaurants turned out to be one); a new cluster gets a hash of its first row's key.
+    The registry is updated in place, so IDs survive reruns, new crawls and source reordering.
+    """
+    members = defaultdict(list)
+    for row, label in enumerate(labels):
+        members[label].append(row)
+    taken = set(registry.values())
+    assigned = set()
+    ids = [None] * len(keys)
+    for rows in members.values():
+        # A restaurant that split in two keeps its ID on the first part; the other part gets a new one
+        known = sorted({registry[keys[row]] for row in rows if keys[row] in registry} - assigned)
+        if known:
+            restaurant_id = known[0]
+        else:
+            restaurant_id = base_id = f"R{hashlib.sha1(keys[rows[0]].encode('utf-8')).hexdigest()[:10]}"
+            collisions = 0
+            while restaurant_id in taken:
+                collisions += 1
+                restaurant_id = f"{base_id}-{collisions}"
+        taken.add(restaurant_id)
+        assigned.add(restaurant_id)
+        for row in rows:
+            ids[row] = restaurant_id
+            registry[keys[row]] = restaurant_id
+    return ids
+
+
+# --- CONSOLIDATION ---
+def load_sources(paths=SOURCES):
+    """One table of every source's rows, tagged with Source and Source_Rank (0 = most trusted)."""
+    frames = []
+    for rank, path in enumerate(paths):
+        if os.path.exists(path):
+            frames.append(pd.read_csv(path, dtype=str).assign(Source=path, Source_Rank=rank))
+    records = pd.concat(frames, ignore_index=True).dropna(subset=['Name'])
+    return records.reindex(columns=MASTER_COLUMNS + ['Source', 'Source_Rank']).reset_index(drop=True)
+
+def build_master(records, registry, threshold=MATCH_THRESHOLD):
+    """(one row per restaurant with a stable restaurant_id, linkage stats). Each field comes from the most trusted source that has it."""
+    linker = RecordLinker(records['Name'].tolist(), records['Address'].tolist())
+    labels, pairs, matches = linker.clusters(threshold)
+    addresses = records['Address'].where([linker.has_address[i] for i in range(len(records))], "")
+    keys = [record_key(name, address) for name, address in zip(records['Name'], addresses)]
+    records = records.assign(restaurant_id=assign_ids(keys, labels, registry),
+                             Address=records['Address'].where(addresses != "", np.nan))
+    records = records.replace(list(MISSING_VALUES), np.nan).sort_values(['restaurant_id', 'Source_Rank'], kind='stable')
+    grouped = records.groupby('restaurant_id', sort=False)
+    master = grouped[MASTER_COLUMNS].first()
+    master['Sources'] = grouped['Source'].agg(lambda sources: "|".join(dict.fromkeys(sources)))
+    master = master.sort_values('Name', key=lambda names: names.str.casefold()).reset_index()
+    stats = {"records": len(records), "restaurants": len(master), "candidate_pairs": pairs, "matches": matches,
+             "all_pairs": len(records) * (len(records) - 1) // 2}
+    return master, stats
+
+def link_columns(left, right, columns, threshold=MATCH_THRESHOLD):
+    """
+    `left` with `columns` of the `right` row that is the same restaurant, matched by record linkage instead of
+    an exact Name join (so "Cafe 21" still finds "Cafe 21 Restaurant"). Missing matches are left as NaN.
+    """
+    right_address = right['Address'] if 'Address' in right.columns else pd.Series("", index=right.index)
+    linker = RecordLinker(left['Name'].tolist() + right['Name'].tolist(), left['Address'].tolist() + right_address.tolist())
+    labels, _, _ = linker.clusters(threshold)
+    first_right = {}
+    for row, label in enumerate(labels[len(left):]):
+        first_right.setdefault(label, row)
+    rows = [first_right.get(label) for label in labels[:len(left)]]
+    linked = right[columns].reset_index(drop=True).reindex([np.nan if row is None else row for row in rows])
+    return left.assign(**{column: linked[column].to_numpy() for column in columns})
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Consolidate every restaurant CSV into one master table with stable IDs.")
+    parser.add_argument('--output', default=DEFAULT_MASTER_PATH)
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_PATH)
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD)
+    parser.add_argument('--benchmark-scale', type=int, default=0, help="Also time linkage on the sources repeated N times with perturbed names.")
+    args = parser.parse_args()
+
+    records = load_sources()
+    registry = load_registry(args.registry)
+    known = len(registry)
+    start = time.perf_counter()
+    master, stats = build_master(records, registry, args.threshold)
+    elapsed = time.perf_counter() - start
+    save_registry(registry, args.registry)
+    master.to_csv(args.output, index=False)
+    print(f"{stats['records']} source rows -> {stats['restaurants']} restaurants in {elapsed * 1000:.0f} ms "
+          f"({stats['candidate_pairs']:,} of {stats['all_pairs']:,} pairs compared, {stats['matches']} matches)")
+    exact = set(records.loc[records['Source'] == 'download.csv', 'Name'])
+    reviewed = master.dropna(subset=['Reviews_Text', 'Rating'])
+    print(f"{len(reviewed)} restaurants have both ratings and review text ({len(set(reviewed['Name']) & exact)} by exact name)")
+    print(f"{len(registry) - known} new record keys registered. Saved to {args.output}")
+
+    if args.benchmark_scale:
+        rng = np.random.default_rng(0)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        copies = [records]
+        for copy in range(1, args.benchmark_scale):
+            # Each copy adds other restaurants on the same streets: every distinctive name word is letter-substituted
+            # (generic words are kept, so each copy links exactly like the original) and the addresses are unchanged
+            cipher = str.maketrans(letters + letters.upper(), "".join(rng.permutation(list(letters))) * 2)
+            names = records['Name'].str.replace(r"\w+", lambda m: m.group(0) if m.group(0).casefold() in GENERIC_NAME_TOKENS
+                                                else m.group(0).translate(cipher), regex=True)
+            copies.append(records.assign(Name=names))
+        big = pd.concat(copies, ignore_index=True)
+        start = time.perf_counter()
+        labels, pairs, _ = RecordLinker(big['Name'].tolist(), big['Address'].tolist()).clusters(args.threshold)
+        elapsed = time.perf_counter() - start
+        # Rows of different copies are different restaurants by construction, so any cluster spanning copies is a false merge
+        copy_of_row = np.repeat(np.arange(args.benchmark_scale), len(records))
+        spans = pd.Series(copy_of_row).groupby(labels).nunique()
+        print(f"Benchmark: {len(big):,} rows -> {spans.size:,} restaurants (expected {stats['restaurants'] * args.benchmark_scale:,}) "
+              f"in {elapsed:.2f}s ({pairs:,} of {len(big) * (len(big) - 1) // 2:,} pairs compared), "
+              f"{(spans > 1).sum()} clusters merge rows of different copies")
@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import os
+import re
+import time
+import pandas as pd
+
+# --- LINE PATTERNS FOR THE SCRAPED GOOGLE REVIEW DUMPS ---
+# Every review starts with:  Author / [Local Guide·]N reviews[·M photos] / [Edited ]<age> ago
+AGE_PATTERN = re.compile(r'^(Edited )?((?:a|an|\d+) (?:minute|hour|day|week|month|year)s? ago)$')
+STATS_PATTERN = re.compile(r'^(Local Guide)?(?:·)?(?:(\d[\d,]*) reviews?)?(?:·)?(?:(\d[\d,]*) photos?)?$')
+PRICE_PATTERN = re.compile(r'^₹([\d,]+)(?:–([\d,]+)|\+)$')
+VISIT_TYPES = {"Dine in", "Takeaway", "Take out", "Delivery"}
+MEAL_TYPES = {"Breakfast", "Brunch", "Lunch", "Dinner", "Other"}
+MORE_PATTERN = re.compile(r'\s*…?More$')
+LIKES_PATTERN = re.compile(r'^\d+$')
+# Some dumps hold one "Author: body" line per review instead of the header blocks above
+AUTHOR_LINE_PATTERN = re.compile(r'^([^:\n]{1,60}?): (.+)$')
+
+DEFAULT_STORE_PATH = 'reviews_store.parquet'
+STORE_VERSION = 2  # Bump whenever parse_review_blob() changes what it extracts, so stale stores are rebuilt
+INT_COLUMNS = ['Author_Reviews', 'Author_Photos', 'Price_Min', 'Price_Max']
+REVIEW_COLUMNS = [
+    'Restaurant', 'Text_Hash', 'Review_Index', 'Author', 'Is_Local_Guide', 'Author_Reviews',
+    'Author_Photos', 'Age_Text', 'Is_Edited', 'Visit_Type', 'Meal_Type', 'Price_Min', 'Price_Max',
+    'Body', 'Is_Truncated'
+]
+
+
+def review_text_hash(review_text):
+    """Stable fingerprint of a raw review blob, used to key everything derived from it."""
+    return hashlib.sha1(review_text.encode('utf-8')).hexdigest()
+
+def _to_int(value):
+    return int(value.replace(',', '')) if value else None
+
+def _parse_meta_line(line, record):
+    """Fills visit type, meal type and price band from a 'Dine in  |  Lunch  |  ₹200–400' line.
+    Returns False if the line is not a meta line."""
+    parts = [part.strip() for part in line.split('|')]
+    parsed = {}
+    for part in parts:
+        price = PRICE_PATTERN.match(part)
+        if part in VISIT_TYPES: parsed['Visit_Type'] = part
+        elif part in MEAL_TYPES: parsed['Meal_Type'] = part
+        elif price:
+            parsed['Price_Min'] = _to_int(price.group(1))
+            parsed['Price_Max'] = _to_int(price.group(2))
+        else:
+            return False
+    record.update(parsed)
+    return True
+
+def _plain_review(author, body, index):
+    """A review record with only an author and a body, for dumps without review headers."""
+    truncated = bool(MORE_PATTERN.search(body))
+    return {
+        'Author': author, 'Is_Local_Guide': False, 'Author_Reviews': None, 'Author_Photos': None,
+        'Age_Text': None, 'Is_Edited': False,
+        'Visit_Type': None, 'Meal_Type': None, 'Price_Min': None, 'Price_Max': None,
+        'Body': MORE_PATTERN.sub('', body).strip(), 'Is_Truncated': truncated, 'Review_Index': index,
+    }
+
+def _parse_author_lines(lines):
+    """
+    Reviews of a dump in the "Author: body" format, one line per review; lines without an author continue
+    the previous review. A dump in neither format becomes a single review without an author.
+    """
+    reviews = []
+    for line in lines:
+        if not line:
+            continue
+        match = AUTHOR_LINE_PATTERN.match(line)
+        if match:
+            reviews.append([match.group(1), match.group(2)])
+        elif reviews:
+            reviews[-1][1] += '\n' + line
+    if not reviews:
+        reviews = [[None, '\n'.join(line for line in lines if line)]]
+    return [_plain_review(author, body, i) for i, (author, body) in enumerate(reviews)]
+
+def parse_review_blob(review_text):
+    """
+    Splits one raw Reviews_Text dump into per-review dicts.
+    Owner responses and stray fragments before the first review header are dropped.
+    Dumps without any review header are read as "Author: body" lines (see _parse_author_lines).
+    """
+    if not isinstance(review_text, str) or not review_text.strip():
+        return []
+    lines = [line.strip() for line in review_text.split('\n')]
+
+    # Locate review headers by their age line; the stats line above it is optional
+    headers = []
+    for i, line in enumerate(lines):
+        age = AGE_PATTERN.match(line)
+        if not age or i == 0:
+            continue
+        stats = STATS_PATTERN.match(lines[i - 1]) if lines[i - 1] else None
+        author_idx = i - 2 if stats and i >= 2 else i - 1
+        if not lines[author_idx]:
+            continue
+        headers.append((author_idx, i, stats if author_idx == i - 2 else None, age))
+    if not headers:
+        return _parse_author_lines(lines)
+
+    reviews = []
+    for h, (author_idx, age_idx, stats, age) in enumerate(headers):
+        author = lines[author_idx]
+        if author.endswith('(owner)'):
+            continue
+        end_idx = headers[h + 1][0] if h + 1 < len(headers) else len(lines)
+        record = {
+            'Author': author,
+            'Is_Local_Guide': bool(stats and stats.group(1)),
+            'Author_Reviews': _to_int(stats.group(2)) if stats else None,
+            'Author_Photos': _to_int(stats.group(3)) if stats else None,
+            'Age_Text': age.group(2),
+            'Is_Edited': bool(age.group(1)),
+            'Visit_Type': None, 'Meal_Type': None, 'Price_Min': None, 'Price_Max': None,
+        }
+
+        body_lines = [line for line in lines[age_idx + 1:end_idx] if line and line != 'NEW']
+        if body_lines and _parse_meta_line(body_lines[0], record):
+            body_lines = body_lines[1:]
+        if body_lines and LIKES_PATTERN.match(body_lines[-1]):
+            body_lines = body_lines[:-1]
+
+        body = '\n'.join(body_lines)
+        truncated = bool(MORE_PATTERN.search(body))
+        record['Body'] = MORE_PATTERN.sub('', body).strip()
+        record['Is_Truncated'] = truncated
+        record['Review_Index'] = len(reviews)
+        reviews.append(record)
+    return reviews
+
+def join_review_bodies(bodies):
+    """Joins the clean bodies of one restaurant's reviews into a single analysis text."""
+    return "\n".join(body for body in bodies if body)
+
+def review_bodies_text(review_text):
+    """The clean review bodies of a raw dump, without any reviewer or visit metadata."""
+    return join_review_bodies(record['Body'] for record in parse_review_blob(review_text))
+
+def iter_reviews(csv_path, chunksize=20):
+    """Streams a Name/Reviews_Text CSV in chunks and yields one record per review."""
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        for name, review_text in zip(chunk['Name'], chunk['Reviews_Text']):
+            if not isinstance(review_text, str):
+                continue
+            text_hash = review_text_hash(review_text)
+            for record in parse_review_blob(review_text):
+                record['Restaurant'] = name
+                record['Text_Hash'] = text_hash
+                yield record
+
+
+# --- COLUMNAR STORE ---
+def _review_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('Restaurant', pa.string()), ('Text_Hash', pa.string()), ('Review_Index', pa.int32()),
+        ('Author', pa.string()), ('Is_Local_Guide', pa.bool_()), ('Author_Reviews', pa.int32()),
+        ('Author_Photos', pa.int32()), ('Age_Text', pa.string()), ('Is_Edited', pa.bool_()),
+        ('Visit_Type', pa.string()), ('Meal_Type', pa.string()), ('Price_Min', pa.int32()),
+        ('Price_Max', pa.int32()), ('Body', pa.string()), ('Is_Truncated', pa.bool_()),
+    ])
+
+def write_review_store(records, output_path, batch_size=2000):
+    """Writes review records to a typed Parquet file, one row group per `batch_size` reviews."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _review_schema().with_metadata({'store_version': str(STORE_VERSION)})
+    total = 0
+    batch = []
+    with pq.ParquetWriter(output_path, schema, compression='zstd') as writer:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                total += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            total += len(batch)
+    return total
+
+def load_review_store(path, columns=None):
+    """Loads the per-review store (or a subset of its columns) as a DataFrame."""
+    df = pd.read_parquet(path, columns=columns)
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('Int32')
+    return df
+
+def review_bodies_by_hash(reviews):
+    """{Text_Hash: clean analysis text} from per-review records with Text_Hash, Review_Index and Body."""
+    reviews = reviews.sort_values(['Text_Hash', 'Review_Index'])
+    return {text_hash: join_review_bodies(bodies) for text_hash, bodies in reviews.groupby('Text_Hash', sort=False)['Body']}
+
+def _store_is_current(store_path, source_path):
+    """True if the store exists, is newer than its source CSV and was written by this parser version."""
+    import pyarrow.parquet as pq
+    if not os.path.exists(store_path) or os.path.getmtime(store_path) < os.path.getmtime(source_path):
+        return False
+    metadata = pq.read_schema(store_path).metadata or {}
+    return metadata.get(b'store_version') == str(STORE_VERSION).encode()
+
+def load_current_store(source_path='downloadrev.csv', store_path=DEFAULT_STORE_PATH, columns=None):
+    """
+    The per-review store of `source_path` (or a subset of its columns), rebuilt first if it is missing,
+    older than the source CSV or written by an older parser.
+    """
+    if not _store_is_current(store_path, source_path):
+        tmp_path = f"{store_path}.tmp"
+        try:
+            write_review_store(iter_reviews(source_path), tmp_path)
+            os.replace(tmp_path, store_path)
+        except OSError:
+            # Read-only deployments parse in memory instead
+            df = pd.DataFrame(list(iter_reviews(source_path)), columns=REVIEW_COLUMNS)
+            return df[columns] if columns else df
+    return load_review_store(store_path, columns)
+
+def load_review_bodies(source_path='downloadrev.csv', store_path=DEFAULT_STORE_PATH):
+    """Clean review text of every raw dump in `source_path`, keyed by review_text_hash; empty dumps are absent."""
+    return review_bodies_by_hash(load_current_store(source_path, store_path, ['Text_Hash', 'Review_Index', 'Body']))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parse scraped review dumps into a per-review Parquet store.")
+    parser.add_argument('--input', default='downloadrev.csv', help="CSV with Name and Reviews_Text columns.")
+    parser.add_argument('--output', default=DEFAULT_STORE_PATH)
+    parser.add_argument('--chunksize', type=int, default=20, help="Restaurants read from the CSV per chunk.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = write_review_store(iter_reviews(args.input, args.chunksize), args.output)
+    print(f"Parsed {total} reviews from '{args.input}' into '{args.output}' in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,266 @@
+import argparse
+import html
+import os
+import re
+import time
+from collections import Counter
+import numpy as np
+from review_parser import iter_reviews
+
+DEFAULT_INDEX_PATH = 'reviews_bm25.npz'
+INDEX_FORMAT_VERSION = 3
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9]+")
+STOP_WORDS = {
+    "a", "also", "always", "an", "and", "are", "as", "at", "be", "been", "but", "by", "does", "for", "from",
+    "had", "has", "have", "i", "in", "is", "it", "its", "just", "me", "my", "of", "on", "or", "so", "that",
+    "the", "their", "there", "they", "this", "to", "too", "very", "was", "we", "were", "with", "you", "your",
+}
+BM25_K1, BM25_B = 1.2, 0.75
+SNIPPET_WORDS = 30
+
+
+def normalize_term(word):
+    """Lowercases and strips a plural 's' so 'Momos' and 'momo' index to the same term."""
+    word = word.lower()
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+def analyze(text):
+    """Search terms of a text: words minus stop words, then normalized (so 'this' is dropped, not indexed as 'thi')."""
+    return [normalize_term(word) for word in (w.lower() for w in WORD_PATTERN.findall(text)) if word not in STOP_WORDS]
+
+def pack_strings(strings):
+    """Strings as one UTF-8 byte array plus offsets, so a few long entries don't pad every slot like a '<U' array."""
+    encoded = [string.encode('utf-8') for string in strings]
+    return (np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            np.concatenate([[0], np.cumsum([len(b) for b in encoded], dtype=np.int64)]).astype(np.int64))
+
+def unpack_strings(data, offsets):
+    raw = data.tobytes()
+    return [raw[start:end].decode('utf-8') for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+class ReviewSearchIndex:
+    """
+    Compact BM25 inverted index over individual review bodies, stored as flat NumPy arrays
+    (CSR-style postings, strings as byte + offset arrays), and aggregated to restaurants at query time.
+    """
+
+    def __init__(self, arrays, source_stamp=None):
+        self.terms = unpack_strings(arrays['term_bytes'], arrays['term_byte_offsets'])
+        self.term_offsets = arrays['term_offsets']
+        self.post_docs = arrays['post_docs']
+        self.post_tfs = arrays['post_tfs']
+        self.doc_lens = arrays['doc_lens']
+        self.doc_restaurant = arrays['doc_restaurant']
+        self.restaurant_names = unpack_strings(arrays['name_bytes'], arrays['name_offsets'])
+        self.body_bytes = arrays['body_bytes']
+        self.body_offsets = arrays['body_offsets']
+        self.source_stamp = source_stamp
+        self._term_id = {term: i for i, term in enumerate(self.terms)}
+        self.avg_doc_len = float(self.doc_lens.mean()) if len(self.doc_lens) else 0.0
+
+    # --- BUILD / SAVE / LOAD ---
+    @classmethod
+    def build(cls, reviews, source_stamp=None):
+        """Builds the index from an iterable of review records (Restaurant, Body), e.g. review_parser.iter_reviews."""
+        restaurant_ids, vocabulary = {}, {}
+        post_terms, post_docs, post_tfs = [], [], []
+        doc_lens, doc_restaurant, bodies = [], [], []
+
+        for doc, record in enumerate(reviews):
+            body = record['Body'] or ""
+            counts = Counter(analyze(body))
+            for term, tf in counts.items():
+                post_terms.append(vocabulary.setdefault(term, len(vocabulary)))
+                post_docs.append(doc)
+                post_tfs.append(tf)
+            doc_lens.append(sum(counts.values()))
+            doc_restaurant.append(restaurant_ids.setdefault(record['Restaurant'], len(restaurant_ids)))
+            bodies.append(body.encode('utf-8'))
+
+        # Re-number terms alphabetically and group postings by term (CSR layout)
+        terms = sorted(vocabulary)
+        remap = np.empty(len(vocabulary), dtype=np.int64)
+        for new_id, term in enumerate(terms):
+            remap[vocabulary[term]] = new_id
+        post_terms = remap[np.array(post_terms, dtype=np.int64)] if post_terms else np.array([], dtype=np.int64)
+        order = np.argsort(post_terms, kind='stable')
+
+        term_bytes, term_byte_offsets = pack_strings(terms)
+        name_bytes, name_offsets = pack_strings(restaurant_ids)
+        arrays = {
+            'term_bytes': term_bytes,
+            'term_byte_offsets': term_byte_offsets,
+            'term_offsets': np.concatenate([[0], np.cumsum(np.bincount(post_terms, minlength=len(terms)))]).astype(np.int64),
+            'post_docs': np.array(post_docs, dtype=np.int32)[order],
+            'post_tfs': np.minimum(np.array(post_tfs, dtype=np.int64), np.iinfo(np.uint16).max).astype(np.uint16)[order],
+            'doc_lens': np.array(doc_lens, dtype=np.int32),
+            'doc_restaurant': np.array(doc_restaurant, dtype=np.int32),
+            'name_bytes': name_bytes,
+            'name_offsets': name_offsets,
+            'body_bytes': np.frombuffer(b"".join(bodies), dtype=np.uint8),
+            'body_offsets': np.concatenate([[0], np.cumsum([len(b) for b in bodies])]).astype(np.int64),
+        }
+        return cls(arrays, source_stamp)
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        arrays = {name: getattr(self, name) for name in (
+            'term_offsets', 'post_docs', 'post_tfs', 'doc_lens', 'doc_restaurant', 'body_bytes', 'body_offsets')}
+        arrays['term_bytes'], arrays['term_byte_offsets'] = pack_strings(self.terms)
+        arrays['name_bytes'], arrays['name_offsets'] = pack_strings(self.restaurant_names)
+        meta = np.array([INDEX_FORMAT_VERSION, *(self.source_stamp or (0, 0))], dtype=np.int64)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, meta=meta, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        meta = arrays.pop('meta')
+        if int(meta[0]) != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported review index format {meta[0]}")
+        return cls(arrays, source_stamp=(int(meta[1]), int(meta[2])))
+
+    # --- QUERY ---
+    def review_body(self, doc):
+        start, end = self.body_offsets[doc], self.body_offsets[doc + 1]
+        return self.body_bytes[start:end].tobytes().decode('utf-8')
+
+    def score_reviews(self, query):
+        """BM25 score for every review that contains at least one query term, as (doc_ids, scores)."""
+        n_docs = len(self.doc_lens)
+        doc_ids, scores = [], []
+        for term in set(analyze(query)):
+            term_id = self._term_id.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.post_docs[start:end]
+            tfs = self.post_tfs[start:end].astype(np.float64)
+            df = end - start
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lens[docs] / self.avg_doc_len)
+            doc_ids.append(docs)
+            scores.append(idf * tfs * (BM25_K1 + 1) / (tfs + norm))
+        if not doc_ids:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.float64)
+
+        # Sum per-term scores for reviews that match several query terms
+        all_docs = np.concatenate(doc_ids)
+        unique_docs, inverse = np.unique(all_docs, return_inverse=True)
+        return unique_docs, np.bincount(inverse, weights=np.concatenate(scores))
+
+    def search(self, query, limit=10, snippets_per_restaurant=2):
+        """
+        Restaurants ranked by relevance: best review score, boosted by how many reviews match.
+        Returns dicts with Name, Score, Matching_Reviews and highlighted HTML Snippets.
+        """
+        doc_ids, scores = self.score_reviews(query)
+        if not len(doc_ids):
+            return []
+        restaurants = self.doc_restaurant[doc_ids]
+
+        # Sort reviews by (restaurant, score desc) so each restaurant's best reviews come first
+        order = np.lexsort((-scores, restaurants))
+        restaurants, doc_ids, scores = restaurants[order], doc_ids[order], scores[order]
+        starts = np.flatnonzero(np.r_[True, restaurants[1:] != restaurants[:-1]])
+        counts = np.diff(np.r_[starts, len(restaurants)])
+        best = scores[starts]
+        relevance = best * (1 + np.log1p(counts))
+
+        results = []
+        query_terms = set(analyze(query))
+        for group in np.argsort(-relevance, kind='stable')[:limit]:
+            start = starts[group]
+            top_docs = doc_ids[start:start + min(counts[group], snippets_per_restaurant)]
+            results.append({
+                "Name": self.restaurant_names[restaurants[start]],
+                "Score": float(relevance[group]),
+                "Matching_Reviews": int(counts[group]),
+                "Snippets": [highlight_snippet(self.review_body(doc), query_terms) for doc in top_docs],
+            })
+        return results
+
+
+def highlight_snippet(body, query_terms, window=SNIPPET_WORDS):
+    """HTML-escaped window of the review around its first query hit, with hits wrapped in <mark>."""
+    words = list(WORD_PATTERN.finditer(body))
+    hits = [i for i, m in enumerate(words) if normalize_term(m.group()) in query_terms]
+    if not hits:
+        return html.escape(body[:200])
+    first = max(0, hits[0] - window // 3)
+    last = min(len(words) - 1, first + window)
+    start, end = words[first].start(), words[last].end()
+
+    parts, cursor = [], start
+    for i in hits:
+        if first <= i <= last:
+            m = words[i]
+            parts.append(html.escape(body[cursor:m.start()]))
+            parts.append(f"<mark>{html.escape(m.group())}</mark>")
+            cursor = m.end()
+    parts.append(html.escape(body[cursor:end]))
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(body) else ""
+    return prefix + "".join(parts) + suffix
+
+
+# --- SOURCE TRACKING ---
+def source_stamp(path):
+    """(mtime_ns, size) of the source CSV, stored in the index to detect a stale build."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def load_or_build_index(source_path='downloadrev.csv', index_path=DEFAULT_INDEX_PATH):
+    """Loads the on-disk index, rebuilding (and saving) it only if the source CSV changed."""
+    stamp = source_stamp(source_path)
+    if os.path.exists(index_path):
+        try:
+            index = ReviewSearchIndex.load(index_path)
+            if index.source_stamp == stamp:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    index = ReviewSearchIndex.build(iter_reviews(source_path), source_stamp=stamp)
+    try:
+        index.save(index_path)
+    except OSError:
+        pass  # Read-only deployments still get the in-memory index
+    return index
+
+
+def run_benchmark(source_path, scale, queries):
+    records = list(iter_reviews(source_path))
+    scaled = ({**record, 'Restaurant': f"{record['Restaurant']} #{copy}"} for copy in range(scale) for record in records)
+    start = time.perf_counter()
+    index = ReviewSearchIndex.build(scaled)
+    print(f"Built index over {len(index.doc_lens):,} reviews ({scale}x) in {time.perf_counter() - start:.2f}s")
+    for query in queries:
+        start = time.perf_counter()
+        results = index.search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  '{query}': {len(results)} restaurants in {elapsed:.1f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build, query or benchmark the BM25 review search index.")
+    parser.add_argument('query', nargs='?', help="Query to run against the index.")
+    parser.add_argument('--input', default='downloadrev.csv')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH)
+    parser.add_argument('--benchmark-scale', type=int, default=None, help="Replicate the corpus N times and time queries.")
+    args = parser.parse_args()
+
+    if args.benchmark_scale:
+        run_benchmark(args.input, args.benchmark_scale, [args.query] if args.query else ["momos", "great ambience", "friendly staff good service"])
+    else:
+        start = time.perf_counter()
+        index = load_or_build_index(args.input, args.index)
+        print(f"Index ready: {len(index.doc_lens):,} reviews, {len(index.terms):,} terms ({time.perf_counter() - start:.2f}s)")
+        if args.query:
+            for rank, result in enumerate(index.search(args.query), 1):
+                print(f"\n#{rank}: {result['Name']} (score {result['Score']:.2f}, {result['Matching_Reviews']} matching reviews)")
+                for snippet in result['Snippets']:
+                    print(f"   > {snippet}")
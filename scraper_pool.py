@@ -0,0 +1,240 @@
+import argparse
+import html
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from webdriver_manager.chrome import ChromeDriverManager
+from crawl_state import CrawlState
+from gmaps_scraper import (BROWSER_PROFILE_DIR, RESULTS_PER_PAGE, SEARCH_QUERY, clean_results, create_driver, extract_results, is_captcha_page,
+                           local_results_url, pass_captcha, transferred_bytes)
+from step_timer import StepTimer
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+DEFAULT_QUERIES = [SEARCH_QUERY]
+FIXTURE_DIR = 'scraper_fixtures'
+
+class PageLoadError(Exception):
+    """A results page that could not be read (load timeout, CAPTCHA): unlike an empty page, it says nothing about the query's end."""
+
+
+def scrape_results_page(driver, wait, url, timer=None, bulk=True):
+    """
+    Every parsed result card on one results page; an empty list means the query has no more pages.
+    Raises PageLoadError when the page did not finish loading or is a CAPTCHA.
+    """
+    timer = timer or StepTimer()
+    with timer.step('navigate'):
+        driver.get(url)
+    # Result pages are rendered server-side, so once the document has loaded an empty list really is empty
+    try:
+        with timer.step('wait'):
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+    except TimeoutException:
+        raise PageLoadError("page did not finish loading")
+    if is_captcha_page(driver):
+        raise PageLoadError("CAPTCHA page")
+    with timer.step('extract'):
+        records = extract_results(driver, bulk)
+    page_bytes = transferred_bytes(driver)
+    if page_bytes is not None:
+        timer.record_bytes(page_bytes)
+    return records
+
+
+# --- WORKER POOL ---
+def run_worker(driver, tasks, results, exhausted, lock, base_url, timeout, state=None, timer=None, bulk=True):
+    """
+    Pulls (query, page) tasks until the queue is empty. Pages past a query's last page are skipped,
+    as are pages already checkpointed in `state` by an earlier run. A page that fails to load is neither
+    checkpointed nor taken as the query's end, so a rerun tries it again; only an empty page ends a query.
+    """
+    wait = WebDriverWait(driver, timeout)
+    worker = threading.current_thread().name
+    while True:
+        try:
+            query_rank, query, page = tasks.get_nowait()
+        except queue.Empty:
+            return
+        page_key = f"{query}#{page}"
+        if page > exhausted.get(query, float('inf')) or (state is not None and state.is_page_done(page_key)):
+            continue
+        try:
+            records = scrape_results_page(driver, wait, local_results_url(query, page, base_url), timer, bulk)
+        except Exception as e:
+            print(f"[{worker}] '{query}' page {page}: error, will retry on a rerun. Error: {e}")
+            continue
+        if state is not None:
+            state.complete_page(page_key, records)
+        with lock:
+            if not records:
+                exhausted[query] = min(exhausted.get(query, float('inf')), page)
+            for position, record in enumerate(records):
+                results.append({**record, "Query_Rank": query_rank, "Page": page, "Position": position})
+        print(f"[{worker}] '{query}' page {page}: {len(records)} results")
+
+def merge_results(records):
+    """Merges every worker's records, keeping the first sighting (by query, page, position) of each Name + Address."""
+    if not records:
+        return pd.DataFrame(columns=["Name", "Rating", "Reviews", "Address"]), 0
+    df = pd.DataFrame(records).sort_values(["Query_Rank", "Page", "Position"], kind='stable')
+    key = df["Name"].str.strip().str.casefold() + "|" + df["Address"].str.strip().str.casefold()
+    merged = df[~key.duplicated()].drop(columns=["Query_Rank", "Page", "Position"]).reset_index(drop=True)
+    return merged, len(df) - len(merged)
+
+def scrape_with_pool(queries, max_pages, workers, base_url=GOOGLE_SEARCH_URL, solve_captcha=True, timeout=10, state=None, timer=None, bulk=True, light=False):
+    """
+    Shards the (query, page) grid across `workers` Chrome instances and returns (merged DataFrame, duplicates removed).
+    Pages are handed out shallowest first, so a query's end is found before its deeper pages are tried.
+    With a CrawlState, finished pages are checkpointed and skipped on a rerun, and the result covers all runs.
+    All workers record their step latencies in the shared `timer`. `bulk` selects one JavaScript call per page for extraction.
+    `light` runs headless, asset-blocking browsers, each reusing its own profile directory across runs.
+    """
+    driver_path = ChromeDriverManager().install()
+    # Chrome locks a profile directory, so every worker keeps its own
+    profile_dirs = [os.path.join(BROWSER_PROFILE_DIR, f"worker-{i + 1}") if light else None for i in range(workers)]
+    drivers = [create_driver(driver_path, light, profile_dir) for profile_dir in profile_dirs]
+    try:
+        if solve_captcha and light:
+            # Headless workers only open a window if they are actually shown a CAPTCHA
+            for i, profile_dir in enumerate(profile_dirs):
+                drivers[i] = pass_captcha(drivers[i], local_results_url(queries[0], 1, base_url),
+                                          "Solve the CAPTCHA in the browser window, then press Enter...", driver_path, light, profile_dir)
+        elif solve_captcha:
+            for driver in drivers:
+                driver.get(local_results_url(queries[0], 1, base_url))
+            input(f"\nACTION REQUIRED: Solve any CAPTCHA in all {workers} browser windows, then press Enter...")
+
+        tasks = queue.Queue()
+        for page in range(1, max_pages + 1):
+            for query_rank, query in enumerate(queries):
+                tasks.put((query_rank, query, page))
+
+        results, exhausted, lock = [], {}, threading.Lock()
+        threads = [threading.Thread(target=run_worker, name=f"worker-{i + 1}",
+                                    args=(driver, tasks, results, exhausted, lock, base_url, timeout, state, timer, bulk))
+                   for i, driver in enumerate(drivers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        for driver in drivers:
+            driver.quit()
+    merged, duplicates = merge_results(results)
+    if state is not None:
+        merged = state.to_dataframe(["Name", "Rating", "Reviews", "Address"])
+    return merged, duplicates
+
+
+# --- OFFLINE FIXTURES: saved result pages served from a local HTTP server ---
+def render_fixture_page(records, next_start=None):
+    """A results page using the same markup (class names, 'pnnext' link) the scrapers look for."""
+    cards = "".join(
+        f'<div class="uMdZh"><div class="OSrXXb">{html.escape(str(r["Name"]))}</div>'
+        f'<span class="yi40Hd">{r["Rating"]}</span> <span class="RDApEe">({int(r["Reviews"])})</span>'
+        f'<div class="rllt__details"><div>Restaurant</div><div>{html.escape(r["Price"] if isinstance(r.get("Price"), str) and r["Price"] != "Not found" else "Open now")}</div>'
+        f'<div>{html.escape(str(r["Address"]))}</div></div></div>\n'
+        for r in records)
+    next_link = f'<a id="pnnext" href="/search?tbm=lcl&amp;start={next_start}">Next</a>' if next_start is not None else ""
+    return f"<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>Fixture results</title></head>\n<body>\n{cards}{next_link}\n</body></html>\n"
+
+def write_fixture_pages(df, directory=FIXTURE_DIR, pages=3, overlap=2):
+    """
+    Writes `pages` fixture result pages from a restaurant DataFrame plus the expected scrape output.
+    Each page repeats the last `overlap` results of the previous one, like Google does, to exercise deduplication.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = df.dropna(subset=['Name', 'Rating', 'Reviews', 'Address'])
+    rows = rows[rows['Address'] != "Not found"].head(pages * (RESULTS_PER_PAGE - overlap) + overlap)
+    records = rows.to_dict('records')
+    step = RESULTS_PER_PAGE - overlap
+    for page in range(pages):
+        chunk = records[page * step:page * step + RESULTS_PER_PAGE]
+        next_start = (page + 1) * RESULTS_PER_PAGE if page + 1 < pages else None
+        with open(os.path.join(directory, f"results_page_{page + 1}.html"), 'w', encoding='utf-8') as f:
+            f.write(render_fixture_page(chunk, next_start))
+    rows[['Name', 'Address']].to_csv(os.path.join(directory, 'expected.csv'), index=False)
+    print(f"Wrote {pages} fixture pages ({len(rows)} unique restaurants) to '{directory}'")
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves results_page_N.html for ?start=(N-1)*20, and an empty results page past the last fixture."""
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params.get('start', ['0'])[0]) // RESULTS_PER_PAGE + 1
+        path = os.path.join(self.server.fixture_dir, f"results_page_{page}.html")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                body = f.read()
+        else:
+            body = render_fixture_page([]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixtures(directory=FIXTURE_DIR, port=0):
+    """Starts the fixture server on a background thread; returns (server, base_url). Call server.shutdown() when done."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureRequestHandler)
+    server.fixture_dir = directory
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/search"
+
+def check_against_fixtures(merged, directory=FIXTURE_DIR):
+    """Compares a scrape of the fixtures with expected.csv. Returns True if every restaurant was found exactly once."""
+    expected = pd.read_csv(os.path.join(directory, 'expected.csv'))
+    expected_keys = set(zip(expected['Name'], expected['Address']))
+    scraped_keys = list(zip(merged['Name'], merged['Address']))
+    missing = expected_keys - set(scraped_keys)
+    unexpected = set(scraped_keys) - expected_keys
+    duplicates = len(scraped_keys) - len(set(scraped_keys))
+    print(f"Expected {len(expected_keys)}, scraped {len(scraped_keys)}: {len(missing)} missing, {len(unexpected)} unexpected, {duplicates} duplicated")
+    return not (missing or unexpected or duplicates)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scrape Google local results with several browsers in parallel.")
+    parser.add_argument('--queries', nargs='+', default=DEFAULT_QUERIES, help="Search queries, e.g. one per neighbourhood.")
+    parser.add_argument('--pages', type=int, default=10, help="Maximum result pages per query.")
+    parser.add_argument('--workers', type=int, default=3, help="Number of Chrome instances.")
+    parser.add_argument('--output', default='silchar_restaurants_ALL_DATA.csv')
+    parser.add_argument('--fixtures', action='store_true', help=f"Scrape the saved pages in '{FIXTURE_DIR}' from a local server instead of Google.")
+    parser.add_argument('--fresh', action='store_true', help="Forget the saved crawl progress instead of resuming it.")
+    parser.add_argument('--per-element', action='store_true', help="Read each card field with its own WebDriver call instead of one JavaScript call per page.")
+    parser.add_argument('--light', action='store_true', help="Headless browsers that block images, fonts, media and trackers.")
+    parser.add_argument('--make-fixtures', action='store_true', help="Regenerate the fixture pages from download.csv.")
+    args = parser.parse_args()
+
+    if args.make_fixtures:
+        write_fixture_pages(pd.read_csv('download.csv'))
+    elif args.fixtures:
+        server, base_url = serve_fixtures()
+        start = time.perf_counter()
+        timer = StepTimer()
+        merged, duplicates = scrape_with_pool(args.queries, args.pages, args.workers, base_url, solve_captcha=False, timer=timer, bulk=not args.per_element, light=args.light)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        timer.report()
+        print(f"\n{len(merged)} unique restaurants ({duplicates} duplicates removed) in {elapsed:.1f}s with {args.workers} workers")
+        print("✔️ Fixture scrape matches expected.csv" if check_against_fixtures(merged) else "❌ Fixture scrape does NOT match expected.csv")
+    else:
+        start = time.perf_counter()
+        state = CrawlState('pool_results')
+        if args.fresh:
+            state.reset()
+        timer = StepTimer()
+        merged, duplicates = scrape_with_pool(args.queries, args.pages, args.workers, state=state, timer=timer, bulk=not args.per_element, light=args.light)
+        timer.report()
+        print(f"\n{len(merged)} unique restaurants ({duplicates} duplicates removed) in {time.perf_counter() - start:.1f}s with {args.workers} workers")
+        if not merged.empty:
+            clean_results(merged).to_csv(args.output, index=False)
+            print(f"Saved to {args.output}")
@@ -0,0 +1,137 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+# A hit on the restaurant name matters more than a hit on its locality, which beats a street-level address hit
+FIELD_WEIGHTS = {'Name': 3.0, 'Locality': 2.0, 'Address': 1.0}
+EXACT_MATCH, PREFIX_MATCH, FUZZY_MATCH = 1.0, 0.75, 0.5
+MAX_PREFIX_EXPANSIONS = 200
+MISSING_VALUES = {"", "Not found"}
+
+
+def tokenize(text):
+    """Lowercase, accent-free alphanumeric tokens. Never interprets the input as a regex."""
+    if not isinstance(text, str):
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return TOKEN_PATTERN.findall(text.lower())
+
+def address_localities(address):
+    """
+    Locality names from a Google Maps address, e.g.
+    "..., Kanakpur, Silchar, Kanakpur Part-II, Assam 788005" -> ["Kanakpur", "Kanakpur Part-II"].
+    Uses the part just before the city plus anything between the city and the state.
+    """
+    if not isinstance(address, str) or address in MISSING_VALUES:
+        return []
+    parts = [part.strip() for part in address.split(',') if part.strip()]
+    if parts and parts[-1].startswith('Assam'):
+        parts = parts[:-1]
+    if 'Silchar' in parts:
+        city = parts.index('Silchar')
+        return parts[max(0, city - 1):city] + parts[city + 1:]
+    return parts[-1:]
+
+def _trigrams(term):
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _edit_distance(a, b, max_distance):
+    """Levenshtein distance, giving up early once every cell in a row exceeds max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class RestaurantSearchIndex:
+    """
+    Token inverted index plus a character-trigram index over Name, Address and locality names.
+    Lookups cost O(log V) for prefixes (sorted vocabulary) and touch only the trigram postings
+    of the query for fuzzy matches, so they stay sublinear in the number of restaurants.
+    """
+
+    def __init__(self, names, addresses):
+        self.size = len(names)
+        postings = defaultdict(dict)
+        for doc, (name, address) in enumerate(zip(names, addresses)):
+            if address in MISSING_VALUES:
+                address = ""
+            fields = (('Name', name), ('Locality', " ".join(address_localities(address))), ('Address', address))
+            for field, text in fields:
+                for term in tokenize(text):
+                    postings[term][doc] = max(postings[term].get(doc, 0.0), FIELD_WEIGHTS[field])
+
+        self.vocabulary = sorted(postings)
+        self.postings = [postings[term] for term in self.vocabulary]
+        self._term_id = {term: i for i, term in enumerate(self.vocabulary)}
+        self._trigram_index = defaultdict(list)
+        for term_id, term in enumerate(self.vocabulary):
+            for gram in _trigrams(term):
+                self._trigram_index[gram].append(term_id)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds the index from a restaurant DataFrame; row positions in results refer to `df`."""
+        return cls(df['Name'].fillna("").tolist(), df['Address'].fillna("").tolist())
+
+    # --- QUERY EXPANSION ---
+    def _expand(self, query_term):
+        """Vocabulary terms that match one query token, with their match weight."""
+        matches = {}
+        term_id = self._term_id.get(query_term)
+        if term_id is not None:
+            matches[term_id] = EXACT_MATCH
+
+        lo = bisect_left(self.vocabulary, query_term)
+        hi = bisect_left(self.vocabulary, query_term[:-1] + chr(ord(query_term[-1]) + 1))
+        for term_id in range(lo, min(hi, lo + MAX_PREFIX_EXPANSIONS)):
+            matches.setdefault(term_id, PREFIX_MATCH)
+
+        if len(query_term) >= 3:
+            max_distance = 1 if len(query_term) <= 5 else 2
+            grams = _trigrams(query_term)
+            shared = Counter(tid for gram in grams for tid in self._trigram_index.get(gram, ()))
+            # q-gram lemma: each edit can destroy at most 3 trigrams
+            min_shared = max(1, len(grams) - 3 * max_distance)
+            for term_id, count in shared.items():
+                if count < min_shared or term_id in matches:
+                    continue
+                distance = _edit_distance(query_term, self.vocabulary[term_id], max_distance)
+                if distance <= max_distance:
+                    matches[term_id] = FUZZY_MATCH / distance
+        return matches
+
+    # --- SEARCH ---
+    def search(self, query, limit=None):
+        """
+        Ranked (row_position, score) pairs for restaurants matching every token of `query`.
+        Each token may match exactly, as a prefix, or with a small typo.
+        """
+        doc_scores = None
+        for query_term in tokenize(query):
+            term_scores = {}
+            for term_id, match_weight in self._expand(query_term).items():
+                for doc, field_weight in self.postings[term_id].items():
+                    score = match_weight * field_weight
+                    if score > term_scores.get(doc, 0.0):
+                        term_scores[doc] = score
+            if doc_scores is None:
+                doc_scores = term_scores
+            else:
+                doc_scores = {doc: doc_scores[doc] + score for doc, score in term_scores.items() if doc in doc_scores}
+            if not doc_scores:
+                return []
+
+        ranked = sorted((doc_scores or {}).items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,79 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; broadcasts over NumPy arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def to_unit_vectors(lat, lon):
+    """Points on the unit sphere: straight-line (chord) distance between them grows monotonically with great-circle distance."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+def _km_to_chord(km):
+    return 2 * np.sin(np.minimum(km, np.pi * EARTH_RADIUS_KM) / (2 * EARTH_RADIUS_KM))
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord, 2.0) / 2)
+
+
+class SpatialIndex:
+    """
+    "Near me" query engine, built once per data load. Restaurants with coordinates go into a KD-tree
+    over unit-sphere vectors, so radius and k-nearest lookups cost O(log n) and distances are exact
+    great-circle distances at any scale. Rows without coordinates are simply left out.
+    """
+
+    def __init__(self, df, lat_col='latitude', lon_col='longitude', score_col='Gem_Score'):
+        # scipy comes with scikit-learn; imported here so loading the app doesn't pay for it
+        from scipy.spatial import cKDTree
+
+        lat = df[lat_col].to_numpy(dtype=float)
+        lon = df[lon_col].to_numpy(dtype=float)
+        self.positions = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.size = len(self.positions)
+        self.rating = df['Rating'].to_numpy(dtype=float)[self.positions]
+        self.score = df[score_col].to_numpy(dtype=float)[self.positions]
+        self._tree = cKDTree(to_unit_vectors(lat[self.positions], lon[self.positions]))
+
+    def within(self, lat, lon, radius_km, min_rating=0.0, order='gem'):
+        """
+        (row positions, distances in km) of restaurants within `radius_km` of the point and rated >= min_rating,
+        best Gem Score first (order='gem') or closest first (order='distance').
+        """
+        center = to_unit_vectors(lat, lon)[0]
+        hits = np.asarray(self._tree.query_ball_point(center, _km_to_chord(radius_km)), dtype=int)
+        hits = hits[self.rating[hits] >= min_rating]
+        distances = _chord_to_km(np.linalg.norm(self._tree.data[hits] - center, axis=1))
+        keys = (hits, distances) if order == 'distance' else (distances, -self.score[hits])
+        ranked = np.lexsort(keys)
+        return self.positions[hits[ranked]], distances[ranked]
+
+    def nearest(self, lat, lon, k, min_rating=0.0, max_km=None):
+        """(row positions, distances in km) of the k closest restaurants rated >= min_rating, closest first."""
+        if k <= 0 or self.size == 0:
+            return np.array([], dtype=int), np.array([])
+        center = to_unit_vectors(lat, lon)[0]
+        upper = _km_to_chord(max_km) if max_km is not None else np.inf
+        # Ask the tree for more neighbours until k of them pass the rating filter (or every point was seen)
+        probe = k
+        while True:
+            chords, hits = self._tree.query(center, k=min(probe, self.size), distance_upper_bound=upper)
+            chords, hits = np.atleast_1d(chords), np.atleast_1d(hits)
+            found = hits < self.size
+            chords, hits = chords[found], hits[found]
+            passed = self.rating[hits] >= min_rating
+            if passed.sum() >= k or probe >= self.size or not found.all():
+                break
+            probe *= 4
+        chords, hits = chords[passed][:k], hits[passed][:k]
+        return self.positions[hits], _chord_to_km(chords)
+
+
+def nearby_restaurants(df, positions, distances):
+    """The rows of `df` for a SpatialIndex result, in result order, with a Distance_km column."""
+    return df.iloc[positions].assign(Distance_km=distances)
@@ -0,0 +1,97 @@
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LazySpacyModel:
+    """
+    A spaCy pipeline that is imported and loaded on first use instead of at app start.
+    warm_up() starts loading it on a background thread, so by the time someone asks for an AI analysis
+    the model is usually ready; get() blocks until it is. The model is loaded at most once per process.
+    """
+
+    def __init__(self, model_name="en_core_web_sm", profile=None, download_missing=True):
+        self.model_name = model_name
+        self.profile = profile
+        self.download_missing = download_missing
+        self.import_seconds = None
+        self.load_seconds = None
+        self.error = None
+        self._model = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+
+    def _load(self):
+        start = time.perf_counter()
+        import spacy  # noqa: F401 - imported here so its cost is timed apart from the model load
+        from ai_engine import DEFAULT_NLP_PROFILE, load_nlp
+        self.import_seconds = time.perf_counter() - start
+        profile = self.profile or DEFAULT_NLP_PROFILE
+        try:
+            model = load_nlp(self.model_name, profile)
+        except OSError:
+            if not self.download_missing:
+                raise
+            print(f"spaCy model '{self.model_name}' not found. Downloading it for the first time...")
+            subprocess.run([sys.executable, "-m", "spacy", "download", self.model_name], check=True)
+            model = load_nlp(self.model_name, profile)
+        self.load_seconds = time.perf_counter() - start
+        print(f"[startup] spaCy '{self.model_name}' ready in {self.load_seconds:.2f}s (import {self.import_seconds:.2f}s)")
+        return model
+
+    def get(self):
+        """The loaded pipeline (loading it now if warm-up hasn't finished), or None if it could not be loaded."""
+        with self._lock:
+            if self._model is None and self.error is None:
+                try:
+                    self._model = self._load()
+                except (ImportError, OSError, subprocess.CalledProcessError) as e:
+                    self.error = e
+                    print(f"[startup] spaCy '{self.model_name}' failed to load: {e}")
+            return self._model
+
+    def warm_up(self):
+        """Starts loading the model on a daemon thread (once); returns immediately."""
+        with self._thread_lock:
+            if self._thread is None and self._model is None:
+                self._thread = threading.Thread(target=self.get, name=f"warm-up-{self.model_name}", daemon=True)
+                self._thread.start()
+
+    @property
+    def is_loaded(self):
+        return self._model is not None
+
+    def status(self):
+        if self._model is not None:
+            return f"loaded in {self.load_seconds:.2f}s (import {self.import_seconds:.2f}s)"
+        if self.error is not None:
+            return f"failed: {self.error}"
+        return "warming up..." if self._thread is not None else "not loaded yet"
+
+
+class StartupTimer:
+    """Cold-start phase timings. Only the first measurement of each phase is kept, so reruns don't overwrite it."""
+
+    def __init__(self):
+        self.phases = {}
+
+    def record(self, phase, seconds):
+        if phase not in self.phases:
+            self.phases[phase] = seconds
+            print(f"[startup] {phase}: {seconds:.2f}s")
+
+    @contextmanager
+    def phase(self, phase):
+        start = time.perf_counter()
+        yield
+        self.record(phase, time.perf_counter() - start)
+
+    def report(self, model=None):
+        """(phase, description) rows for the timing report, including the lazy model's status."""
+        rows = [(phase, f"{seconds:.2f}s") for phase, seconds in self.phases.items()]
+        if model is not None:
+            rows.append((f"spaCy model ({model.model_name})", model.status()))
+        return rows
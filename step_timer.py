@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import numpy as np
+
+
+class StepTimer:
+    """
+    Latency recorder for scraper steps (navigate, click, wait, extract, ...).
+    Wrap each step in `with timer.step('navigate'):` and call report() at the end of the run.
+    Bytes transferred per page can be recorded alongside with record_bytes(). Safe to share between worker threads.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.page_bytes = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.samples[name].append(elapsed)
+
+    def record_bytes(self, nbytes):
+        with self._lock:
+            self.page_bytes.append(nbytes)
+
+    def summary(self):
+        """{step: {count, total, p50, p95, max}} in seconds."""
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self.samples.items()}
+        return {name: {"count": len(values), "total": values.sum(), "p50": np.percentile(values, 50),
+                       "p95": np.percentile(values, 95), "max": values.max()}
+                for name, values in samples.items()}
+
+    def report(self, title="Scrape timing profile"):
+        """Prints a per-step latency profile, slowest total first."""
+        wall = time.perf_counter() - self._started
+        stats = sorted(self.summary().items(), key=lambda item: -item[1]['total'])
+        print(f"\n--- {title} (wall time {wall:.1f}s) ---")
+        print(f"{'Step':<12} {'Count':>6} {'Total (s)':>10} {'Share':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'Max (ms)':>9}")
+        for name, s in stats:
+            share = s['total'] / wall if wall else 0.0
+            print(f"{name:<12} {s['count']:>6} {s['total']:>10.2f} {share:>6.0%} {s['p50'] * 1000:>9.0f} {s['p95'] * 1000:>9.0f} {s['max'] * 1000:>9.0f}")
+        if self.page_bytes:
+            kb = np.array(self.page_bytes) / 1024
+            print(f"Transferred {kb.sum() / 1024:.1f} MB over {len(kb)} pages: p50 {np.percentile(kb, 50):.0f} KB, p95 {np.percentile(kb, 95):.0f} KB per page")
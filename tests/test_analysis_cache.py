@@ -0,0 +1,72 @@
+import itertools
+import sqlite3
+import pandas as pd
+import pytest
+import analysis_cache
+from analysis_cache import AnalysisCache, analysis_cache_key, warm_up
+from ai_engine import ANALYZER_VERSION, DEFAULT_NLP_PROFILE, analyze_review_text
+from review_parser import review_text_hash
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A clock that moves one second per call, so LRU order is deterministic."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(analysis_cache.time, 'time', lambda: float(next(ticks)))
+
+def stored_counters(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT name, value FROM counters").fetchall())
+
+def test_cache_keys():
+    assert analysis_cache_key("abc") == f"v{ANALYZER_VERSION}:spacy:{DEFAULT_NLP_PROFILE}:abc"
+    assert analysis_cache_key("abc", 'spacy', 'fast') != analysis_cache_key("abc", 'spacy', 'lean')
+    assert analysis_cache_key("abc", 'tfidf', 'corpus1') != analysis_cache_key("abc", 'tfidf', 'corpus2')
+    with pytest.raises(ValueError):
+        analysis_cache_key("abc", 'tfidf')
+
+def test_round_trip_and_shared_counters(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = AnalysisCache(path)
+    cache.put("k", ["✨ Great Ambience"], "Lovely.")
+    assert cache.get("k") == (["✨ Great Ambience"], "Lovely.")
+    assert cache.get("missing") is None
+    assert cache.get("k", count=False) is not None
+    assert AnalysisCache(path).stats()['entries'] == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+def test_reads_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_cache, 'FLUSH_EVERY', 3)
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = AnalysisCache(path)
+    cache.put("k", [], "s")
+    cache.get("k")  # One recency update and one hit pending
+    assert stored_counters(path)['hits'] == 0
+    cache.get("k")  # Third pending write reaches FLUSH_EVERY
+    assert stored_counters(path)['hits'] == 2
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'), max_entries=2)
+    cache.put("a", [], "a")
+    cache.put("b", [], "b")
+    cache.get("a")  # Only queued, but applied before the next eviction
+    cache.put("c", [], "c")
+    assert cache.contains(["a", "b", "c"]) == {"a", "c"}
+
+def test_tfidf_warm_up_matches_the_app(tmp_path):
+    pytest.importorskip('sklearn')
+    texts = ["Alice: Great momos and friendly staff. The service was quick and polite.",
+             "Bob: The biryani was cheap and tasty. Affordable prices for families.",
+             "Cara: Cozy cafe with good coffee. The decor and ambience are lovely."]
+    source = tmp_path / 'reviews.csv'
+    pd.DataFrame({'Name': ["A", "B", "C"], 'Reviews_Text': texts}).to_csv(source, index=False)
+    cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'))
+    assert warm_up(cache, str(source), engine='tfidf') == 3
+    assert warm_up(cache, str(source), engine='tfidf') == 0
+
+    from tfidf_summarizer import TfidfSummarizer
+    summarizer = TfidfSummarizer.from_csv(str(source))
+    for text in texts:
+        key = analysis_cache_key(review_text_hash(text), 'tfidf', summarizer.corpus_version)
+        assert cache.get(key) == tuple(analyze_review_text(text, summarizer=summarizer))
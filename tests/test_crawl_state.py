@@ -0,0 +1,41 @@
+import pandas as pd
+from crawl_state import CrawlState, record_key
+
+
+def test_record_key_ignores_case_and_spacing():
+    assert record_key("Cafe  21", "Central Rd,\nSilchar") == record_key("cafe 21", "central rd, silchar")
+    assert record_key("Cafe 21", None) == "cafe 21|"
+
+def test_resumes_at_first_unfinished_page(tmp_path):
+    state = CrawlState('test', str(tmp_path / 'state.sqlite3'))
+    assert state.first_unfinished_page() == 1
+    state.complete_page(1, [{'Name': 'A', 'Address': 'x'}])
+    state.complete_page(3, [{'Name': 'C', 'Address': 'z'}])
+    # Page 2 failed, so a rerun starts there even though page 3 is done
+    assert state.first_unfinished_page() == 2
+    assert state.is_page_done(3) and not state.is_page_done(2)
+
+def test_upserts_keep_first_seen_order(tmp_path):
+    state = CrawlState('test', str(tmp_path / 'state.sqlite3'))
+    state.upsert_many([{'Name': 'A', 'Address': 'x', 'Rating': 4.0}, {'Name': 'B', 'Address': 'y', 'Rating': 3.0}])
+    state.upsert({'Name': 'a', 'Address': ' X ', 'Rating': 4.5})
+    assert [(r['Name'], r['Rating']) for r in state.records()] == [('a', 4.5), ('B', 3.0)]
+    assert state.has_record('A', 'x')
+
+def test_crawls_are_separate(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    CrawlState('one', path).upsert({'Name': 'A'})
+    assert CrawlState('two', path).records() == []
+
+def test_csv_export_append_and_import(tmp_path):
+    state = CrawlState('test', str(tmp_path / 'state.sqlite3'))
+    csv_path = str(tmp_path / 'out.csv')
+    for name in ('A', 'B'):
+        state.append_csv(csv_path, {'Name': name, 'Extra': 1}, ['Name', 'Address'])
+    written = pd.read_csv(csv_path)
+    assert written.columns.tolist() == ['Name', 'Address'] and written['Name'].tolist() == ['A', 'B']
+
+    fresh = CrawlState('fresh', str(tmp_path / 'state.sqlite3'))
+    assert fresh.import_csv(csv_path) == 2
+    fresh.export_csv(csv_path, ['Name'])
+    assert pd.read_csv(csv_path)['Name'].tolist() == ['A', 'B']
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from food_tour import RoutePlanner, distance_matrix_km, nearest_neighbour_tour, solve_route, tour_legs, two_opt
+
+# Five stops along one street (about 1.1 km apart), listed out of order
+STREET = pd.DataFrame({
+    'Name': ['C', 'A', 'E', 'B', 'D'],
+    'latitude': [24.82, 24.80, 24.84, 24.81, 24.83],
+    'longitude': [92.79] * 5,
+    'geocode_confidence': ['exact', 'online', 'locality', 'exact', 'city'],
+})
+
+
+def test_distance_matrix():
+    dist = distance_matrix_km(STREET['latitude'], STREET['longitude'])
+    np.testing.assert_allclose(dist, dist.T)
+    assert np.all(np.diag(dist) == 0)
+    assert abs(dist[1, 3] - 1.112) < 0.01
+
+def test_open_route_walks_the_street_once():
+    dist = distance_matrix_km(STREET['latitude'], STREET['longitude'])
+    order, total_km = solve_route(dist)
+    names = ''.join(STREET['Name'].iloc[order])
+    assert names in ('ABCDE', 'EDCBA')
+    assert abs(total_km - dist[1, 2]) < 1e-9
+
+def test_round_trip_closes_the_loop():
+    dist = distance_matrix_km(STREET['latitude'], STREET['longitude'])
+    _, total_km = solve_route(dist, round_trip=True)
+    assert abs(total_km - 2 * dist[1, 2]) < 1e-9
+
+def test_two_opt_never_lengthens_the_tour():
+    rng = np.random.default_rng(0)
+    dist = distance_matrix_km(24.8 + rng.random(30) / 20, 92.78 + rng.random(30) / 20)
+    length = lambda tour: dist[tour, np.roll(tour, -1)].sum()
+    greedy = nearest_neighbour_tour(dist)
+    improved = two_opt(dist, greedy)
+    assert sorted(improved) == list(range(30))
+    assert length(improved) <= length(greedy)
+
+def test_planner_skips_unlocated_stops_and_caches_by_stop_set():
+    df = pd.concat([STREET, pd.DataFrame({'Name': ['X'], 'latitude': [np.nan], 'longitude': [np.nan]})], ignore_index=True)
+    planner = RoutePlanner(df)
+    route, _ = planner.plan([5, 0, 1, 3])
+    assert sorted(route) == [0, 1, 3]
+    planner.plan([3, 1, 0])
+    assert planner.cache_info().hits == 1
+
+def test_legs_flag_approximate_stops():
+    legs = tour_legs(STREET, [1, 3, 0, 4, 2])
+    assert legs['Leg_km'].iloc[0] == 0
+    assert legs['Approximate'].tolist() == [False, False, False, True, True]
+    assert legs['Walk_min'].iloc[1] > 0
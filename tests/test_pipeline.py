@@ -0,0 +1,64 @@
+import pytest
+import pipeline
+from pipeline import PipelineState, content_hash, run_stage
+
+
+class Builder:
+    """build_many stand-in that records which restaurants it was asked to build."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, changed):
+        self.calls.append(sorted(changed))
+        return {rid: {'upper': data['name'].upper()} for rid, data in changed.items()}
+
+
+@pytest.fixture
+def state(tmp_path):
+    return PipelineState(str(tmp_path / 'state.sqlite3'))
+
+INPUTS = {'R1': {'name': 'momo hut'}, 'R2': {'name': 'biryani house'}, 'R3': {'name': 'cafe 21'}}
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({'a': 1, 'b': 2}) == content_hash({'b': 2, 'a': 1})
+    assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+def test_first_run_builds_everything_and_rerun_builds_nothing(state):
+    build = Builder()
+    outputs, stats = run_stage(state, 'clean', INPUTS, build)
+    assert build.calls == [['R1', 'R2', 'R3']]
+    assert (stats['rebuilt'], stats['skipped']) == (3, 0)
+
+    again, stats = run_stage(state, 'clean', INPUTS, build)
+    assert len(build.calls) == 1
+    assert (stats['rebuilt'], stats['skipped']) == (0, 3)
+    assert again == outputs == {'R1': {'upper': 'MOMO HUT'}, 'R2': {'upper': 'BIRYANI HOUSE'}, 'R3': {'upper': 'CAFE 21'}}
+
+def test_only_changed_inputs_are_rebuilt(state):
+    run_stage(state, 'clean', INPUTS, Builder())
+    build = Builder()
+    outputs, stats = run_stage(state, 'clean', {**INPUTS, 'R2': {'name': 'biryani palace'}}, build)
+    assert build.calls == [['R2']]
+    assert stats['rebuilt'] == 1
+    assert outputs['R2'] == {'upper': 'BIRYANI PALACE'} and outputs['R1'] == {'upper': 'MOMO HUT'}
+
+def test_salt_and_stage_version_rebuild_everything(state, monkeypatch):
+    run_stage(state, 'geocode', INPUTS, Builder(), salt='gazetteer-v1')
+    _, stats = run_stage(state, 'geocode', INPUTS, Builder(), salt='gazetteer-v2')
+    assert stats['rebuilt'] == 3
+    monkeypatch.setitem(pipeline.STAGE_VERSIONS, 'geocode', 99)
+    _, stats = run_stage(state, 'geocode', INPUTS, Builder(), salt='gazetteer-v2')
+    assert stats['rebuilt'] == 3
+
+def test_removed_restaurants_are_dropped(state):
+    run_stage(state, 'clean', INPUTS, Builder())
+    outputs, stats = run_stage(state, 'clean', {'R1': INPUTS['R1']}, Builder())
+    assert stats['removed'] == 2 and list(outputs) == ['R1']
+    assert set(state.load('clean')) == {'R1'}
+
+def test_stages_are_tracked_separately(state):
+    run_stage(state, 'clean', INPUTS, Builder())
+    build = Builder()
+    run_stage(state, 'publish', INPUTS, build)
+    assert build.calls == [['R1', 'R2', 'R3']]
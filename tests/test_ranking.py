@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+import ranking
+from ranking import RankingIndex, top_suggestions
+
+DF = pd.DataFrame({
+    'Name': ["A", "B", "C", "D", "E"],
+    'Rating': [4.5, 3.9, 4.8, 4.2, 4.0],
+    'Reviews': [100, 500, 10, 300, 50],
+    'Has_AI_Analysis': [False, True, True, True, False],
+    'Vibes': [("Cafe",), ("Cafe", "Budget"), (), ("Budget",), ("Cafe", "Budget")],
+})
+DF['Gem_Score'] = DF['Rating'] * np.log1p(DF['Reviews'])
+
+
+def reference(df, k, min_rating=0.0, min_reviews=0, vibes=(), prioritize_ai=False):
+    """The filter + sort that the index replaces."""
+    ok = (df['Rating'] >= min_rating) & (df['Reviews'] >= min_reviews) & df['Vibes'].map(lambda v: set(vibes) <= set(v))
+    keys = ['Has_AI_Analysis', 'Gem_Score'] if prioritize_ai else ['Gem_Score']
+    return df[ok].sort_values(keys, ascending=False, kind='stable')['Name'].head(k).tolist()
+
+@pytest.mark.parametrize('filters', [
+    dict(k=3),
+    dict(k=5, min_rating=4.1),
+    dict(k=5, min_reviews=60, vibes=("Budget",)),
+    dict(k=2, vibes=("Cafe", "Budget")),
+    dict(k=4, prioritize_ai=True),
+])
+def test_matches_filter_and_sort(filters):
+    index = RankingIndex(DF, vibes_col='Vibes')
+    assert top_suggestions(DF, index, **filters)['Name'].tolist() == reference(DF, **filters)
+
+def test_unknown_vibe_matches_nothing():
+    assert RankingIndex(DF, vibes_col='Vibes').top_k(5, vibes=("Rooftop",)) == ()
+
+def test_scan_crosses_blocks(monkeypatch):
+    monkeypatch.setattr(ranking, 'SCAN_BLOCK', 2)
+    index = RankingIndex(DF, vibes_col='Vibes')
+    assert top_suggestions(DF, index, 5, vibes=("Cafe",))['Name'].tolist() == reference(DF, 5, vibes=("Cafe",))
+
+def test_queries_are_memoized():
+    index = RankingIndex(DF, vibes_col='Vibes')
+    index.top_k(3, vibes=["Cafe", "Budget"])
+    index.top_k(3, vibes=["Budget", "Cafe"])
+    assert index.cache_info().hits == 1
+
+def test_too_many_vibes():
+    with pytest.raises(ValueError):
+        RankingIndex(DF, vibe_names=[f"v{i}" for i in range(65)])
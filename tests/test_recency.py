@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from recency import AGE_BIN_LABELS, add_recency_scores, age_text_days, restaurant_age_histogram, review_age_histogram
+
+
+def store(*reviews):
+    return pd.DataFrame(reviews, columns=['Text_Hash', 'Age_Text'])
+
+def test_age_text_days():
+    days = age_text_days(["a day ago", "3 weeks ago", "an hour ago", "2 years ago", None])
+    np.testing.assert_allclose(days[:4], [1, 21, 1 / 24, 730.5])
+    assert np.isnan(days[4])
+
+def test_histogram_is_one_row_per_restaurant():
+    histogram = review_age_histogram([0, 0, 2], np.array([10, 100, 800]), 3)
+    assert histogram.shape == (3, len(AGE_BIN_LABELS))
+    assert histogram[0].tolist() == [1, 0, 1, 0, 0, 0]
+    assert histogram[1].sum() == 0 and histogram[2, -1] == 1
+
+def test_restaurants_share_hashes_and_unknown_hashes_are_empty():
+    reviews = store(('h1', "2 days ago"), ('h1', "a year ago"), ('h2', None))
+    histogram = restaurant_age_histogram(pd.Series(['h1', 'h2', 'h1', 'missing']), reviews)
+    assert histogram.sum(axis=1).tolist() == [2, 0, 2, 0]
+
+def test_scores_come_from_the_histogram():
+    reviews = store(('new', "a week ago"), ('new', "2 months ago"), ('old', "3 years ago"), ('old', "2 years ago"))
+    df = pd.DataFrame({'Review_Hash': ['new', 'old', 'none'], 'Rating': [4.0, 4.0, 4.0], 'Reviews': [100, 100, 100]})
+    df = add_recency_scores(df, reviews)
+
+    assert df['Sampled_Reviews'].tolist() == [2, 2, 0]
+    new, old, none = df.to_dict('records')
+    assert new['Trending_Score'] == np.log1p(100) and old['Trending_Score'] == 0
+    assert new['Recency_Weight'] > old['Recency_Weight']
+    assert new['Recent_Gem_Score'] > old['Recent_Gem_Score']
+    # No dated reviews: the median weight, neither rewarded nor punished
+    assert none['Recency_Weight'] == np.median([new['Recency_Weight'], old['Recency_Weight']])
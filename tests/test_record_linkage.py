@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from record_linkage import RecordLinker, assign_ids, build_master, is_real_address, link_columns, normalize_name
+
+BRANCH_A = "Central Rd, Gandhi Bagh, Ambicapatty, Silchar, Assam 788001"
+BRANCH_B = "Club Rd, Tarapur, Silchar, Assam 788002"
+
+
+def test_normalize_name():
+    assert normalize_name("The Godfather Restaurant!") == "godfather"
+    assert normalize_name("Café 21 & Bar") == normalize_name("Cafe 21 and Bar") == "cafe 21 bar"
+    assert normalize_name("The Restaurant") == "the restaurant"
+
+@pytest.mark.parametrize('address, real', [
+    (BRANCH_A, True),
+    ("RQGQ+FPX, KV Rd", True),
+    ("opp. Surana Motor, Premtala", True),
+    ("Great food, cozy ambiance, and friendly service.", False),
+    ("Veg-only", False),
+    ("Not found", False),
+    (None, False),
+])
+def test_is_real_address(address, real):
+    assert is_real_address(address) == real
+
+def test_same_place_links_and_branches_stay_apart():
+    names = ["Cafe 21 Restaurant", "Cafe 21", "Cafe 21 Restaurant", "Cafe 21"]
+    addresses = [BRANCH_A, "Central Road, Gandhi Bagh, Ambicapatty, Silchar, Assam 788001", BRANCH_B, ""]
+    labels, _, _ = RecordLinker(names, addresses).clusters()
+    assert labels[0] == labels[1]
+    assert labels[0] != labels[2]
+
+def test_badge_is_not_an_address():
+    names = ["South Corner", "South Corner"]
+    labels, _, _ = RecordLinker(names, [BRANCH_B, "Atmosphere is good, location is well."]).clusters()
+    assert labels[0] == labels[1]
+
+def test_ids_survive_reruns_and_splits():
+    registry = {}
+    first = assign_ids(["a|x", "a|y", "b|"], [0, 0, 1], registry)
+    assert first[0] == first[1] != first[2]
+    assert assign_ids(["b|", "a|x"], [5, 7], registry) == [first[2], first[0]]
+    # The restaurant split in two: one part keeps the ID, the other gets a new one
+    split = assign_ids(["a|x", "a|y"], [0, 1], registry)
+    assert first[0] in split and len(set(split)) == 2
+
+def test_build_master_prefers_the_most_trusted_source():
+    records = pd.DataFrame({
+        'Name': ["Cafe 21", "Cafe 21 Restaurant"], 'Rating': [None, "4.6"], 'Reviews': ["431", "400"],
+        'Address': [BRANCH_A, BRANCH_A], 'Source': ['a.csv', 'b.csv'], 'Source_Rank': [0, 1],
+    }).reindex(columns=['Name', 'Rating', 'Reviews', 'Info', 'Address', 'Price', 'Phone', 'Services', 'Reviews_Text', 'Source', 'Source_Rank'])
+    master, _ = build_master(records, {})
+    assert len(master) == 1
+    assert master.iloc[0]['Reviews'] == "431" and master.iloc[0]['Rating'] == "4.6"
+
+def test_link_columns():
+    left = pd.DataFrame({'Name': ["Cafe 21 Restaurant", "Babu Hotel"], 'Address': [BRANCH_A, BRANCH_B]})
+    right = pd.DataFrame({'Name': ["Cafe 21"], 'Reviews_Text': ["Great coffee"]})
+    linked = link_columns(left, right, ['Reviews_Text'])
+    assert linked['Reviews_Text'].iloc[0] == "Great coffee" and pd.isna(linked['Reviews_Text'].iloc[1])
@@ -0,0 +1,59 @@
+import pytest
+from review_parser import load_review_bodies, parse_review_blob, review_bodies_text, review_text_hash
+
+HEADER_BLOB = """
+Riya Sen
+Local Guide·42 reviews·10 photos
+2 months ago
+Dine in  |  Lunch  |  ₹200–400
+Great momos and a cozy corner seat.
+3
+Cafe Owner (owner)
+2 months ago
+Thank you for visiting!
+Amit Das
+5 reviews
+Edited a year ago
+NEW
+Slow service but the biryani was worth the wait …More
+"""
+
+AUTHOR_LINE_BLOB = """
+Saptadeepa Deb: Visited recently, the food really stood out!
+Nayana Bhuyan: The staff were rude.
+They had no manners at all.
+"""
+
+
+def test_header_format():
+    reviews = parse_review_blob(HEADER_BLOB)
+    assert [r['Author'] for r in reviews] == ['Riya Sen', 'Amit Das']
+    first, second = reviews
+    assert first['Is_Local_Guide'] and first['Author_Reviews'] == 42 and first['Author_Photos'] == 10
+    assert (first['Visit_Type'], first['Meal_Type'], first['Price_Min'], first['Price_Max']) == ('Dine in', 'Lunch', 200, 400)
+    assert first['Body'] == "Great momos and a cozy corner seat."
+    assert second['Is_Edited'] and second['Age_Text'] == "a year ago"
+    assert second['Is_Truncated'] and second['Body'] == "Slow service but the biryani was worth the wait"
+
+def test_author_line_format():
+    reviews = parse_review_blob(AUTHOR_LINE_BLOB)
+    assert [r['Author'] for r in reviews] == ['Saptadeepa Deb', 'Nayana Bhuyan']
+    assert reviews[1]['Body'] == "The staff were rude.\nThey had no manners at all."
+    assert reviews[1]['Age_Text'] is None and reviews[1]['Review_Index'] == 1
+
+def test_unstructured_text_is_kept():
+    assert review_bodies_text("Lovely place, friendly staff") == "Lovely place, friendly staff"
+
+@pytest.mark.parametrize('blob', [None, "", "  \n "])
+def test_empty_dumps(blob):
+    assert parse_review_blob(blob) == []
+
+def test_store_serves_both_formats(tmp_path):
+    pytest.importorskip('pyarrow')
+    source = tmp_path / 'reviews.csv'
+    source.write_text('Name,Reviews_Text\n' + "".join(f'R{i},"{blob}"\n' for i, blob in enumerate([HEADER_BLOB, AUTHOR_LINE_BLOB])))
+    bodies = load_review_bodies(str(source), str(tmp_path / 'store.parquet'))
+    for blob in (HEADER_BLOB, AUTHOR_LINE_BLOB):
+        assert bodies[review_text_hash(blob)] == review_bodies_text(blob) != ""
+    # Served from the store the second time round
+    assert load_review_bodies(str(source), str(tmp_path / 'store.parquet')) == bodies
@@ -0,0 +1,41 @@
+import numpy as np
+from review_search import ReviewSearchIndex, analyze, highlight_snippet, pack_strings, unpack_strings
+
+REVIEWS = [
+    {'Restaurant': "Momo Magic", 'Body': "The momos were juicy. Best momos in town!"},
+    {'Restaurant': "Momo Magic", 'Body': "Tried the steamed momo, this was good."},
+    {'Restaurant': "Biryani House", 'Body': "Biryani was great, the staff does always smile."},
+    {'Restaurant': "Café Ü", 'Body': "Great coffee & <b>cake</b>"},
+]
+
+
+def test_analyze_drops_stop_words_before_stripping_plurals():
+    assert analyze("This does always have Momos") == ["momo"]
+    assert analyze("The glass, the bus") == ["glass", "bus"]
+
+def test_pack_strings_round_trip():
+    strings = ["", "momo", "Café Ü", "a" * 500]
+    data, offsets = pack_strings(strings)
+    assert data.dtype == np.uint8 and len(offsets) == len(strings) + 1
+    assert unpack_strings(data, offsets) == strings
+
+def test_search_ranks_restaurants():
+    index = ReviewSearchIndex.build(REVIEWS)
+    results = index.search("momos")
+    assert [r['Name'] for r in results] == ["Momo Magic"]
+    assert results[0]['Matching_Reviews'] == 2
+    assert "<mark>momos</mark>" in results[0]['Snippets'][0]
+    assert index.search("this does") == []
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'index.npz')
+    index = ReviewSearchIndex.build(REVIEWS, source_stamp=(1, 2))
+    index.save(path)
+    loaded = ReviewSearchIndex.load(path)
+    assert loaded.terms == index.terms and loaded.restaurant_names == index.restaurant_names
+    assert loaded.source_stamp == (1, 2)
+    assert loaded.search("coffee")[0]['Name'] == "Café Ü"
+
+def test_snippets_escape_html():
+    snippet = highlight_snippet("Great coffee & <b>cake</b>", {"cake"})
+    assert "<b>" not in snippet and "&lt;b&gt;<mark>cake</mark>" in snippet
@@ -0,0 +1,40 @@
+import pandas as pd
+from search_index import RestaurantSearchIndex, address_localities, tokenize
+
+RESTAURANTS = pd.DataFrame({
+    'Name': ["Café 21 Restaurant", "The Godfather", "Tarapur Dhaba", "Kanakpur Kitchen"],
+    'Address': [
+        "Central Rd, Gandhi Bagh, Ambicapatty, Silchar, Assam 788001",
+        "Club Rd, Tarapur, Silchar, Assam 788001",
+        "Not found",
+        "Central Rd, Kanakpur, Silchar, Kanakpur Part-II, Assam 788005",
+    ],
+})
+
+
+def names(index, query):
+    return [RESTAURANTS['Name'][pos] for pos, _ in index.search(query)]
+
+def test_tokenize_strips_accents_and_regex_characters():
+    assert tokenize("Café (21)* [Silchar]") == ["cafe", "21", "silchar"]
+    assert tokenize(None) == []
+
+def test_address_localities():
+    assert address_localities(RESTAURANTS['Address'][3]) == ["Kanakpur", "Kanakpur Part-II"]
+    assert address_localities("Not found") == []
+
+def test_exact_prefix_and_typo_matches():
+    index = RestaurantSearchIndex.from_frame(RESTAURANTS)
+    assert names(index, "godfather") == ["The Godfather"]
+    assert names(index, "godf") == ["The Godfather"]
+    assert names(index, "godfahter") == ["The Godfather"]
+
+def test_every_token_must_match():
+    index = RestaurantSearchIndex.from_frame(RESTAURANTS)
+    assert names(index, "central kanakpur") == ["Kanakpur Kitchen"]
+    assert names(index, "godfather kanakpur") == []
+
+def test_name_hits_outrank_locality_and_address_hits():
+    index = RestaurantSearchIndex.from_frame(RESTAURANTS)
+    assert names(index, "tarapur") == ["Tarapur Dhaba", "The Godfather"]
+    assert len(index.search("silchar", limit=2)) == 2
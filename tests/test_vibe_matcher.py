@@ -0,0 +1,38 @@
+import numpy as np
+from vibe_matcher import VibeMatcher
+
+VIBES = {
+    "Veg": ["veg", "paneer"],
+    "Meat": ["non-veg", "chicken", "fried chicken"],
+    "Drinks": ["cold coffee", "coffee"],
+}
+
+
+def test_counts_whole_words_and_plurals_only():
+    matcher = VibeMatcher(VIBES)
+    counts = dict(zip(matcher.vibe_names, matcher.count_matrix(["Vegetables and non-veg thali, more VEG please, paneers"])[0]))
+    # "vegetables" is not "veg", and "non-veg" is its own keyword
+    assert counts == {"Veg": 2, "Meat": 1, "Drinks": 0}
+
+def test_phrase_words_are_not_counted_twice():
+    matcher = VibeMatcher(VIBES)
+    assert matcher.count_matrix(["Fried chicken and cold coffee; chicken again"]).tolist() == [[0, 2, 1]]
+
+def test_match_reports_spans():
+    text = "Great Cold  Coffee here"
+    match = VibeMatcher(VIBES).match(text)
+    assert match.counts == {"Drinks": 1}
+    (start, end, keyword), = match.spans["Drinks"]
+    assert text[start:end] == "Cold  Coffee" and keyword == "cold coffee"
+
+def test_vibes_many_respects_min_mentions():
+    matcher = VibeMatcher(VIBES)
+    texts = ["chicken chicken paneer", "", None]
+    assert matcher.vibes_many(texts, min_mentions=2) == [["Meat"], [], []]
+    assert matcher.vibes("chicken, paneer", min_mentions=1) == ["Veg", "Meat"]
+
+def test_keyword_counts_align_with_keywords():
+    matcher = VibeMatcher(VIBES)
+    counts = matcher.keyword_counts("coffee coffees")
+    assert counts[matcher.keywords.index("coffee")] == 2
+    assert np.count_nonzero(counts) == 1
@@ -0,0 +1,132 @@
+import argparse
+import hashlib
+import re
+import time
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from ai_engine import NO_SUMMARY_MESSAGE, clean_review_text
+from review_parser import review_text_hash
+
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD_PATTERN = re.compile(r"\w+")
+SUMMARY_SENTENCES = 2
+
+
+def split_sentences(text):
+    """Rule-based sentence split: after . ! ? or at a line break (each review body is on its own line)."""
+    return [sentence.strip() for sentence in SENTENCE_SPLIT_PATTERN.split(text) if sentence.strip()]
+
+def _is_candidate(sentence):
+    # Same filters as the spaCy scorer in ai_engine.summarize_doc
+    return len(sentence) >= 30 and "thank you" not in sentence.lower()
+
+
+class TfidfSummarizer:
+    """
+    Extractive summarizer that needs no language model: sentences are scored by the TF-IDF weight of their words
+    (IDF fitted across every restaurant's reviews) divided by their length, so sentences dense with words that are
+    distinctive for this corpus win. The whole corpus is scored in one sparse matrix pass.
+    """
+
+    def __init__(self, corpus_texts):
+        corpus = [text for text in corpus_texts if isinstance(text, str)]
+        self.vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, norm=None)
+        self.vectorizer.fit(corpus)
+        # Summaries depend on the whole corpus through the IDF weights, so cached ones are keyed by this too
+        self.corpus_version = hashlib.sha1("\0".join(corpus).encode('utf-8')).hexdigest()[:12]
+
+    def summarize_many(self, texts):
+        """One summary per clean review text (see ai_engine.clean_review_text)."""
+        doc_ids, sentences = [], []
+        for doc, text in enumerate(texts):
+            seen = set()
+            for sentence in split_sentences(text if isinstance(text, str) else ""):
+                if _is_candidate(sentence) and sentence not in seen:
+                    seen.add(sentence)
+                    doc_ids.append(doc)
+                    sentences.append(sentence)
+        summaries = [NO_SUMMARY_MESSAGE] * len(texts)
+        if not sentences:
+            return summaries
+
+        weights = np.asarray(self.vectorizer.transform(sentences).sum(axis=1)).ravel()
+        lengths = np.array([max(1, len(WORD_PATTERN.findall(s))) for s in sentences])
+        scores = weights / lengths
+        doc_ids = np.array(doc_ids)
+
+        # Top sentences per document: sort by (document, score desc) and keep each group's first rows
+        order = np.lexsort((-scores, doc_ids))
+        sorted_docs = doc_ids[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_docs[1:] != sorted_docs[:-1]])
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        chosen = {}
+        for i in order[rank < SUMMARY_SENTENCES]:
+            chosen.setdefault(doc_ids[i], []).append(sentences[i])
+        for doc, top_sentences in chosen.items():
+            summaries[doc] = " ".join(top_sentences)
+        return summaries
+
+    def summarize(self, text):
+        return self.summarize_many([text])[0]
+
+    @classmethod
+    def from_csv(cls, input_path='downloadrev.csv', bodies=None):
+        """Fits the IDF weights on every restaurant's reviews in a Name/Reviews_Text CSV."""
+        return cls(load_clean_texts(input_path, bodies))
+
+
+def load_clean_texts(input_path, bodies=None):
+    """Clean text of every restaurant with reviews. `bodies` (see review_parser.load_review_bodies) skips re-parsing."""
+    df_reviews = pd.read_csv(input_path)
+    texts = [text for text in df_reviews['Reviews_Text'].fillna("") if text.strip()]
+    if bodies is None:
+        return [clean_review_text(text) for text in texts]
+    return [bodies.get(review_text_hash(text), "") for text in texts]
+
+def sentence_overlap(summary_a, summary_b):
+    """Share of summary sentences two engines agree on (Jaccard over sentences, ignoring whitespace)."""
+    a = {" ".join(s.split()) for s in split_sentences(summary_a)}
+    b = {" ".join(s.split()) for s in split_sentences(summary_b)}
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+# --- BENCHMARK: TF-IDF vs. the spaCy POS-density scorer ---
+def run_benchmark(input_path, scale, model_name):
+    texts = load_clean_texts(input_path) * scale
+    print(f"Summarizing {len(texts)} restaurants ({scale}x corpus)...")
+
+    start = time.perf_counter()
+    tfidf_summaries = TfidfSummarizer(texts).summarize_many(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  TF-IDF: {elapsed:.2f}s including fit ({len(texts) / elapsed:.1f} docs/sec)")
+
+    try:
+        from ai_engine import load_nlp, summarize_doc
+        start = time.perf_counter()
+        nlp = load_nlp(model_name)
+        spacy_summaries = [summarize_doc(doc) for doc in nlp.pipe(texts, batch_size=8)]
+        elapsed = time.perf_counter() - start
+    except (ImportError, OSError) as e:
+        print(f"  spaCy: skipped ({e})")
+        return
+    print(f"  spaCy:  {elapsed:.2f}s including model load ({len(texts) / elapsed:.1f} docs/sec)")
+
+    overlaps = [sentence_overlap(a, b) for a, b in zip(tfidf_summaries, spacy_summaries)]
+    identical = sum(a == b for a, b in zip(tfidf_summaries, spacy_summaries))
+    print(f"  Summary overlap: {np.mean(overlaps):.0%} of sentences shared on average, {identical}/{len(texts)} identical")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Summarize every restaurant with TF-IDF, or benchmark it against the spaCy engine.")
+    parser.add_argument('--input', default='downloadrev.csv')
+    parser.add_argument('--benchmark-scale', type=int, default=None, help="Repeat the corpus N times and compare both engines.")
+    parser.add_argument('--model', default='en_core_web_sm', help="spaCy model for the benchmark comparison.")
+    args = parser.parse_args()
+
+    if args.benchmark_scale:
+        run_benchmark(args.input, args.benchmark_scale, args.model)
+    else:
+        df_reviews = pd.read_csv(args.input).dropna(subset=['Reviews_Text'])
+        texts = [clean_review_text(text) for text in df_reviews['Reviews_Text']]
+        for name, summary in zip(df_reviews['Name'], TfidfSummarizer(texts).summarize_many(texts)):
+            print(f"\n{name}\n   > {summary}")
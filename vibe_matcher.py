@@ -0,0 +1,176 @@
+import argparse
+import re
+import time
+from collections import Counter, namedtuple
+import numpy as np
+
+# A token is a run of word characters and hyphens, so "non-veg" and "vegetables"
+# are single tokens and can never produce a hit for the keyword "veg".
+TOKEN_PATTERN = re.compile(r"[\w-]+")
+
+VibeMatch = namedtuple('VibeMatch', ['counts', 'spans'])
+
+def _is_boundary(text, i):
+    """True when position i is outside the text or holds a character that cannot be part of a token."""
+    return i < 0 or i >= len(text) or not (text[i].isalnum() or text[i] in '_-')
+
+
+class VibeMatcher:
+    """
+    Single-pass, word-boundary aware matcher for a vibe dictionary.
+    The text is tokenized once and every single-word keyword (plus simple "s"/"es"
+    plurals) is resolved with hash lookups instead of one substring scan per keyword.
+    """
+
+    def __init__(self, vibe_dictionary):
+        self.vibe_names = list(vibe_dictionary)
+        self.keywords = sorted({kw.lower() for kws in vibe_dictionary.values() for kw in kws})
+        keyword_index = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # Keyword x vibe membership, so keyword hit counts turn into vibe counts with one matmul
+        self.membership = np.zeros((len(self.keywords), len(self.vibe_names)), dtype=np.int64)
+        for v, kws in enumerate(vibe_dictionary.values()):
+            for kw in kws:
+                self.membership[keyword_index[kw.lower()], v] = 1
+
+        # Surface form -> base word. Exact words are registered first so they always win over plurals.
+        words = {word for kw in self.keywords for word in kw.split()}
+        self._base_word = {word: word for word in words}
+        for word in words:
+            for form in (word + 's', word + 'es'):
+                self._base_word.setdefault(form, word)
+
+        self._single_words = {kw: keyword_index[kw] for kw in self.keywords if ' ' not in kw}
+
+        # Multi-word keywords get one literal-prefix regex each and are only
+        # scanned when their first word actually occurs in the text.
+        self._phrases = []
+        for kw in self.keywords:
+            words = kw.split()
+            if len(words) > 1:
+                pattern = r'\s+'.join(re.escape(w) for w in words) + r'(?:e?s)?'
+                constituents = [self._single_words[w] for w in words if w in self._single_words]
+                self._phrases.append((words[0], re.compile(pattern), re.compile(pattern, re.IGNORECASE), keyword_index[kw], constituents))
+        self._phrase_constituents = {kw_idx: constituents for _, _, _, kw_idx, constituents in self._phrases}
+
+    # --- CORE SCAN ---
+    def _phrase_hits(self, text, present_words, lowered=True):
+        """Leftmost-longest, non-overlapping multi-word keyword hits as (start, end, keyword_idx).
+
+        The case-sensitive patterns keep CPython's literal-prefix search, so the hot
+        path passes already-lowercased text and only match() pays for IGNORECASE.
+        """
+        candidates = []
+        for first_word, pattern, pattern_ignorecase, kw_idx, _ in self._phrases:
+            if first_word not in present_words:
+                continue
+            for m in (pattern if lowered else pattern_ignorecase).finditer(text):
+                if _is_boundary(text, m.start() - 1) and _is_boundary(text, m.end()):
+                    candidates.append((m.start(), -m.end(), kw_idx))
+
+        hits, next_free = [], 0
+        for start, neg_end, kw_idx in sorted(candidates):
+            if start >= next_free:
+                hits.append((start, -neg_end, kw_idx))
+                next_free = -neg_end
+        return hits
+
+    def keyword_counts(self, text):
+        """Hit count for every keyword (aligned with self.keywords) in a single pass over `text`."""
+        counts = np.zeros(len(self.keywords), dtype=np.int64)
+        if not isinstance(text, str) or not text:
+            return counts
+        text_lower = text.lower()
+        token_counts = Counter(TOKEN_PATTERN.findall(text_lower))
+
+        present_words = set()
+        for token, n in token_counts.items():
+            base = self._base_word.get(token)
+            if base is None:
+                continue
+            present_words.add(base)
+            kw_idx = self._single_words.get(base)
+            if kw_idx is not None:
+                counts[kw_idx] += n
+
+        for _, _, kw_idx in self._phrase_hits(text_lower, present_words):
+            counts[kw_idx] += 1
+            # Words inside a matched phrase are not separate mentions
+            for constituent in self._phrase_constituents[kw_idx]:
+                counts[constituent] -= 1
+        return counts
+
+    # --- PUBLIC API ---
+    def match(self, text):
+        """Per-vibe hit counts and matched (start, end, keyword) spans for a single text."""
+        counts, spans = {}, {}
+        if not isinstance(text, str) or not text:
+            return VibeMatch(counts, spans)
+
+        tokens = [(m.start(), m.end(), self._base_word.get(m.group().lower())) for m in TOKEN_PATTERN.finditer(text)]
+        hits = self._phrase_hits(text, {base for _, _, base in tokens if base}, lowered=False)
+        hits += [(start, end, self._single_words[base]) for start, end, base in tokens
+                 if base in self._single_words and not any(s <= start < e for s, e, _ in hits)]
+
+        for start, end, kw_idx in sorted(hits):
+            for v in np.flatnonzero(self.membership[kw_idx]):
+                vibe = self.vibe_names[v]
+                counts[vibe] = counts.get(vibe, 0) + 1
+                spans.setdefault(vibe, []).append((start, end, self.keywords[kw_idx]))
+        return VibeMatch(counts, spans)
+
+    def count_matrix(self, texts):
+        """Vibe hit counts for a whole batch of texts as an (n_texts, n_vibes) array."""
+        keyword_matrix = np.zeros((len(texts), len(self.keywords)), dtype=np.int64)
+        for i, text in enumerate(texts):
+            keyword_matrix[i] = self.keyword_counts(text)
+        return keyword_matrix @ self.membership
+
+    def vibes(self, text, min_mentions=2):
+        """Vibes mentioned at least `min_mentions` times, in dictionary order."""
+        return self.vibes_many([text], min_mentions)[0]
+
+    def vibes_many(self, texts, min_mentions=2):
+        """Batch version of vibes(): one list of vibes per input text."""
+        passed = self.count_matrix(texts) >= min_mentions
+        return [[self.vibe_names[v] for v in np.flatnonzero(row)] for row in passed]
+
+
+# --- BENCHMARK: compiled matcher vs. the legacy per-keyword str.count loop ---
+def legacy_vibe_counts(text, vibe_dictionary):
+    text_lower = text.lower()
+    return [sum(text_lower.count(kw) for kw in keywords) for keywords in vibe_dictionary.values()]
+
+def run_benchmark(input_path, scales, min_mentions):
+    import pandas as pd
+    from ai_engine import EXTENDED_VIBE_DICTIONARY
+
+    texts = pd.read_csv(input_path)['Reviews_Text'].fillna("").tolist()
+    matcher = VibeMatcher(EXTENDED_VIBE_DICTIONARY)
+    print(f"Benchmarking {len(EXTENDED_VIBE_DICTIONARY)} vibes / {len(matcher.keywords)} keywords on '{input_path}'")
+
+    for scale in scales:
+        batch = texts * scale
+        size_mb = sum(len(t) for t in batch) / 1e6
+
+        start = time.perf_counter()
+        legacy = np.array([legacy_vibe_counts(t, EXTENDED_VIBE_DICTIONARY) for t in batch])
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = matcher.count_matrix(batch)
+        compiled_time = time.perf_counter() - start
+
+        flips = int(((legacy >= min_mentions) != (compiled >= min_mentions)).sum())
+        print(f"\n--- {scale}x ({len(batch)} restaurants, {size_mb:.1f} MB) ---")
+        print(f"  str.count loop : {legacy_time:.3f}s")
+        print(f"  VibeMatcher    : {compiled_time:.3f}s ({legacy_time / compiled_time:.1f}x)")
+        print(f"  Vibe tags changed by word-boundary matching: {flips // scale} of {legacy.size // scale}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the compiled vibe matcher against the legacy str.count loop.")
+    parser.add_argument('--input', default='downloadrev.csv')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--min-mentions', type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.input, args.scales, args.min_mentions)
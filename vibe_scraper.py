@@ -1,15 +1,16 @@
-import pandas as pd
-import time
 import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from crawl_state import CrawlState
+from gmaps_scraper import SEARCH_QUERY, SEARCH_URL, go_to_next_page, local_results_url, open_more_places, wait_for_results
+from step_timer import StepTimer
 
-def final_mission_scrape():
+def final_mission_scrape(timer=None):
+    timer = timer or StepTimer()
     print("Initializing the Final Mission Scraper...")
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service)
@@ -17,38 +18,43 @@ def final_mission_scrape():
     wait = WebDriverWait(driver, 10)
 
     # --- SETUP FOR SAVE-AS-YOU-GO ---
+    # The crawl state is the source of truth: each restaurant is upserted by name, and the CSV is rewritten
+    # from it once at start-up, then appended to. Reruns skip restaurants already saved instead of duplicating them.
     output_filename = 'silchar_reviews_THE_FINAL_DATA.csv'
-    if not os.path.exists(output_filename):
-        pd.DataFrame(columns=['Name', 'Reviews_Text']).to_csv(output_filename, index=False)
-        print(f"Output file created: {output_filename}.")
-    else:
-        print(f"Appending data to existing file: {output_filename}.")
+    state = CrawlState('vibe_reviews')
+    if os.path.exists(output_filename):
+        print(f"Resuming: {state.import_csv(output_filename)} rows already in {output_filename}.")
+    state.export_csv(output_filename, ['Name', 'Reviews_Text'])
+    done_pages = state.completed_pages()
+    page_number = state.first_unfinished_page()
 
-    url = "https://www.google.com/search?q=restaurants+in+Silchar+Assam"
-    driver.get(url)
+    url = SEARCH_URL
+    with timer.step('navigate'):
+        driver.get(url)
 
     input("\n>>> ACTION: Please solve any CAPTCHA, then press Enter here to begin...")
     
-    try:
-        wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, 'More places'))).click()
-        print(">>> 'More places' button engaged...")
-        time.sleep(5)
-    except TimeoutException:
+    if page_number > 1:
+        print(f">>> {len(done_pages)} page(s) already finished. Jumping to page {page_number}, the first unfinished one...")
+        with timer.step('navigate'):
+            driver.get(local_results_url(SEARCH_QUERY, page_number))
+    elif open_more_places(driver, wait, timer):
+        print(">>> 'More places' button engaged, full list loaded.")
+    else:
         print(">>> Could not find 'More places' button.")
 
-    page_number = 1
-
     # --- NEW, ROBUST PAGINATION LOOP ---
     while True:
         print(f"\n{'='*20} Starting Page {page_number} {'='*20}")
         
         try:
             # Wait for the results list to be ready on the current page
-            wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'uMdZh')))
-            num_results = len(driver.find_elements(By.CLASS_NAME, 'uMdZh'))
+            with timer.step('wait'):
+                num_results = len(wait_for_results(wait))
             print(f"Found {num_results} restaurants on this page.")
 
             # --- RESTAURANT LOOP (for the current page) ---
+            page_complete = True
             for i in range(num_results):
                 restaurant_info = {}
                 name = "Unknown Target"
@@ -61,35 +67,47 @@ def final_mission_scrape():
                     # The script finds the name and clicks the restaurant FOR YOU
                     name = restaurant_to_click.find_element(By.CLASS_NAME, 'OSrXXb').text
                     restaurant_info['Name'] = name
+                    if state.has_record(name):
+                        print(f">>> {name} is already saved. Skipping.")
+                        continue
                     print(f">>> Target Acquired: {name}. Opening details...")
-                    restaurant_to_click.click()
+                    with timer.step('click'):
+                        restaurant_to_click.click()
                     
                     # Wait for the detail panel to update
-                    wait.until(lambda d: d.find_element(By.CSS_SELECTOR, "h2.qrShPb").text == name)
+                    with timer.step('wait'):
+                        wait.until(lambda d: d.find_element(By.CSS_SELECTOR, "h2.qrShPb").text == name)
                     
                     # --- PAUSE AND WAIT FOR YOU ---
                     input(f"--> YOUR TURN: For '{name}', please 1) Click 'Reviews' and 2) SCROLL the reviews. Then press Enter...")
 
                     # --- SCRIPT RESUMES TO READ AND SAVE ---
                     print("--> MY TURN: Reading all visible reviews...")
-                    review_elements = driver.find_elements(By.CLASS_NAME, 'bwb7ce')
-                    review_texts = [review.text for review in review_elements]
+                    with timer.step('extract'):
+                        review_elements = driver.find_elements(By.CLASS_NAME, 'bwb7ce')
+                        review_texts = [review.text for review in review_elements]
                     
                     restaurant_info['Reviews_Text'] = ' \n\n '.join(review_texts)
                     
-                    # Save data for this one restaurant immediately
-                    temp_df = pd.DataFrame([restaurant_info])
-                    temp_df.to_csv(output_filename, mode='a', header=False, index=False)
+                    # Save data for this one restaurant immediately (an upsert, so a retry never duplicates it)
+                    state.upsert(restaurant_info)
+                    state.append_csv(output_filename, restaurant_info, ['Name', 'Reviews_Text'])
                     print(f"  -> SUCCESS: Scraped and SAVED {len(review_texts)} reviews for {name}.")
 
                 except Exception as e:
                     print(f"  -> A critical error occurred for {name}. Skipping. Error: {e}")
+                    page_complete = False
                     continue
 
+            # A page only counts as done once every restaurant on it is saved, so failures are retried on a rerun
+            if page_complete:
+                state.complete_page(page_number)
+
             # --- AFTER PAGE IS DONE, GO TO NEXT ---
             print("\n>>> Page complete. Attempting to click 'Next'...")
-            next_button = wait.until(EC.presence_of_element_located((By.ID, 'pnnext')))
-            driver.execute_script("arguments[0].click();", next_button) # Use forceful click
+            if not go_to_next_page(driver, wait, timer, force_click=True): # Use forceful click
+                print(">>> No more 'Next' button found. All pages have been scraped.")
+                break
             page_number += 1
 
         except TimeoutException:
@@ -100,6 +118,8 @@ def final_mission_scrape():
             break
 
     driver.quit()
+    # The manual review-scrolling pauses are not timed, only the automated steps
+    timer.report()
     print("\n\n--- MISSION ACCOMPLISHED ---")
 
 if __name__ == '__main__':
@@ -1,30 +1,82 @@
 import pandas as pd
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from gmaps_scraper import create_driver, go_to_next_page, open_more_places, pass_captcha, scroll_until_stable, transferred_bytes, wait_for_results
+from step_timer import StepTimer
 
-def scrape_with_scrolling_panel():
+PANEL_EXTRACTION_JS = """
+function text(el) { return el ? el.innerText : null; }
+var price = document.evaluate("//span[contains(text(), '\u20b9')]", document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var services = document.getElementsByClassName('i2sC4e')[0];
+return {
+    address: text(document.getElementsByClassName('LrzXr')[0]),
+    phone: text(document.querySelector('span[data-tooltip*="phone"]')),
+    price: text(price),
+    services: services ? Array.prototype.map.call(services.getElementsByClassName('E0DTEd'), function (o) { return o.innerText; }) : null,
+    rating: text(document.querySelector('span.Aq14Cf'))
+};
+"""
+
+def extract_panel_details_bulk(driver):
+    """
+    The same fields as extract_panel_details from one JavaScript call instead of five lookups.
+    None when the script fails or finds none of the fields, so the caller falls back to per-element lookups.
+    """
+    try:
+        panel = driver.execute_script(PANEL_EXTRACTION_JS)
+    except Exception:
+        return None
+    if not isinstance(panel, dict) or all(value is None for value in panel.values()):
+        return None
+    def field(key):
+        return panel[key] if panel.get(key) is not None else "Not found"
+    services = panel.get('services')
+    return {'Address': field('address'), 'Phone': field('phone'), 'Price': field('price'),
+            'Services': ', '.join(option for option in services if option) if services is not None else "Not found",
+            'Rating': field('rating')}
+
+def extract_panel_details(driver):
+    """Address, Phone, Price, Services and Rating from the open detail panel ("Not found" when missing)."""
+    details = {}
+    # Address
+    try: details['Address'] = driver.find_element(By.CLASS_NAME, 'LrzXr').text
+    except: details['Address'] = "Not found"
+    # Phone
+    try: details['Phone'] = driver.find_element(By.CSS_SELECTOR, 'span[data-tooltip*="phone"]').text
+    except: details['Phone'] = "Not found"
+    # Price
+    try: details['Price'] = driver.find_element(By.XPATH, "//span[contains(text(), '₹')]").text
+    except: details['Price'] = "Not found"
+    # Services
+    try:
+        services_container = driver.find_element(By.CLASS_NAME, 'i2sC4e')
+        options = [opt.text for opt in services_container.find_elements(By.CLASS_NAME, 'E0DTEd') if opt.text]
+        details['Services'] = ', '.join(options)
+    except: details['Services'] = "Not found"
+    # Rating and Reviews from detail panel for accuracy
+    try:
+        rating_string = driver.find_element(By.CSS_SELECTOR, 'span.Aq14Cf').text
+        details['Rating'] = rating_string
+    except: details['Rating'] = "Not found"
+    return details
+
+def scrape_with_scrolling_panel(timer=None, bulk=True, light=False):
+    timer = timer or StepTimer()
     print("Setting up Selenium for the Final Polished Scrape...")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service)
-    driver.maximize_window()
-    wait = WebDriverWait(driver, 10) # A 10 second wait should be sufficient
+    driver_path = ChromeDriverManager().install()
+    driver = create_driver(driver_path, light)
 
     url = "https://www.google.com/search?q=restaurants+in+Silchar+Assam"
-    driver.get(url)
-
-    input("\nACTION REQUIRED: Please solve any CAPTCHA, then press Enter here to begin...")
+    with timer.step('navigate'):
+        driver = pass_captcha(driver, url, "\nACTION REQUIRED: Please solve any CAPTCHA, then press Enter here to begin...", driver_path, light)
+    wait = WebDriverWait(driver, 10) # A 10 second wait should be sufficient
+    transferred_bytes(driver)
     
-    try:
-        wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, 'More places'))).click()
-        print("Clicked 'More places' button. Waiting for the main list...")
-        time.sleep(5)
-    except TimeoutException:
+    if open_more_places(driver, wait, timer):
+        print("Clicked 'More places' button. The main list is loaded.")
+    else:
         print("Could not find 'More places' button, proceeding with what is visible.")
 
     all_restaurant_data = []
@@ -34,8 +86,8 @@ def scrape_with_scrolling_panel():
     while True:
         print(f"\n{'='*20} Scraping Page {page_number} {'='*20}")
         
-        wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'uMdZh')))
-        num_results_on_page = len(driver.find_elements(By.CLASS_NAME, 'uMdZh'))
+        with timer.step('wait'):
+            num_results_on_page = len(wait_for_results(wait))
         print(f"Found {num_results_on_page} restaurants on this page.")
 
         # --- RESTAURANT LOOP ---
@@ -51,44 +103,28 @@ def scrape_with_scrolling_panel():
                 restaurant_info['Name'] = name
                 print(f"\nProcessing {i+1}/{num_results_on_page}: {name}")
 
-                restaurant_to_click.click()
+                with timer.step('click'):
+                    restaurant_to_click.click()
                 
                 # --- NEW: SCROLL THE RIGHT-HAND DETAIL PANEL ---
                 try:
                     # This panel often has a specific role or class. We'll use a common one.
                     # This JavaScript command scrolls the specific panel, not the whole page.
                     pane_selector = "div[role='main']"
-                    pane = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, pane_selector)))
-                    # Scroll down a few times to trigger any lazy-loaded content
-                    for _ in range(3):
-                        driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", pane)
-                        time.sleep(0.5)
+                    with timer.step('wait'):
+                        pane = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, pane_selector)))
+                        # The panel is updated in place: wait until it shows the clicked restaurant
+                        wait.until(lambda d: d.find_element(By.CSS_SELECTOR, "h2.qrShPb").text == name)
+                    # Scroll until no more lazy-loaded content appears, instead of a fixed 3 x 0.5s
+                    with timer.step('scroll'):
+                        scroll_until_stable(driver, pane)
                     print("  -> Scrolled detail panel.")
                 except Exception as e:
                     print(f"  -> Could not scroll detail panel. Info may be incomplete. Error: {e}")
 
                 # --- Scrape All Details ---
-                details = {}
-                # Address
-                try: details['Address'] = driver.find_element(By.CLASS_NAME, 'LrzXr').text
-                except: details['Address'] = "Not found"
-                # Phone
-                try: details['Phone'] = driver.find_element(By.CSS_SELECTOR, 'span[data-tooltip*="phone"]').text
-                except: details['Phone'] = "Not found"
-                # Price
-                try: details['Price'] = driver.find_element(By.XPATH, "//span[contains(text(), '₹')]").text
-                except: details['Price'] = "Not found"
-                # Services
-                try:
-                    services_container = driver.find_element(By.CLASS_NAME, 'i2sC4e')
-                    options = [opt.text for opt in services_container.find_elements(By.CLASS_NAME, 'E0DTEd') if opt.text]
-                    details['Services'] = ', '.join(options)
-                except: details['Services'] = "Not found"
-                # Rating and Reviews from detail panel for accuracy
-                try:
-                    rating_string = driver.find_element(By.CSS_SELECTOR, 'span.Aq14Cf').text
-                    details['Rating'] = rating_string
-                except: details['Rating'] = "Not found"
+                with timer.step('extract'):
+                    details = (extract_panel_details_bulk(driver) if bulk else None) or extract_panel_details(driver)
 
                 print(f"  -> Details scraped: {details}")
                 restaurant_info.update(details)
@@ -98,17 +134,19 @@ def scrape_with_scrolling_panel():
                 print(f"  -> An error occurred for item {i+1} ({name}). Skipping. Error: {e}")
                 continue
 
+        page_bytes = transferred_bytes(driver)
+        if page_bytes is not None:
+            timer.record_bytes(page_bytes)
+
         # --- Go to the next page ---
-        try:
-            print("\nPage complete. Looking for the 'Next' page button...")
-            next_button = wait.until(EC.element_to_be_clickable((By.ID, 'pnnext')))
-            next_button.click()
-            page_number += 1
-        except TimeoutException:
+        print("\nPage complete. Looking for the 'Next' page button...")
+        if not go_to_next_page(driver, wait, timer):
             print("All pages have been scraped.")
             break
+        page_number += 1
 
     driver.quit()
+    timer.report()
     return pd.DataFrame(all_restaurant_data)
 
 if __name__ == '__main__':